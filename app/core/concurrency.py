@@ -0,0 +1,64 @@
+"""
+Analiz işleri için paylaşılan eşzamanlılık araçları
+
+Tüm analiz aşamaları (OpenCV, MediaPipe, Whisper, librosa, Gemini çağrıları)
+bloklayan işlerdir. Bunlar event loop yerine süreç genelinde paylaşılan, boyutu
+sınırlı bir iş parçacığı havuzunda çalıştırılır. Aynı anda çalışan analiz sayısı
+da MAX_CONCURRENT_ANALYSES ile sınırlanır.
+"""
+
+import asyncio
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from .config import settings
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# asyncio.Semaphore bir event loop'a bağlıdır; Gradio ve FastAPI farklı
+# loop'larda çalışabildiği için her loop kendi semaforlarını alır.
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+
+def get_analysis_executor() -> ThreadPoolExecutor:
+    """Paylaşılan analiz havuzunu döndür (ilk çağrıda oluşturulur)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.MAX_CONCURRENT_ANALYSES * settings.ANALYSIS_STAGE_WORKERS),
+                thread_name_prefix="analysis"
+            )
+        return _executor
+
+
+def shutdown_analysis_executor(wait: bool = False) -> None:
+    """Uygulama kapanırken havuzu kapat"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait, cancel_futures=True)
+            _executor = None
+
+
+def get_loop_semaphore(name: str, limit: int) -> asyncio.Semaphore:
+    """Çalışan event loop için adlandırılmış semaforu döndür (yoksa oluştur)"""
+    loop = asyncio.get_running_loop()
+    loop_semaphores = _semaphores.setdefault(loop, {})
+    semaphore = loop_semaphores.get(name)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max(1, limit))
+        loop_semaphores[name] = semaphore
+    return semaphore
+
+
+@asynccontextmanager
+async def analysis_slot():
+    """Eşzamanlı analiz sayısını MAX_CONCURRENT_ANALYSES ile sınırla"""
+    semaphore = get_loop_semaphore("analysis", settings.MAX_CONCURRENT_ANALYSES)
+    async with semaphore:
+        yield
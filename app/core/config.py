@@ -17,11 +17,98 @@ class Settings(BaseSettings):
     UPLOAD_DIR: str = "uploads"
     MAX_FILE_SIZE: int = 500 * 1024 * 1024  # 500MB
     ALLOWED_VIDEO_EXTENSIONS: list = [".mp4", ".avi", ".mov", ".mkv"]
+    UPLOAD_SESSION_TTL_HOURS: int = 24  # Tamamlanmayan parçalı yüklemelerin saklanma süresi
+    
+    # Cache
+    CACHE_DIR: str = ".cache"
+    RESULT_CACHE_ENABLED: bool = True  # Aynı video tekrar yüklenince aşama sonuçlarını yeniden kullan
+    RESULT_CACHE_MAX_MB: int = 1024
+    RESULT_CACHE_MAX_AGE_DAYS: int = 30
     
     # Analysis Settings
     FRAME_SAMPLE_RATE: int = 30  # Process every 30th frame
+    VISION_PARALLEL_WORKERS: int = 0  # >1 ise video parçalara bölünüp bu kadar süreçte analiz edilir
+    VISION_MIN_CHUNK_SECONDS: int = 60  # Paralel modda en kısa parça süresi
+    VISION_SAMPLING_MODE: str = "fixed"  # "fixed" (her FRAME_SAMPLE_RATE. kare) veya "adaptive" (sahne hareketine göre)
+    VISION_MOTION_PROBE_RATE: int = 5  # Uyarlamalı modda hareket ölçümü için her N. kare yoklanır
+    VISION_MOTION_THRESHOLD: float = 0.02  # Küçültülmüş karelerde ortalama mutlak fark (0-1); üstü hareket sayılır
+    VISION_ADAPTIVE_MAX_INTERVAL: int = 60  # Durağan bölümlerde iki örnek arası en fazla kare
+    VISION_MAX_ANALYZED_FRAMES: int = 1200  # Uyarlamalı modda video başına analiz bütçesi (0 = sınırsız)
+    VISION_SAMPLING_LOG_DIR: str = ""  # Dolu ise örnekleme kararları video başına JSONL olarak yazılır
+    VISION_CASCADE_ENABLED: bool = True  # Önce pose ile kişi bulunur; yüz ve eller yalnızca kırpılmış bölgelerde aranır
+    VISION_DOWNSCALE_WIDTH: int = 640  # Kaskad modunda pose bu genişliğe küçültülmüş karede çalışır
+    VISION_ROI_MARGIN: float = 0.25  # Yüz/el bölgesi kutusuna eklenen pay (kutu boyutuna oranla)
     AUDIO_CHUNK_DURATION: int = 5  # seconds
     
+    # Streaming (uzun/canlı dersler için artımlı analiz)
+    STREAM_INPUT_DIR: str = "streams"  # API'den verilebilecek dosya kaynaklarının bulunduğu dizin
+    STREAM_WINDOW_SECONDS: float = 30.0  # Video ve ses bu uzunlukta pencereler halinde işlenir
+    STREAM_VISION_FPS: float = 1.0  # Pencere başına analiz edilen kare hızı
+    STREAM_FRAME_WIDTH: int = 1280  # Akıştan çözülen karelerin genişliği
+    STREAM_IDLE_TIMEOUT_SECONDS: float = 30.0  # Büyüyen dosyaya bu süre veri eklenmezse akış bitmiş sayılır
+    STREAM_SNAPSHOT_EVERY_WINDOWS: int = 1  # Kaç pencerede bir ara sonuç yayınlanır
+    STREAM_TRANSCRIPT_TAIL_SEGMENTS: int = 200  # Bellekte tutulan son transkript segmentleri
+    STREAM_TIMELINE_MAX_WINDOWS: int = 720  # Bellekte tutulan zaman çizelgesi parçaları (pencere)
+    STREAM_MAX_ACTIVE: int = 2  # Aynı anda çalışabilecek akış analizi sayısı
+    
+    # Batch (ders klasörlerinin toplu analizi)
+    BATCH_INPUT_DIR: str = "batch_inputs"  # API'den verilebilecek klasör/manifest kaynaklarının kökü
+    BATCH_OUTPUT_DIR: str = "batch_results"  # API'den başlatılan toplu analizlerin çıktı dizini
+    BATCH_WORKERS: int = 0  # 0 = çekirdek sayısı ve kullanılabilir belleğe göre otomatik
+    BATCH_CPUS_PER_WORKER: int = 2  # Otomatik modda işçi başına ayrılan çekirdek
+    BATCH_WORKER_MEMORY_MB: int = 3072  # Bir işçinin tahmini bellek ihtiyacı (Whisper + MediaPipe + video)
+    BATCH_MAX_ACTIVE: int = 1  # Aynı anda çalışabilecek toplu analiz sayısı
+    
+    # Speech-to-Text
+    STT_BACKEND: str = "openai-whisper"  # "openai-whisper" veya "faster-whisper"
+    STT_MODEL_SIZE: str = "base"  # tiny, base, small, medium, large-v2...
+    STT_COMPUTE_TYPE: str = "int8"  # faster-whisper için: int8, int8_float32, float32
+    STT_THREADS: int = 0  # 0 = kütüphane varsayılanı
+    STT_BEAM_SIZE: int = 1  # 1 = greedy decode
+    STT_LANGUAGE: str = "tr"
+    
+    # İçerik analizi
+    CONTENT_ENGINE: str = "auto"  # "llm", "local" (ağsız) veya "auto" (LLM yapılandırılmışsa llm, yoksa local)
+    
+    # LLM (içerik analizi)
+    LLM_BACKEND: str = "gemini"  # "gemini" veya "http" (yerel/sahte model sunucusu)
+    LLM_MODEL_NAME: str = "gemini-1.5-flash"
+    LLM_ENDPOINT_URL: str = "http://127.0.0.1:8765/generate"  # LLM_BACKEND="http" için
+    LLM_MAX_CONCURRENCY: int = 4  # Süreç genelinde aynı anda gönderilebilecek istek
+    LLM_TIMEOUT_SECONDS: float = 60.0  # Tek istek için zaman aşımı
+    LLM_MAX_RETRIES: int = 2  # Hata/zaman aşımında yeniden deneme sayısı
+    LLM_RETRY_BACKOFF_SECONDS: float = 1.0  # Üstel bekleme başlangıcı
+    LLM_CACHE_ENABLED: bool = True  # Aynı model + istem için yanıtı yeniden kullan
+    LLM_CACHE_MAX_MB: int = 256
+    LLM_CACHE_MAX_AGE_DAYS: int = 30
+    CONTENT_CHUNK_MAX_TOKENS: int = 6000  # Transkript bunu aşarsa parçalara bölünüp map-reduce ile analiz edilir
+    HEATMAP_SEGMENT_SECONDS: float = 30.0  # Zaman damgası varsa yoğunluk haritası penceresi
+    HEATMAP_OVERLAP_SECONDS: float = 0.0
+    HEATMAP_SEGMENT_WORDS: int = 50  # Zaman damgası yoksa pencere (kelime)
+    HEATMAP_OVERLAP_WORDS: int = 0
+    TIMELINE_WINDOW_SECONDS: float = 5.0  # Zaman çizelgesi pencere boyutu (görüntü/ses/içerik metrikleri)
+    
+    # Concurrency
+    ANALYSIS_STAGE_WORKERS: int = 3  # Paralel çalışan analiz aşaması (vision, audio, content)
+    MAX_CONCURRENT_ANALYSES: int = 2  # Aynı anda çalışabilecek video analizi sayısı
+    MODEL_WARMUP_ON_STARTUP: bool = True  # Whisper/MediaPipe modellerini başlangıçta arka planda yükle
+    
+    # Job Queue
+    JOB_STORE_BACKEND: str = "memory"  # "memory" veya "mongodb"
+    JOB_STORE_MAX_JOBS: int = 1000  # Bellek içi depoda tutulacak en fazla iş
+    JOB_WORKERS: int = 2  # Kuyruğu tüketen işçi sayısı
+    JOB_QUEUE_MAX_SIZE: int = 100  # Kuyrukta bekleyebilecek en fazla iş
+    
+    # Progress Events
+    PROGRESS_MIN_INTERVAL_SECONDS: float = 0.5  # Aşama içi ilerleme olayları en fazla bu sıklıkta gönderilir
+    PROGRESS_QUEUE_SIZE: int = 256  # Abone başına bekleyen olay sınırı (dolunca en eski atılır)
+    PROGRESS_SSE_HEARTBEAT_SECONDS: float = 15.0  # Olay yokken bağlantıyı açık tutan yorum satırı aralığı
+    
+    # Metrics & Tracing
+    METRICS_ENABLED: bool = True  # /metrics uç noktası ve aşama/alt adım süre histogramları
+    TRACE_DIR: str = ""  # Dolu ise her iş için zaman izi (Chrome trace JSON) bu dizine yazılır
+    TRACE_MAX_SPANS: int = 5000  # İz başına ayrı tutulan en fazla span; fazlası ad başına toplanır
+    
     # Scoring Weights
     BODY_LANGUAGE_WEIGHT: float = 0.25
     VOICE_WEIGHT: float = 0.25
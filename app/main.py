@@ -1,12 +1,18 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import uvicorn
+import asyncio
 import os
 from pathlib import Path
 
 from .routers import analysis, reports
 from .core.config import settings
+from .core.concurrency import get_analysis_executor, shutdown_analysis_executor
+from .services.vision_analyzer import shutdown_vision_pool
+from .services.model_registry import model_registry
+from .services.metrics import metrics_registry, PROMETHEUS_CONTENT_TYPE
 
 app = FastAPI(
     title="EduView - AI Educational Video Analysis",
@@ -30,6 +36,32 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 app.include_router(analysis.router, prefix="/api/v1/analysis", tags=["analysis"])
 app.include_router(reports.router, prefix="/api/v1/reports", tags=["reports"])
 
+# Okuma anında hesaplanan göstergeler
+metrics_registry.gauge(
+    "eduview_job_queue_depth", "Kuyrukta bekleyen analiz işi", callback=lambda: analysis.job_queue.depth
+)
+metrics_registry.gauge(
+    "eduview_active_streams", "Çalışan akış analizi", callback=lambda: analysis.stream_manager.active_count
+)
+
+@app.on_event("startup")
+async def startup_event():
+    # Analiz kuyruğu işçilerini başlat
+    await analysis.job_queue.start()
+    
+    # Modelleri arka planda ısıt; sunucu bu sırada istek kabul etmeye devam eder
+    if settings.MODEL_WARMUP_ON_STARTUP:
+        asyncio.get_running_loop().run_in_executor(get_analysis_executor(), model_registry.warm_up)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Kuyruğu, akış ve toplu analizleri, analiz havuzunu kapat
+    await analysis.job_queue.stop()
+    await analysis.stream_manager.shutdown()
+    analysis.batch_manager.shutdown()
+    shutdown_analysis_executor()
+    shutdown_vision_pool()
+
 @app.get("/")
 async def root():
     return {"message": "EduView API - AI Educational Video Analysis"}
@@ -38,6 +70,13 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metin biçiminde metrikler (aşama histogramları, kuyruk, önbellek, model yükleme)"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrikler kapalı")
+    return Response(metrics_registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
 if __name__ == "__main__":
     uvicorn.run(
         "app.main:app",
@@ -1,132 +1,396 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
+from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks, Request
 from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from typing import Optional
-import tempfile
+import asyncio
+import json
 import os
 import io
 from datetime import datetime
 
 from ..services.analysis_orchestrator import AnalysisOrchestrator
 from ..services.report_generator import ReportGenerator
+from ..services.timeline import Timeline
+from ..services.job_store import create_job_store, JOB_QUEUED, JOB_RUNNING, JOB_COMPLETED, JOB_FAILED
+from ..services.job_queue import AnalysisJobQueue, QueueFullError
+from ..services.progress import progress_bus, JOB_EVENT_STAGE
+from ..services.batch_runner import BatchJobManager, BatchError, BatchLimitError, BATCH_OUTPUT_FORMATS
+from ..services.streaming_analyzer import StreamJobManager, StreamSourceError, StreamLimitError
+from ..services.model_registry import model_registry, current_rss_mb
+from ..services.upload_store import (
+    ChunkedUploadManager, StreamingUploadWriter, UploadError,
+    validate_video_filename, UPLOAD_CHUNK_BYTES
+)
+from ..core.config import settings
 
 router = APIRouter()
 
 # Global instances
 analyzer = AnalysisOrchestrator()
 report_generator = ReportGenerator()
+job_store = create_job_store()
+job_queue = AnalysisJobQueue(analyzer, job_store)
+stream_manager = StreamJobManager(analyzer, job_store)
+batch_manager = BatchJobManager(job_store)
+upload_manager = ChunkedUploadManager()
+
+async def _stream_upload_to_disk(video: UploadFile) -> StreamingUploadWriter:
+    """Yüklenen dosyayı parça parça diske yaz; SHA-256'yı yazarken hesapla
+    
+    Dosya hiçbir zaman tamamen belleğe alınmaz; MAX_FILE_SIZE aşıldığı anda
+    yazma durdurulur ve yarım dosya silinir.
+    """
+    extension = validate_video_filename(video.filename)
+    writer = await run_in_threadpool(StreamingUploadWriter, extension, settings.UPLOAD_DIR)
+    try:
+        while True:
+            chunk = await video.read(UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            await run_in_threadpool(writer.write, chunk)
+        await run_in_threadpool(writer.close)
+    except BaseException:
+        await run_in_threadpool(writer.discard)
+        raise
+    return writer
+
+async def _enqueue_video(video_path: str, filename: Optional[str],
+                         subject_topic: Optional[str], video_hash: Optional[str]) -> dict:
+    """Diske yazılmış videoyu analiz kuyruğuna ekle"""
+    try:
+        analysis_id = await job_queue.submit(video_path, filename, subject_topic, video_hash)
+    except QueueFullError:
+        if os.path.exists(video_path):
+            os.unlink(video_path)
+        raise HTTPException(status_code=503, detail="Analiz kuyruğu dolu, lütfen daha sonra tekrar deneyin")
+    except Exception as e:
+        if os.path.exists(video_path):
+            os.unlink(video_path)
+        raise HTTPException(status_code=500, detail=f"Analiz kuyruğa eklenemedi: {str(e)}")
+    
+    return {
+        "status": JOB_QUEUED,
+        "analysis_id": analysis_id,
+        "message": "Video analiz kuyruğuna eklendi"
+    }
 
 @router.post("/upload-video/")
 async def upload_and_analyze_video(
     video: UploadFile = File(...),
     subject_topic: Optional[str] = None
 ):
-    """Video yükle ve analiz et"""
+    """Video yükle ve analiz kuyruğuna ekle
+    
+    Analiz arka planda çalışır; dönen analysis_id ile durum ve sonuç sorgulanır.
+    """
     
     # Dosya türü kontrolü
-    if not video.content_type.startswith('video/'):
+    if not video.content_type or not video.content_type.startswith('video/'):
         raise HTTPException(status_code=400, detail="Sadece video dosyaları kabul edilir")
     
-    # Geçici dosya oluştur
-    with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(video.filename)[1]) as tmp_file:
-        # Video içeriğini geçici dosyaya kaydet
-        content = await video.read()
-        tmp_file.write(content)
-        temp_video_path = tmp_file.name
+    try:
+        writer = await _stream_upload_to_disk(video)
+    except UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     
+    return await _enqueue_video(writer.path, video.filename, subject_topic, writer.sha256)
+
+@router.post("/uploads/")
+async def create_chunked_upload(filename: str, total_size: int):
+    """Büyük dosyalar için parçalı yükleme oturumu aç"""
     try:
-        # Analizi çalıştır
-        result = await analyzer.analyze_video(temp_video_path, subject_topic)
-        
-        # Sonuçları JSON formatında döndür
-        return {
-            "status": "success",
-            "analysis_id": f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-            "results": {
-                "total_score": result.total_score,
-                "body_language_score": result.body_language_score,
-                "voice_score": result.voice_score,
-                "content_flow_score": result.content_flow_score,
-                "interaction_score": result.interaction_score,
-                "video_duration": result.video_duration,
-                "analysis_timestamp": result.analysis_timestamp.isoformat(),
-                "vision_analysis": {
-                    "eye_contact_percentage": result.vision_analysis.eye_contact_percentage,
-                    "posture_score": result.vision_analysis.posture_score,
-                    "gesture_activity": result.vision_analysis.gesture_activity,
-                    "fidgeting_count": result.vision_analysis.fidgeting_count,
-                    "face_direction_changes": result.vision_analysis.face_direction_changes,
-                    "overall_body_language_score": result.vision_analysis.overall_body_language_score
-                },
-                "audio_analysis": {
-                    "transcription": result.audio_analysis.transcription,
-                    "filler_words_count": result.audio_analysis.filler_words_count,
-                    "filler_words_percentage": result.audio_analysis.filler_words_percentage,
-                    "speech_rate": result.audio_analysis.speech_rate,
-                    "pause_count": result.audio_analysis.pause_count,
-                    "average_pause_duration": result.audio_analysis.average_pause_duration,
-                    "pitch_variation": result.audio_analysis.pitch_variation,
-                    "monotony_score": result.audio_analysis.monotony_score,
-                    "volume_consistency": result.audio_analysis.volume_consistency,
-                    "overall_voice_score": result.audio_analysis.overall_voice_score
-                },
-                "content_analysis": {
-                    "content_completeness_score": result.content_analysis.content_completeness_score,
-                    "missing_topics": result.content_analysis.missing_topics,
-                    "key_concepts": result.content_analysis.key_concepts,
-                    "concept_density": result.content_analysis.concept_density,
-                    "topic_flow_score": result.content_analysis.topic_flow_score,
-                    "interaction_examples_count": result.content_analysis.interaction_examples_count,
-                    "educational_structure_score": result.content_analysis.educational_structure_score,
-                    "overall_content_score": result.content_analysis.overall_content_score,
-                    "topic_heatmap": result.content_analysis.topic_heatmap
-                },
-                "recommendations": result.recommendations
-            }
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Analiz sırasında hata oluştu: {str(e)}")
+        session = await run_in_threadpool(upload_manager.create, filename, total_size)
+    except UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    
+    return {
+        "upload_id": session.upload_id,
+        "received": session.received,
+        "total_size": session.total_size,
+        "chunk_size": UPLOAD_CHUNK_BYTES
+    }
+
+@router.put("/uploads/{upload_id}")
+async def upload_chunk(upload_id: str, offset: int, request: Request):
+    """Ham istek gövdesini verilen ofsetten itibaren oturuma ekle"""
+    try:
+        position = offset
+        async for piece in request.stream():
+            if not piece:
+                continue
+            session = await run_in_threadpool(upload_manager.write_chunk, upload_id, position, piece)
+            position = session.received
+        session = upload_manager.get(upload_id)
+    except UploadError as e:
+        if e.status_code == 413:
+            await run_in_threadpool(upload_manager.abort, upload_id)
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    
+    return {
+        "upload_id": upload_id,
+        "received": session.received,
+        "total_size": session.total_size,
+        "complete": session.is_complete
+    }
+
+@router.get("/uploads/{upload_id}")
+async def get_chunked_upload(upload_id: str):
+    """Kaldığı yerden devam için sunucudaki mevcut ofseti döndür"""
+    try:
+        session = upload_manager.get(upload_id)
+    except UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    
+    return {
+        "upload_id": upload_id,
+        "received": session.received,
+        "total_size": session.total_size,
+        "complete": session.is_complete
+    }
+
+@router.post("/uploads/{upload_id}/complete")
+async def complete_chunked_upload(upload_id: str, subject_topic: Optional[str] = None):
+    """Parçalı yüklemeyi tamamla ve analiz kuyruğuna ekle"""
+    try:
+        session = await run_in_threadpool(upload_manager.finish, upload_id)
+    except UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    
+    return await _enqueue_video(session.writer.path, session.filename, subject_topic, session.writer.sha256)
+
+@router.delete("/uploads/{upload_id}")
+async def abort_chunked_upload(upload_id: str):
+    """Parçalı yüklemeyi iptal et"""
+    await run_in_threadpool(upload_manager.abort, upload_id)
+    return {"upload_id": upload_id, "status": "aborted"}
+
+@router.post("/streams/")
+async def start_stream_analysis(source: str, subject_topic: Optional[str] = None):
+    """Büyüyen dosya ya da yerel yayın için akış analizi başlat
     
-    finally:
-        # Geçici dosyayı temizle
-        if os.path.exists(temp_video_path):
-            os.unlink(temp_video_path)
+    Ara sonuçlar ders sürerken /analysis-result/{analysis_id} üzerinden
+    okunabilir ("partial": true).
+    """
+    try:
+        analysis_id = await stream_manager.start(source, subject_topic)
+    except StreamSourceError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except StreamLimitError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    return {
+        "status": "success",
+        "message": "Akış analizi başlatıldı",
+        "analysis_id": analysis_id
+    }
+
+@router.delete("/streams/{analysis_id}")
+async def stop_stream_analysis(analysis_id: str):
+    """Akış analizini durdur; son sonuç mevcut pencere bitince yazılır"""
+    if not stream_manager.stop(analysis_id):
+        raise HTTPException(status_code=404, detail="Çalışan akış analizi bulunamadı")
+    return {"analysis_id": analysis_id, "status": "stopping"}
+
+@router.post("/batch/")
+async def start_batch_analysis(source: str, output: Optional[str] = None, output_format: Optional[str] = None,
+                               subject_topic: Optional[str] = None, workers: int = 0,
+                               retry_failed: bool = True):
+    """Bir klasördeki ya da manifestteki videoları toplu analiz et
+    
+    source BATCH_INPUT_DIR'e göre klasör ya da manifest (.jsonl/.csv/.txt)
+    yoludur; sonuçlar BATCH_OUTPUT_DIR altına JSONL ya da Parquet olarak
+    yazılır; output_format verilmezse biçim çıktı uzantısından (yoksa JSONL)
+    belirlenir. Aynı çıktı adıyla tekrar başlatılırsa tamamlanmış videolar atlanır.
+    İlerleme /analyze-status ve /analyze-events üzerinden izlenir; bitince
+    /analysis-result özet ve video/saat verimini döndürür.
+    """
+    if output_format is not None and output_format not in BATCH_OUTPUT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Çıktı biçimi {BATCH_OUTPUT_FORMATS} içinden olmalı")
+    try:
+        analysis_id = await batch_manager.start(source, output, output_format, subject_topic, workers, retry_failed)
+    except BatchError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except BatchLimitError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    return {
+        "status": "success",
+        "message": "Toplu analiz başlatıldı",
+        "analysis_id": analysis_id
+    }
+
+@router.delete("/batch/{analysis_id}")
+async def stop_batch_analysis(analysis_id: str):
+    """Toplu analizi durdur; çalışan videolar bitince durur, tekrar başlatınca kaldığı yerden devam eder"""
+    if not batch_manager.stop(analysis_id):
+        raise HTTPException(status_code=404, detail="Çalışan toplu analiz bulunamadı")
+    return {"analysis_id": analysis_id, "status": "stopping"}
+
+def _readable_result(job) -> dict:
+    """Tamamlanmış sonuç ya da çalışan akış analizinin son ara sonucu"""
+    if job.status == JOB_FAILED:
+        raise HTTPException(status_code=500, detail=f"Analiz sırasında hata oluştu: {job.error}")
+    if job.status == JOB_COMPLETED or (job.status == JOB_RUNNING and job.result):
+        return job.result
+    raise HTTPException(status_code=409, detail=f"Analiz henüz tamamlanmadı (durum: {job.status})")
 
 @router.get("/analyze-status/{analysis_id}")
 async def get_analysis_status(analysis_id: str):
-    """Analiz durumunu sorgula (gelecekte async işlemler için)"""
+    """Analiz durumunu ve aşama ilerlemesini sorgula"""
+    job = await job_store.get(analysis_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Analiz bulunamadı")
+    
     return {
-        "analysis_id": analysis_id,
-        "status": "completed",  # Şimdilik tüm analizler senkron
-        "message": "Analiz tamamlandı"
+        "analysis_id": job.job_id,
+        "status": job.status,
+        "progress": job.progress,
+        "stages": job.stages,
+        "error": job.error,
+        "created_at": job.created_at.isoformat(),
+        "updated_at": job.updated_at.isoformat()
+    }
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def _status_payload(job) -> dict:
+    return {
+        "analysis_id": job.job_id,
+        "status": job.status,
+        "progress": job.progress,
+        "stages": job.stages,
+        "error": job.error
+    }
+
+@router.get("/analyze-events/{analysis_id}")
+async def stream_analysis_events(analysis_id: str, request: Request):
+    """Analiz ilerlemesini Server-Sent Events olarak yayınla
+    
+    Önce mevcut durum ("status"), ardından aşama olayları ("progress":
+    aşama geçişleri, işlenen kare, transkript edilen saniye, LLM çağrıları)
+    gönderilir. İş bitince son "status" olayıyla bağlantı kapanır.
+    """
+    # Durum okunmadan önce abone olunur; aradaki olaylar kaçmaz
+    queue = progress_bus.subscribe(analysis_id)
+    job = await job_store.get(analysis_id)
+    if job is None:
+        progress_bus.unsubscribe(analysis_id, queue)
+        raise HTTPException(status_code=404, detail="Analiz bulunamadı")
+    
+    async def events():
+        try:
+            yield _sse("status", _status_payload(job))
+            if job.status in (JOB_COMPLETED, JOB_FAILED):
+                return
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.PROGRESS_SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    # Olay başka bir süreçte üretilmiş olabilir; bitişi depodan da kontrol et
+                    current = await job_store.get(analysis_id)
+                    if current is None or current.status in (JOB_COMPLETED, JOB_FAILED):
+                        if current is not None:
+                            yield _sse("status", _status_payload(current))
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+                
+                yield _sse("progress", event.to_dict())
+                if event.stage == JOB_EVENT_STAGE and event.status in (JOB_COMPLETED, JOB_FAILED):
+                    current = await job_store.get(analysis_id)
+                    if current is not None:
+                        yield _sse("status", _status_payload(current))
+                    return
+        finally:
+            progress_bus.unsubscribe(analysis_id, queue)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/analysis-result/{analysis_id}")
+async def get_analysis_result(analysis_id: str):
+    """Tamamlanan analizin sonuçlarını döndür"""
+    job = await job_store.get(analysis_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Analiz bulunamadı")
+    
+    return {
+        "status": "success",
+        "analysis_id": job.job_id,
+        "results": _readable_result(job)
+    }
+
+@router.get("/analysis-result/{analysis_id}/timeline")
+async def get_analysis_timeline(analysis_id: str, start: float = 0.0, end: Optional[float] = None,
+                                max_points: Optional[int] = None):
+    """Zaman çizelgesinin bir aralığını döndür (yakınlaştırma için; analiz tekrarlanmaz)"""
+    job = await job_store.get(analysis_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Analiz bulunamadı")
+    result = _readable_result(job)
+    if not result.get("timeline"):
+        raise HTTPException(status_code=404, detail="Bu analiz için zaman çizelgesi yok")
+    
+    timeline = Timeline.from_dict(result["timeline"]).slice(start, end)
+    if max_points:
+        timeline = timeline.downsample(max_points)
+    
+    return {
+        "analysis_id": job.job_id,
+        "partial": result.get("partial", False),
+        "timeline": timeline.to_dict()
     }
 
 @router.post("/health-check/")
 async def health_check():
-    """Sistem sağlık kontrolü"""
+    """Sistem sağlık kontrolü (model yüklemez; yalnızca kayıt defterini okur)"""
     try:
-        # Temel bileşenlerin çalışıp çalışmadığını kontrol et
-        test_analyzer = AnalysisOrchestrator()
+        models = model_registry.status()
+        
+        def model_state(name: str) -> str:
+            info = models.get(name)
+            if info is None:
+                return "unavailable"
+            if info["error"]:
+                return f"error: {info['error']}"
+            return "ok" if info["loaded"] else "not loaded"
         
         return {
             "status": "healthy",
             "components": {
-                "vision_analyzer": "ok",
-                "audio_analyzer": "ok", 
-                "content_analyzer": "ok" if test_analyzer.content_analyzer else "disabled (no API key)",
+                "vision_analyzer": model_state("vision"),
+                "audio_analyzer": model_state("stt"),
+                "content_analyzer": f"ok ({analyzer.content_analyzer.engine_name})",
                 "report_generator": "ok"
             },
+            "models": models,
+            "result_cache": analyzer.result_cache.stats() if analyzer.result_cache else "disabled",
+            "llm_cache": analyzer.content_analyzer.llm.cache_stats() if analyzer.content_analyzer.llm else "disabled",
             "timestamp": datetime.now().isoformat()
         }
     except Exception as e:
         raise HTTPException(status_code=503, detail=f"Sistem sağlık kontrolü başarısız: {str(e)}")
 
+@router.get("/models/")
+async def get_model_status():
+    """Yüklü modeller, yükleme süreleri ve bellek kullanımı"""
+    return {
+        "models": model_registry.status(),
+        "process_rss_mb": round(current_rss_mb(), 1)
+    }
+
 @router.get("/supported-formats/")
 async def get_supported_formats():
     """Desteklenen video formatlarını döndür"""
     return {
-        "supported_video_formats": [".mp4", ".avi", ".mov", ".mkv"],
-        "max_file_size_mb": 500,
+        "supported_video_formats": settings.ALLOWED_VIDEO_EXTENSIONS,
+        "max_file_size_mb": settings.MAX_FILE_SIZE // (1024 * 1024),
         "recommended_duration_minutes": "2-15",
         "recommended_resolution": "720p veya üzeri"
     } 
\ No newline at end of file
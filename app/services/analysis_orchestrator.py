@@ -1,13 +1,22 @@
-from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from typing import Dict, Any, Optional, Callable, List
+from dataclasses import dataclass, field, fields
 import os
+import asyncio
+import inspect
+import time
 import tempfile
 from datetime import datetime
 
-from .vision_analyzer import VisionAnalyzer, VisionAnalysisResult
-from .audio_analyzer import AudioAnalyzer, AudioAnalysisResult
-from .content_analyzer import ContentAnalyzer, ContentAnalysisResult
+from .vision_analyzer import VisionAnalyzer, VisionAnalysisResult, VISION_ANALYZER_VERSION
+from .frame_sampler import get_video_properties
+from .audio_analyzer import AudioAnalyzer, AudioAnalysisResult, AUDIO_ANALYZER_VERSION
+from .content_analyzer import ContentAnalyzer, ContentAnalysisResult, CONTENT_ANALYZER_VERSION
+from .timeline import Timeline, build_timeline
+from .progress import ProgressReporter, ProgressEvent, StageProgress
+from .metrics import bind_context, record_span
+from .result_cache import get_result_cache, hash_file, hash_text, make_cache_key
 from ..core.config import settings
+from ..core.concurrency import get_analysis_executor, analysis_slot
 
 @dataclass
 class OverallAnalysisResult:
@@ -27,65 +36,149 @@ class OverallAnalysisResult:
     video_duration: float
     analysis_timestamp: datetime
     recommendations: list
+    
+    # Aşama süreleri (saniye): vision, audio, content, recommendations, timeline, total
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+    # Önbellekten gelen aşamalar
+    cached_stages: List[str] = field(default_factory=list)
+    # Ortak zaman ızgarasında pencere başına metrikler
+    timeline: Optional[Timeline] = field(default=None, compare=False)
+    # Akış modunda ders sürerken yayınlanan ara sonuç
+    partial: bool = False
+
+@dataclass
+class _AnalysisRun:
+    """Tek bir analiz çalıştırmasının aşama durumu"""
+    progress_callback: Optional[Callable] = None
+    reporter: Optional[ProgressReporter] = None
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+    cached_stages: List[str] = field(default_factory=list)
+
+def _result_schema(result_type) -> List[str]:
+    """Sonuç sınıfının alan listesi (önbellek anahtarına girer; alan eklenince eski kayıtlar geçersiz olur)"""
+    return [f.name for f in fields(result_type)]
 
 class AnalysisOrchestrator:
     def __init__(self):
         self.vision_analyzer = VisionAnalyzer()
         self.audio_analyzer = AudioAnalyzer()
         
-        # Content analyzer (Gemini API gerektirir)
-        if settings.GEMINI_API_KEY:
-            self.content_analyzer = ContentAnalyzer(settings.GEMINI_API_KEY)
-        else:
-            self.content_analyzer = None
-            print("Uyarı: GEMINI_API_KEY bulunamadı. İçerik analizi devre dışı.")
+        # Content analyzer (LLM yapılandırılmamışsa yerel, ağsız puanlayıcı)
+        self.content_analyzer = ContentAnalyzer(settings.GEMINI_API_KEY)
+        if self.content_analyzer.engine == "local":
+            print("Bilgi: İçerik analizi yerel puanlayıcı ile yapılacak (LLM kullanılmıyor).")
+        
+        # Görüntü ve ses analizleri yalnızca giriş dosyasını paylaşır; ikisi de
+        # ağırlıklı olarak C/C++ tarafında (OpenCV, MediaPipe, Whisper) çalıştığı
+        # için iş parçacıkları üzerinde gerçekten paralel ilerler. Havuz süreç
+        # genelinde paylaşılır ve boyutu sınırlıdır.
+        self.executor = get_analysis_executor()
+        
+        # Aşama sonuçları için içerik adresli önbellek
+        self.result_cache = get_result_cache() if settings.RESULT_CACHE_ENABLED else None
     
-    async def analyze_video(self, video_path: str, subject_topic: Optional[str] = None) -> OverallAnalysisResult:
+    async def analyze_video(self, video_path: str, subject_topic: Optional[str] = None,
+                            progress_callback: Optional[Callable] = None,
+                            video_hash: Optional[str] = None,
+                            on_event: Optional[Callable[[ProgressEvent], Any]] = None) -> OverallAnalysisResult:
         """
         Video'yu tüm modüllerle analiz et ve birleşik sonuç döndür
-        """
-        print(f"Video analizi başlıyor: {video_path}")
         
-        # Video süresini hesapla
-        video_duration = self._get_video_duration(video_path)
+        Görüntü ve ses analizleri paralel çalışır; içerik analizi transkript
+        hazır olur olmaz (görüntü analizi bitmeden) başlar. LLM istekleri
+        event loop üzerinde eşzamanlı bekler, yapay zeka önerileri de görüntü
+        analiziyle paralel istenir. Bloklayan hiçbir iş event loop üzerinde
+        çalışmaz.
+        
+        progress_callback(stage, status) her aşama başlarken ve bitince
+        çağrılır; senkron ya da async bir fonksiyon olabilir.
         
-        # 1. Görüntü analizi
-        print("Görüntü analizi yapılıyor...")
-        vision_result = self.vision_analyzer.analyze_video(video_path)
+        on_event(ProgressEvent) aşama geçişlerine ek olarak aşama içi
+        ilerlemeyi de alır (işlenen kare, transkript edilen saniye, tamamlanan
+        LLM çağrısı); event loop üzerinde çağrılır.
         
-        # 2. Ses analizi
-        print("Ses analizi yapılıyor...")
-        audio_result = self.audio_analyzer.analyze_audio(video_path)
+        video_hash verilmezse (ve önbellek açıksa) dosyanın SHA-256'sı hesaplanır;
+        önbellekte geçerli sonucu olan aşamalar yeniden çalıştırılmaz.
+        """
+        async with analysis_slot():
+            return await self._analyze_video(video_path, subject_topic, progress_callback, video_hash, on_event)
+    
+    async def _analyze_video(self, video_path: str, subject_topic: Optional[str],
+                             progress_callback: Optional[Callable],
+                             video_hash: Optional[str],
+                             on_event: Optional[Callable[[ProgressEvent], Any]] = None) -> OverallAnalysisResult:
+        print(f"Video analizi başlıyor: {video_path}")
+        total_start = time.perf_counter()
+        run = _AnalysisRun(
+            progress_callback=progress_callback,
+            reporter=ProgressReporter(on_event) if on_event is not None else None
+        )
+        stage_timings = run.stage_timings
         
-        # 3. İçerik analizi (eğer API anahtarı varsa)
-        if self.content_analyzer:
-            print("İçerik analizi yapılıyor...")
-            content_result = self.content_analyzer.analyze_content(
-                audio_result.transcription, subject_topic
+        # Video süresini hesapla
+        loop = asyncio.get_running_loop()
+        video_duration = await loop.run_in_executor(self.executor, self._get_video_duration, video_path)
+        
+        # Önbellek anahtarları için içerik özeti
+        if self.result_cache is not None and video_hash is None:
+            video_hash = await loop.run_in_executor(self.executor, hash_file, video_path)
+        
+        # 1. Görüntü analizi (arka planda)
+        print("Görüntü ve ses analizi paralel başlatılıyor...")
+        vision_task = asyncio.ensure_future(self._run_cached_stage(
+            run, "vision", self._vision_cache_key(video_hash),
+            self.vision_analyzer._create_fallback_result(),
+            self.vision_analyzer.analyze_video, video_path, self._stage_progress(run, "vision")
+        ))
+        engine_recommendations_task = None
+        
+        try:
+            # 2. Ses analizi
+            audio_result = await self._run_cached_stage(
+                run, "audio", self._audio_cache_key(video_hash),
+                self.audio_analyzer._create_fallback_result(),
+                self.audio_analyzer.analyze_audio, video_path, self._stage_progress(run, "audio")
             )
-        else:
-            # Varsayılan içerik sonucu
-            content_result = ContentAnalysisResult(
-                content_completeness_score=75.0,
-                missing_topics=[],
-                key_concepts=[],
-                concept_density={},
-                topic_flow_score=75.0,
-                interaction_examples_count=5,
-                educational_structure_score=70.0,
-                overall_content_score=73.0,
-                topic_heatmap=[]
+            
+            # 3. İçerik analizi - transkript hazır, görüntü analizini beklemeden başla
+            content_result = await self._run_cached_stage(
+                run, "content", self._content_cache_key(audio_result.transcription, subject_topic),
+                None, self._analyze_content, audio_result.transcription, subject_topic,
+                audio_result.segments, self._stage_progress(run, "content")
             )
+            
+            # Motor önerileri yalnızca içerik sonucuna bağlı; görüntü analizini beklemez
+            engine_recommendations_task = asyncio.ensure_future(
+                self._generate_engine_recommendations(content_result, audio_result.transcription, subject_topic)
+            )
+            
+            vision_result = await vision_task
+        except BaseException:
+            vision_task.cancel()
+            if engine_recommendations_task is not None:
+                engine_recommendations_task.cancel()
+            raise
         
         # 4. Genel skorları hesapla
         scores = self._calculate_overall_scores(vision_result, audio_result, content_result)
         
         # 5. Öneriler oluştur
-        recommendations = self._generate_recommendations(
-            vision_result, audio_result, content_result
+        recommendations = await self._run_stage(
+            run, "recommendations", self._generate_recommendations,
+            vision_result, audio_result, content_result, engine_recommendations_task
+        )
+        
+        # 6. Zaman çizelgesi (ham serilerden, analiz tekrarlanmadan)
+        timeline = await self._run_stage(
+            run, "timeline", self._build_timeline,
+            vision_result, audio_result, content_result, video_duration
         )
         
-        # 6. Sonuçları birleştir
+        total_duration = time.perf_counter() - total_start
+        stage_timings["total"] = round(total_duration, 3)
+        record_span("analysis", total_start, total_duration)
+        
+        # 7. Sonuçları birleştir
         overall_result = OverallAnalysisResult(
             vision_analysis=vision_result,
             audio_analysis=audio_result,
@@ -97,26 +190,135 @@ class AnalysisOrchestrator:
             total_score=scores['total'],
             video_duration=video_duration,
             analysis_timestamp=datetime.now(),
-            recommendations=recommendations
+            recommendations=recommendations,
+            stage_timings=stage_timings,
+            cached_stages=run.cached_stages,
+            timeline=timeline
         )
         
-        print("Analiz tamamlandı!")
+        print(f"Analiz tamamlandı! Aşama süreleri: {stage_timings}, önbellekten: {run.cached_stages}")
         return overall_result
     
-    def _get_video_duration(self, video_path: str) -> float:
-        """Video süresini saniye cinsinden döndür"""
-        import cv2
-        
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            return 0.0
+    async def _run_stage(self, run: _AnalysisRun, name: str, func: Callable, *args):
+        """Aşamayı çalıştır ve süresini kaydet (stage_timings ve span histogramı)
         
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
-        duration = frame_count / fps if fps > 0 else 0.0
+        Bloklayan fonksiyonlar havuzda, coroutine fonksiyonları event loop
+        üzerinde çalışır.
+        """
+        loop = asyncio.get_running_loop()
+        await self._notify_progress(run, name, "running")
+        start = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(func):
+                result = await func(*args)
+            else:
+                # Alt adım span'leri işin izine yazılsın diye bağlam havuza taşınır
+                result = await loop.run_in_executor(self.executor, bind_context(func), *args)
+        finally:
+            duration = time.perf_counter() - start
+            run.stage_timings[name] = round(duration, 3)
+            record_span(name, start, duration)
+        await self._notify_progress(run, name, "completed")
+        return result
+    
+    async def _run_cached_stage(self, run: _AnalysisRun, name: str, cache_key: Optional[str],
+                                fallback: Any, func: Callable, *args):
+        """Aşamayı önbellekten döndür ya da çalıştırıp sonucu önbelleğe yaz
         
-        cap.release()
-        return duration
+        fallback ile aynı olan (hata sonrası varsayılan) sonuçlar ve kısmen
+        varsayılan değerlerle tamamlanmış (degraded) sonuçlar önbelleğe alınmaz.
+        """
+        if self.result_cache is None or cache_key is None:
+            return await self._run_stage(run, name, func, *args)
+        
+        loop = asyncio.get_running_loop()
+        cached = await loop.run_in_executor(self.executor, self.result_cache.get, cache_key)
+        if cached is not None:
+            run.stage_timings[name] = 0.0
+            run.cached_stages.append(name)
+            await self._notify_progress(run, name, "completed")
+            return cached
+        
+        result = await self._run_stage(run, name, func, *args)
+        if getattr(result, "degraded", False):
+            print(f"{name} aşaması eksik sonuçla tamamlandı, önbelleğe yazılmadı")
+        elif fallback is None or result != fallback:
+            await loop.run_in_executor(self.executor, self.result_cache.set, cache_key, result)
+        return result
+    
+    def _vision_cache_key(self, video_hash: Optional[str]) -> Optional[str]:
+        if video_hash is None:
+            return None
+        return make_cache_key(
+            "vision", VISION_ANALYZER_VERSION, _result_schema(VisionAnalysisResult),
+            video_hash, settings.FRAME_SAMPLE_RATE, settings.VISION_SAMPLING_MODE,
+            settings.VISION_MOTION_PROBE_RATE, settings.VISION_MOTION_THRESHOLD,
+            settings.VISION_ADAPTIVE_MAX_INTERVAL, settings.VISION_MAX_ANALYZED_FRAMES,
+            settings.VISION_CASCADE_ENABLED, settings.VISION_DOWNSCALE_WIDTH, settings.VISION_ROI_MARGIN
+        )
+    
+    def _audio_cache_key(self, video_hash: Optional[str]) -> Optional[str]:
+        if video_hash is None:
+            return None
+        return make_cache_key(
+            "audio", AUDIO_ANALYZER_VERSION, _result_schema(AudioAnalysisResult), video_hash,
+            settings.STT_BACKEND, settings.STT_MODEL_SIZE, settings.STT_COMPUTE_TYPE,
+            settings.STT_BEAM_SIZE, settings.STT_LANGUAGE
+        )
+    
+    def _content_cache_key(self, transcription: str, subject_topic: Optional[str]) -> Optional[str]:
+        if self.result_cache is None:
+            return None
+        return make_cache_key(
+            "content", CONTENT_ANALYZER_VERSION, _result_schema(ContentAnalysisResult),
+            hash_text(transcription), subject_topic or "", self.content_analyzer.engine_name,
+            settings.CONTENT_CHUNK_MAX_TOKENS, settings.HEATMAP_SEGMENT_SECONDS, settings.HEATMAP_OVERLAP_SECONDS,
+            settings.HEATMAP_SEGMENT_WORDS, settings.HEATMAP_OVERLAP_WORDS
+        )
+    
+    def _stage_progress(self, run: _AnalysisRun, stage: str) -> Optional[StageProgress]:
+        """Aşama içi ilerleme bildirici (olay alıcısı yoksa None)"""
+        return run.reporter.stage(stage) if run.reporter is not None else None
+    
+    async def _notify_progress(self, run: _AnalysisRun, stage: str, status: str) -> None:
+        """İlerleme bildirimini gönder; bildirim hataları analizi durdurmaz"""
+        if run.reporter is not None:
+            run.reporter.emit(ProgressEvent(stage=stage, status=status))
+        if run.progress_callback is None:
+            return
+        try:
+            outcome = run.progress_callback(stage, status)
+            if inspect.isawaitable(outcome):
+                await outcome
+        except Exception as e:
+            print(f"İlerleme bildirimi hatası: {e}")
+    
+    async def _analyze_content(self, transcription: str, subject_topic: Optional[str],
+                               segments: Optional[list] = None,
+                               progress: Optional[StageProgress] = None) -> ContentAnalysisResult:
+        """İçerik analizi"""
+        print(f"İçerik analizi yapılıyor ({self.content_analyzer.engine_name})...")
+        return await self.content_analyzer.analyze_content_async(transcription, subject_topic, segments, progress)
+    
+    def _build_timeline(self, vision: VisionAnalysisResult, audio: AudioAnalysisResult,
+                        content: ContentAnalysisResult, video_duration: float) -> Optional[Timeline]:
+        """Aşama serilerini TIMELINE_WINDOW_SECONDS ızgarasına indirge"""
+        try:
+            return build_timeline(
+                video_duration, settings.TIMELINE_WINDOW_SECONDS,
+                vision_series=vision.frame_series,
+                audio_series=audio.frame_series,
+                segments=audio.segments,
+                key_concepts=content.key_concepts
+            )
+        except Exception as e:
+            print(f"Zaman çizelgesi hatası: {e}")
+            return None
+    
+    def _get_video_duration(self, video_path: str) -> float:
+        """Video süresini saniye cinsinden döndür"""
+        fps, frame_count = get_video_properties(video_path)
+        return frame_count / fps if fps > 0 else 0.0
     
     def _calculate_overall_scores(self, vision: VisionAnalysisResult, 
                                  audio: AudioAnalysisResult, 
@@ -153,9 +355,24 @@ class AnalysisOrchestrator:
             'total': round(total_score, 1)
         }
     
-    def _generate_recommendations(self, vision: VisionAnalysisResult,
-                                audio: AudioAnalysisResult,
-                                content: ContentAnalysisResult) -> list:
+    async def _generate_engine_recommendations(self, content: ContentAnalysisResult,
+                                               transcription: str,
+                                               subject_topic: Optional[str] = None) -> List[str]:
+        """İçerik motorundan önerileri iste (LLM ya da yerel puanlayıcı)"""
+        if content.content_completeness_score >= 90:
+            return []
+        try:
+            return await self.content_analyzer.generate_recommendations_async(
+                content, transcription, subject_topic
+            )
+        except Exception as e:
+            print(f"İçerik motoru önerisi hatası: {e}")
+            return []
+    
+    async def _generate_recommendations(self, vision: VisionAnalysisResult,
+                                        audio: AudioAnalysisResult,
+                                        content: ContentAnalysisResult,
+                                        engine_recommendations_task: Optional[asyncio.Future] = None) -> list:
         """Analiz sonuçlarına göre öneriler oluştur"""
         
         recommendations = []
@@ -190,16 +407,13 @@ class AnalysisOrchestrator:
         if content.topic_flow_score < 75:
             recommendations.append("🔄 Konular arası geçişleri güçlendirin. Mantıksal sırayı gözden geçirin.")
         
-        # İçerik analizörü varsa, AI önerilerini de ekle
-        if self.content_analyzer and content.content_completeness_score < 90:
-            try:
-                ai_recommendations = self.content_analyzer.generate_recommendations(
-                    content, audio.transcription
-                )
-                for rec in ai_recommendations[:3]:  # En fazla 3 AI önerisi
-                    recommendations.append(f"🤖 {rec}")
-            except:
-                pass
+        # İçerik motorunun önerilerini de ekle
+        if engine_recommendations_task is None:
+            engine_recommendations_task = self._generate_engine_recommendations(content, audio.transcription)
+        engine_recommendations = await engine_recommendations_task
+        prefix = "🤖" if self.content_analyzer.engine == "llm" else "📋"
+        for rec in engine_recommendations[:3]:  # En fazla 3 motor önerisi
+            recommendations.append(f"{prefix} {rec}")
         
         return recommendations[:10]  # Maksimum 10 öneri
     
@@ -243,4 +457,58 @@ class AnalysisOrchestrator:
                 'Dolgu Kelimeler': f"%{result.audio_analysis.filler_words_percentage:.1f}",
                 'İçerik Bütünlüğü': f"%{result.content_analysis.content_completeness_score:.1f}"
             }
-        } 
\ No newline at end of file
+        } 
+
+def serialize_analysis_result(result: OverallAnalysisResult) -> Dict[str, Any]:
+    """Analiz sonucunu JSON uyumlu sözlüğe çevir (API ve iş deposu için)"""
+    return {
+        "total_score": result.total_score,
+        "body_language_score": result.body_language_score,
+        "voice_score": result.voice_score,
+        "content_flow_score": result.content_flow_score,
+        "interaction_score": result.interaction_score,
+        "video_duration": result.video_duration,
+        "analysis_timestamp": result.analysis_timestamp.isoformat(),
+        "vision_analysis": {
+            "eye_contact_percentage": result.vision_analysis.eye_contact_percentage,
+            "posture_score": result.vision_analysis.posture_score,
+            "gesture_activity": result.vision_analysis.gesture_activity,
+            "fidgeting_count": result.vision_analysis.fidgeting_count,
+            "face_direction_changes": result.vision_analysis.face_direction_changes,
+            "overall_body_language_score": result.vision_analysis.overall_body_language_score,
+            "sampling_stats": result.vision_analysis.sampling_stats
+        },
+        "audio_analysis": {
+            "transcription": result.audio_analysis.transcription,
+            "filler_words_count": result.audio_analysis.filler_words_count,
+            "filler_words_percentage": result.audio_analysis.filler_words_percentage,
+            "speech_rate": result.audio_analysis.speech_rate,
+            "pause_count": result.audio_analysis.pause_count,
+            "average_pause_duration": result.audio_analysis.average_pause_duration,
+            "pitch_variation": result.audio_analysis.pitch_variation,
+            "monotony_score": result.audio_analysis.monotony_score,
+            "volume_consistency": result.audio_analysis.volume_consistency,
+            "overall_voice_score": result.audio_analysis.overall_voice_score,
+            "segments": [
+                {"start": seg.start, "end": seg.end, "text": seg.text}
+                for seg in result.audio_analysis.segments
+            ]
+        },
+        "content_analysis": {
+            "content_completeness_score": result.content_analysis.content_completeness_score,
+            "missing_topics": result.content_analysis.missing_topics,
+            "key_concepts": result.content_analysis.key_concepts,
+            "concept_density": result.content_analysis.concept_density,
+            "topic_flow_score": result.content_analysis.topic_flow_score,
+            "interaction_examples_count": result.content_analysis.interaction_examples_count,
+            "educational_structure_score": result.content_analysis.educational_structure_score,
+            "overall_content_score": result.content_analysis.overall_content_score,
+            "topic_heatmap": result.content_analysis.topic_heatmap,
+            "chunk_stats": result.content_analysis.chunk_stats
+        },
+        "recommendations": result.recommendations,
+        "stage_timings": result.stage_timings,
+        "cached_stages": result.cached_stages,
+        "timeline": result.timeline.to_dict() if result.timeline is not None else None,
+        "partial": result.partial
+    }
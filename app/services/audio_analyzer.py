@@ -1,21 +1,87 @@
-import whisper
 import librosa
 import numpy as np
-import re
-from typing import Dict, List, Tuple
-from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
 import parselmouth
 from parselmouth.praat import call
+import shutil
+import subprocess
 import warnings
 
+from .transcription import (
+    create_transcription_backend, TranscriptionBackend, TranscriptSegment, TranscriptionResult, WAVEFORM_SAMPLE_RATE
+)
+from .model_registry import model_registry
+from .metrics import span
+from .progress import StageProgress
+from .keyword_engine import FILLER_WORDS, TextStats, analyze_text
+from ..core.config import settings
+
 # FFmpeg kontrolü
-try:
-    from pydub import AudioSegment
-    FFMPEG_AVAILABLE = True
-except Exception:
-    FFMPEG_AVAILABLE = False
+FFMPEG_AVAILABLE = shutil.which("ffmpeg") is not None
+if not FFMPEG_AVAILABLE:
     warnings.warn("FFmpeg bulunamadı. Ses analizi sınırlı modda çalışacak.")
 
+# Sonuçları etkileyen algoritma değişikliklerinde artırılır (önbellek anahtarına girer)
+AUDIO_ANALYZER_VERSION = "2"
+
+# Tüm aşamaların paylaştığı dalga formu: 16 kHz mono float32 (Whisper'ın beklediği format)
+SAMPLE_RATE = WAVEFORM_SAMPLE_RATE
+_READ_CHUNK_BYTES = 1 << 20
+
+# STT modeli ilk transkripsiyonda bir kez yüklenir ve tüm analizörlerce paylaşılır
+model_registry.register("stt", create_transcription_backend)
+
+def load_waveform(video_path: str) -> np.ndarray:
+    """Video'daki sesi FFmpeg ile doğrudan 16 kHz mono float32 diziye çöz
+    
+    Ara WAV dosyası yazılmaz; FFmpeg çıktısı parça parça okunur ve tek bir
+    tampon içinde toplanır.
+    """
+    command = [
+        "ffmpeg", "-nostdin", "-loglevel", "error",
+        "-i", video_path,
+        "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE),
+        "-f", "f32le", "-"
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    buffer = bytearray()
+    try:
+        while True:
+            chunk = process.stdout.read(_READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            buffer.extend(chunk)
+        stderr = process.stderr.read()
+    finally:
+        process.stdout.close()
+        process.stderr.close()
+        returncode = process.wait()
+    
+    if returncode != 0:
+        raise RuntimeError(f"FFmpeg ses çözme hatası: {stderr.decode(errors='ignore').strip()}")
+    
+    # Tampon kopyalanmadan float32 dizi olarak görüntülenir
+    usable = len(buffer) - len(buffer) % 4
+    return np.frombuffer(memoryview(buffer)[:usable], dtype=np.float32)
+
+def pitch_scores(count: int, pitch_mean: float, pitch_std: float) -> Tuple[float, float]:
+    """Sesli karelerin perde istatistiklerinden (varyasyon, monotonluk)"""
+    if count < 10:
+        return 0, 1  # Çok az veri var, monoton kabul et
+    
+    # Pitch varyasyonu
+    pitch_variation = pitch_std / pitch_mean if pitch_mean > 0 else 0
+    
+    # Monotonluk skoru (düşük varyasyon = yüksek monotonluk)
+    monotony_score = max(0, 1 - pitch_variation * 2)
+    
+    return pitch_variation, monotony_score
+
+def volume_consistency_score(rms_mean: float, rms_std: float) -> float:
+    """Tutarlılık skoru (düşük varyasyon = yüksek tutarlılık)"""
+    return max(0, 1 - (rms_std / rms_mean)) if rms_mean > 0 else 0
+
 @dataclass
 class AudioAnalysisResult:
     transcription: str
@@ -28,137 +94,132 @@ class AudioAnalysisResult:
     monotony_score: float
     volume_consistency: float
     overall_voice_score: float
+    # Zaman damgalı transkript segmentleri
+    segments: List[TranscriptSegment] = field(default_factory=list)
+    # Kare başına zaman serileri (zaman çizelgesi için): rms_time, rms, pitch_time, pitch,
+    # pause_start, pause_end
+    frame_series: Dict[str, np.ndarray] = field(default_factory=dict, compare=False)
 
 class AudioAnalyzer:
     def __init__(self):
-        # Whisper modelini yükle
-        self.whisper_model = whisper.load_model("base")
-        
-        # Türkçe dolgu kelimeleri
-        self.filler_words = [
-            'eee', 'ee', 'ııı', 'şey', 'işte', 'yani', 'hani', 'böyle',
-            'falan', 'filan', 'tabi', 'tabii', 'şöyle', 'böylece',
-            'um', 'uh', 'hmm', 'ah', 'oh'
-        ]
-        
-        # Filler word pattern oluştur
-        self.filler_pattern = r'\b(' + '|'.join(self.filler_words) + r')\b'
+        # Türkçe dolgu kelimeleri (eşleştirme keyword_engine üzerinden, tek geçişte)
+        self.filler_words = FILLER_WORDS
+    
+    @property
+    def transcriber(self) -> TranscriptionBackend:
+        """Paylaşılan STT motoru (STT_BACKEND ayarı: openai-whisper / faster-whisper)"""
+        return model_registry.get("stt")
     
-    def analyze_audio(self, video_path: str) -> AudioAnalysisResult:
-        """Ana ses analiz fonksiyonu"""
+    def analyze_audio(self, video_path: str, progress: Optional[StageProgress] = None) -> AudioAnalysisResult:
+        """Ana ses analiz fonksiyonu
+        
+        progress verilirse transkript edilen ses saniyesi / toplam süre bildirilir.
+        """
         
         if not FFMPEG_AVAILABLE:
             return self._create_fallback_result()
         
         try:
-            # Video'dan ses çıkar
-            audio_path = self._extract_audio(video_path)
+            # Video'dan ses çıkar (tek decode, tüm aşamalar aynı diziyi kullanır)
+            with span("audio.decode"):
+                waveform = self._load_waveform(video_path)
         except Exception as e:
             print(f"Ses çıkarma hatası: {e}")
             return self._create_fallback_result()
         
-        try:
-            # Ses transkripti al
-            transcription = self._transcribe_audio(audio_path)
-            
-            # Dolgu kelime analizi
-            filler_count, filler_percentage = self._analyze_filler_words(transcription)
-            
-            # Konuşma hızı analizi
-            speech_rate = self._calculate_speech_rate(transcription, audio_path)
-            
-            # Duraklama analizi
-            pause_count, avg_pause_duration = self._analyze_pauses(audio_path)
-            
-            # Ses tonu analizi
-            pitch_variation, monotony_score = self._analyze_pitch(audio_path)
-            
-            # Ses seviyesi tutarlılığı
-            volume_consistency = self._analyze_volume_consistency(audio_path)
-            
-            # Genel ses skoru
-            overall_score = self._calculate_overall_voice_score(
-                filler_percentage, speech_rate, monotony_score, volume_consistency
-            )
-            
-            return AudioAnalysisResult(
-                transcription=transcription,
-                filler_words_count=filler_count,
-                filler_words_percentage=filler_percentage,
-                speech_rate=speech_rate,
-                pause_count=pause_count,
-                average_pause_duration=avg_pause_duration,
-                pitch_variation=pitch_variation,
-                monotony_score=monotony_score,
-                volume_consistency=volume_consistency,
-                overall_voice_score=overall_score
-            )
+        sr = SAMPLE_RATE
+        frame_series: Dict[str, np.ndarray] = {}
         
-        finally:
-            # Geçici ses dosyasını temizle
-            import os
-            if os.path.exists(audio_path):
-                os.remove(audio_path)
-    
-    def _extract_audio(self, video_path: str) -> str:
-        """Video'dan ses çıkar"""
-        import tempfile
-        import os
+        # Ses transkripti al
+        duration = len(waveform) / sr
+        on_progress = None
+        if progress is not None:
+            def on_progress(seconds: float):
+                progress.update(min(seconds, duration), duration, "seconds", "Transkript ediliyor")
+            on_progress(0.0)
+        with span("audio.whisper", backend=settings.STT_BACKEND):
+            transcript = self._transcribe_audio(waveform, on_progress)
+        transcription = transcript.text
+        
+        # Kelime sayısı ve dolgu kelimeleri tek taramadan gelir
+        stats = analyze_text(transcription)
+        
+        # Dolgu kelime analizi
+        filler_count, filler_percentage = self._analyze_filler_words(stats)
         
-        # Geçici ses dosyası oluştur
-        temp_dir = tempfile.mkdtemp()
-        audio_path = os.path.join(temp_dir, "extracted_audio.wav")
+        # Konuşma hızı analizi
+        speech_rate = self._calculate_speech_rate(stats, duration)
         
-        # FFmpeg ile ses çıkar
-        video = AudioSegment.from_file(video_path)
-        video.export(audio_path, format="wav")
+        # Duraklama analizi
+        with span("audio.librosa_pauses"):
+            pause_count, avg_pause_duration = self._analyze_pauses(waveform, sr, frame_series)
         
-        return audio_path
+        # Ses tonu analizi
+        with span("audio.parselmouth_pitch"):
+            pitch_variation, monotony_score = self._analyze_pitch(waveform, sr, frame_series)
+        
+        # Ses seviyesi tutarlılığı
+        with span("audio.librosa_rms"):
+            volume_consistency = self._analyze_volume_consistency(waveform, sr, frame_series)
+        
+        # Genel ses skoru
+        overall_score = self._calculate_overall_voice_score(
+            filler_percentage, speech_rate, monotony_score, volume_consistency
+        )
+        
+        return AudioAnalysisResult(
+            transcription=transcription,
+            filler_words_count=filler_count,
+            filler_words_percentage=filler_percentage,
+            speech_rate=speech_rate,
+            pause_count=pause_count,
+            average_pause_duration=avg_pause_duration,
+            pitch_variation=pitch_variation,
+            monotony_score=monotony_score,
+            volume_consistency=volume_consistency,
+            overall_voice_score=overall_score,
+            segments=transcript.segments,
+            frame_series=frame_series
+        )
+    
+    def _load_waveform(self, video_path: str) -> np.ndarray:
+        """Video'daki sesi tek seferde dalga formuna çöz"""
+        return load_waveform(video_path)
     
-    def _transcribe_audio(self, audio_path: str) -> str:
-        """Ses dosyasını transkript et"""
-        result = self.whisper_model.transcribe(audio_path, language="tr")
-        return result["text"]
+    def _transcribe_audio(self, waveform: np.ndarray,
+                          on_progress: Optional[Callable[[float], None]] = None) -> TranscriptionResult:
+        """Dalga formunu transkript et"""
+        return self.transcriber.transcribe(waveform, language=settings.STT_LANGUAGE, on_progress=on_progress)
     
-    def _analyze_filler_words(self, transcription: str) -> Tuple[int, float]:
+    def _analyze_filler_words(self, stats: TextStats) -> Tuple[int, float]:
         """Dolgu kelimeleri analiz et"""
-        # Metni küçük harfe çevir ve dolgu kelimeleri bul
-        text_lower = transcription.lower()
-        filler_matches = re.findall(self.filler_pattern, text_lower)
-        
-        # Toplam kelime sayısı
-        words = re.findall(r'\b\w+\b', transcription)
-        total_words = len(words)
+        total_words = stats.word_count
         
-        filler_count = len(filler_matches)
+        filler_count = stats.count("filler")
         filler_percentage = (filler_count / total_words * 100) if total_words > 0 else 0
         
         return filler_count, filler_percentage
     
-    def _calculate_speech_rate(self, transcription: str, audio_path: str) -> float:
+    def _calculate_speech_rate(self, stats: TextStats, duration_seconds: float) -> float:
         """Konuşma hızını hesapla (kelime/dakika)"""
-        # Toplam kelime sayısı
-        words = re.findall(r'\b\w+\b', transcription)
-        word_count = len(words)
+        word_count = stats.word_count
         
-        # Ses dosyasının süresi
-        audio = AudioSegment.from_file(audio_path)
-        duration_minutes = len(audio) / 1000 / 60  # milisaniyeden dakikaya
+        # Ses süresi (dalga formundan, yeniden decode etmeden)
+        duration_minutes = duration_seconds / 60
         
         speech_rate = word_count / duration_minutes if duration_minutes > 0 else 0
         
         return speech_rate
     
-    def _analyze_pauses(self, audio_path: str) -> Tuple[int, float]:
-        """Duraklama analizi"""
-        # Ses dosyasını yükle
-        y, sr = librosa.load(audio_path)
-        
+    def _analyze_pauses(self, y: np.ndarray, sr: int,
+                        series: Optional[Dict[str, np.ndarray]] = None) -> Tuple[int, float]:
+        """Duraklama analizi (series verilirse duraklama aralıkları da yazılır)"""
         # Ses seviyesi eşiği ile sessiz bölgeleri bul
         non_silent = librosa.effects.split(y, top_db=20)
         
         # Duraklamaları hesapla
         pauses = []
+        intervals = []
         if len(non_silent) > 1:
             for i in range(len(non_silent) - 1):
                 pause_start = non_silent[i][1]
@@ -168,58 +229,57 @@ class AudioAnalyzer:
                 # En az 0.5 saniye sessizlik olmalı
                 if pause_duration > 0.5:
                     pauses.append(pause_duration)
+                    intervals.append((pause_start / sr, pause_end / sr))
         
         pause_count = len(pauses)
         avg_pause_duration = np.mean(pauses) if pauses else 0
         
+        if series is not None:
+            bounds = np.asarray(intervals, dtype=np.float64).reshape(-1, 2)
+            series["pause_start"] = bounds[:, 0]
+            series["pause_end"] = bounds[:, 1]
+        
         return pause_count, avg_pause_duration
     
-    def _analyze_pitch(self, audio_path: str) -> Tuple[float, float]:
-        """Ses tonu ve monotonluk analizi"""
+    def _analyze_pitch(self, y: np.ndarray, sr: int,
+                       series: Optional[Dict[str, np.ndarray]] = None) -> Tuple[float, float]:
+        """Ses tonu ve monotonluk analizi (series verilirse kare başına perde de yazılır)"""
         try:
-            # Parselmouth ile ses analizi
-            sound = parselmouth.Sound(audio_path)
+            # Parselmouth ile ses analizi (bellekteki diziden)
+            sound = parselmouth.Sound(y.astype(np.float64), sampling_frequency=sr)
             
             # Pitch analizi
             pitch = call(sound, "To Pitch", 0.0, 75, 600)
             pitch_values = call(pitch, "List values", "Hertz")
             
+            if series is not None:
+                # Sessiz (unvoiced) karelerde frekans 0'dır
+                series["pitch_time"] = np.asarray(pitch.xs(), dtype=np.float64)
+                series["pitch"] = np.asarray(pitch.selected_array['frequency'], dtype=np.float32)
+            
             # NaN değerleri filtrele
             pitch_values = [p for p in pitch_values if not np.isnan(p) and p > 0]
             
             if len(pitch_values) < 10:
                 return 0, 1  # Çok az veri var, monoton kabul et
             
-            # Pitch varyasyonu
-            pitch_std = np.std(pitch_values)
-            pitch_mean = np.mean(pitch_values)
-            pitch_variation = pitch_std / pitch_mean if pitch_mean > 0 else 0
-            
-            # Monotonluk skoru (düşük varyasyon = yüksek monotonluk)
-            monotony_score = max(0, 1 - pitch_variation * 2)
-            
-            return pitch_variation, monotony_score
+            return pitch_scores(len(pitch_values), np.mean(pitch_values), np.std(pitch_values))
             
         except Exception as e:
             print(f"Pitch analizi hatası: {e}")
             return 0, 0.5  # Orta değer döndür
     
-    def _analyze_volume_consistency(self, audio_path: str) -> float:
-        """Ses seviyesi tutarlılığı analizi"""
-        # Ses dosyasını yükle
-        y, sr = librosa.load(audio_path)
-        
+    def _analyze_volume_consistency(self, y: np.ndarray, sr: int,
+                                    series: Optional[Dict[str, np.ndarray]] = None) -> float:
+        """Ses seviyesi tutarlılığı analizi (series verilirse kare başına RMS de yazılır)"""
         # RMS (Root Mean Square) energy hesapla
         rms = librosa.feature.rms(y=y, frame_length=2048, hop_length=512)[0]
         
-        # Ses seviyesi varyasyonu
-        rms_std = np.std(rms)
-        rms_mean = np.mean(rms)
-        
-        # Tutarlılık skoru (düşük varyasyon = yüksek tutarlılık)
-        consistency = max(0, 1 - (rms_std / rms_mean)) if rms_mean > 0 else 0
+        if series is not None:
+            series["rms_time"] = librosa.frames_to_time(np.arange(len(rms)), sr=sr, hop_length=512)
+            series["rms"] = rms.astype(np.float32)
         
-        return consistency
+        return volume_consistency_score(np.mean(rms), np.std(rms))
     
     def _calculate_overall_voice_score(self, filler_percentage: float, speech_rate: float,
                                      monotony_score: float, volume_consistency: float) -> float:
@@ -0,0 +1,513 @@
+"""
+Toplu analiz (ders klasörleri)
+
+Bir klasördeki ya da manifest dosyasında listelenen videolar süreç havuzunda
+analiz edilir. Her işçi süreç kendi AnalysisOrchestrator'ını bir kez oluşturur;
+Whisper ve MediaPipe modelleri işçi başına bir kez yüklenir ve sonraki
+videolarda yeniden kullanılır. İşçi sayısı çekirdek sayısına ve kullanılabilir
+belleğe göre seçilir (BATCH_CPUS_PER_WORKER, BATCH_WORKER_MEMORY_MB).
+
+Biten her video kontrol noktası dosyasına (JSONL) hemen yazılır; aynı çıktıyla
+yeniden çalıştırıldığında tamamlanmış videolar atlanır. Sonuçlar JSONL ya da
+Parquet olarak yazılır.
+
+Manifest biçimleri (göreli yollar manifestin klasörüne göre çözülür):
+- .jsonl: her satırda {"path": ..., "subject_topic": ..., "id": ...}
+- .csv: path, subject_topic, id sütunları (yalnızca path zorunlu)
+- .txt: her satırda bir video yolu
+"""
+
+import asyncio
+import csv
+import json
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, CancelledError, as_completed
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .job_store import JobStore, AnalysisJob, JOB_RUNNING, JOB_COMPLETED, JOB_FAILED
+from .model_registry import PSUTIL_AVAILABLE
+from .progress import ProgressEvent, EVENT_PROGRESS, progress_bus, publish_job_status
+from .metrics import tracing
+from ..core.config import settings
+
+BATCH_OUTPUT_FORMATS = ("jsonl", "parquet")
+
+# Parquet çıktısında sonuçtan ayrı sütun olarak yazılan alanlar
+SUMMARY_FIELDS = [
+    "total_score", "body_language_score", "voice_score", "content_flow_score",
+    "interaction_score", "video_duration"
+]
+
+
+class BatchError(Exception):
+    """Toplu analiz girdisi ya da çıktısı geçersiz"""
+
+
+class BatchLimitError(Exception):
+    """Aynı anda çalışabilecek toplu analiz sınırına ulaşıldı"""
+
+
+@dataclass
+class BatchItem:
+    item_id: str  # Kontrol noktasında videonun kimliği (klasöre göre göreli yol ya da manifest id)
+    video_path: str
+    subject_topic: Optional[str] = None
+
+
+@dataclass
+class BatchSummary:
+    total: int
+    skipped: int  # Önceki çalıştırmalarda tamamlanmış
+    completed: int
+    failed: int
+    workers: int
+    wall_seconds: float
+    video_seconds: float  # Bu çalıştırmada analiz edilen toplam video süresi
+    output_path: str
+    cancelled: bool = False
+
+    @property
+    def videos_per_hour(self) -> float:
+        return self.completed / self.wall_seconds * 3600 if self.wall_seconds > 0 else 0.0
+
+    @property
+    def video_hours_per_hour(self) -> float:
+        """Saatte analiz edilen video saati (gerçek zaman katı)"""
+        return self.video_seconds / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **asdict(self),
+            "videos_per_hour": round(self.videos_per_hour, 2),
+            "video_hours_per_hour": round(self.video_hours_per_hour, 2)
+        }
+
+
+def _resolve_under(base: str, name: str) -> str:
+    """Yolu base altında çöz; dışına çıkan yolları reddet"""
+    base = os.path.realpath(base)
+    path = os.path.realpath(os.path.join(base, name))
+    if os.path.commonpath([base, path]) != base:
+        raise BatchError("Yol izin verilen dizinin dışında")
+    return path
+
+
+def load_batch_items(source: str, subject_topic: Optional[str] = None,
+                     restrict: bool = True) -> List[BatchItem]:
+    """Klasördeki videoları ya da manifestteki kayıtları listele
+
+    restrict açıkken (API) her video BATCH_INPUT_DIR altında olmalıdır; manifestteki
+    mutlak yollar, '..' ve dışarıyı gösteren bağlantılar reddedilir.
+    """
+    if os.path.isdir(source):
+        items = _scan_directory(source, subject_topic)
+    elif os.path.isfile(source):
+        items = _read_manifest(source, subject_topic)
+    else:
+        raise BatchError(f"Toplu analiz kaynağı bulunamadı: {source}")
+
+    seen = set()
+    for item in items:
+        if item.item_id in seen:
+            raise BatchError(f"Manifestte aynı kimlik birden fazla kez var: {item.item_id}")
+        seen.add(item.item_id)
+        if restrict:
+            try:
+                item.video_path = _resolve_under(settings.BATCH_INPUT_DIR, item.video_path)
+            except BatchError:
+                raise BatchError(f"Video toplu analiz dizininin dışında: {item.item_id}") from None
+    return items
+
+
+def _scan_directory(directory: str, subject_topic: Optional[str]) -> List[BatchItem]:
+    extensions = {extension.lower() for extension in settings.ALLOWED_VIDEO_EXTENSIONS}
+    items = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in extensions:
+                path = os.path.join(root, name)
+                items.append(BatchItem(
+                    item_id=os.path.relpath(path, directory), video_path=path, subject_topic=subject_topic
+                ))
+    return items
+
+
+def _read_manifest(manifest: str, subject_topic: Optional[str]) -> List[BatchItem]:
+    base = os.path.dirname(os.path.abspath(manifest))
+    extension = os.path.splitext(manifest)[1].lower()
+
+    with open(manifest, encoding="utf-8") as f:
+        if extension == ".jsonl":
+            rows = [json.loads(line) for line in f if line.strip()]
+        elif extension == ".csv":
+            rows = list(csv.DictReader(f))
+        elif extension == ".txt":
+            rows = [{"path": line.strip()} for line in f if line.strip() and not line.startswith("#")]
+        else:
+            raise BatchError("Manifest .jsonl, .csv ya da .txt olmalı")
+
+    items = []
+    for number, row in enumerate(rows, 1):
+        if not row.get("path"):
+            raise BatchError(f"Manifest {number}. kayıtta 'path' yok")
+        path = os.path.join(base, row["path"])
+        items.append(BatchItem(
+            item_id=str(row.get("id") or row["path"]),
+            video_path=path,
+            subject_topic=row.get("subject_topic") or subject_topic
+        ))
+    return items
+
+
+def _available_memory_mb() -> float:
+    """Kullanılabilir sistem belleği (MB); ölçülemezse 0"""
+    if PSUTIL_AVAILABLE:
+        import psutil
+        return psutil.virtual_memory().available / (1024 * 1024)
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0.0
+
+
+def plan_workers(item_count: int, requested: Optional[int] = None) -> int:
+    """İşçi sayısı: verilmişse o, yoksa çekirdek ve bellek sınırlarının küçüğü"""
+    requested = settings.BATCH_WORKERS if requested is None else requested
+    if requested > 0:
+        workers = requested
+    else:
+        workers = max(1, (os.cpu_count() or 1) // max(1, settings.BATCH_CPUS_PER_WORKER))
+        available_mb = _available_memory_mb()
+        if available_mb > 0:
+            workers = min(workers, max(1, int(available_mb // max(1, settings.BATCH_WORKER_MEMORY_MB))))
+    return max(1, min(workers, item_count))
+
+
+def read_checkpoint(path: str) -> Dict[str, Dict[str, Any]]:
+    """Kontrol noktasındaki kayıtlar (her video için en son kayıt)
+
+    Yarım kalmış son satır (yazma sırasında kesilen çalıştırma) yoksayılır.
+    """
+    records: Dict[str, Dict[str, Any]] = {}
+    if not os.path.exists(path):
+        return records
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records[record["item_id"]] = record
+    return records
+
+
+# İşçi süreçteki orchestrator (ilk videoda değil, süreç başlarken bir kez oluşturulur)
+_worker_orchestrator = None
+# İşçi süreç boyunca yaşayan olay döngüsü: LLM istemcisi gibi döngüye bağlanan
+# nesneler süreç genelinde tekildir, video başına yeni döngü açılırsa ikinci videoda
+# kapanmış döngüye bağlı kalırlar
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _init_worker(cpus_per_worker: int) -> None:
+    global _worker_orchestrator, _worker_loop
+    # Paralellik videolar arasındadır; işçi içinde ikinci bir süreç havuzu açılmaz
+    settings.VISION_PARALLEL_WORKERS = 0
+    if settings.STT_THREADS <= 0:
+        settings.STT_THREADS = cpus_per_worker
+
+    import cv2
+    from .analysis_orchestrator import AnalysisOrchestrator
+
+    cv2.setNumThreads(cpus_per_worker)
+    _worker_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_worker_loop)
+    _worker_orchestrator = AnalysisOrchestrator()
+
+
+def _analyze_item(item: BatchItem) -> Dict[str, Any]:
+    """İşçi süreçte tek bir videoyu analiz et ve kontrol noktası kaydını döndür"""
+    from .analysis_orchestrator import serialize_analysis_result
+
+    start = time.perf_counter()
+    record: Dict[str, Any] = {
+        "item_id": item.item_id,
+        "video_path": item.video_path,
+        "subject_topic": item.subject_topic,
+        "worker_pid": os.getpid()
+    }
+    try:
+        with tracing(f"batch_{item.item_id}"):
+            result = _worker_loop.run_until_complete(
+                _worker_orchestrator.analyze_video(item.video_path, item.subject_topic)
+            )
+        record.update(status=JOB_COMPLETED, error=None, result=serialize_analysis_result(result))
+    except Exception as e:
+        print(f"Toplu analiz hatası ({item.item_id}): {e}")
+        record.update(status=JOB_FAILED, error=str(e), result=None)
+    record["elapsed_seconds"] = round(time.perf_counter() - start, 3)
+    record["finished_at"] = datetime.now().isoformat()
+    return record
+
+
+def _failed_record(item: BatchItem, error: BaseException) -> Dict[str, Any]:
+    """İşçi süreç çöktüğünde (ör. bellek yetersizliği) yazılan kayıt"""
+    return {
+        "item_id": item.item_id, "video_path": item.video_path, "subject_topic": item.subject_topic,
+        "worker_pid": None, "status": JOB_FAILED, "error": f"İşçi süreç hatası: {error!r}", "result": None,
+        "elapsed_seconds": None, "finished_at": datetime.now().isoformat()
+    }
+
+
+def _flat_row(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Parquet satırı: özet skorlar ve aşama süreleri sütun, tam sonuç JSON metni"""
+    result = record.get("result") or {}
+    row = {key: record.get(key) for key in (
+        "item_id", "video_path", "subject_topic", "status", "error", "elapsed_seconds", "worker_pid", "finished_at"
+    )}
+    row.update({key: result.get(key) for key in SUMMARY_FIELDS})
+    for stage, seconds in (result.get("stage_timings") or {}).items():
+        row[f"seconds_{stage}"] = seconds
+    row["result_json"] = json.dumps(result, ensure_ascii=False) if result else None
+    return row
+
+
+class BatchRunner:
+    """Videoları süreç havuzunda analiz edip kontrol noktası ve çıktı dosyası yazan yürütücü
+
+    on_record(record, done, total) her video bittiğinde yürütücünün iş
+    parçacığında çağrılır.
+    """
+
+    def __init__(self, items: List[BatchItem], output_path: str, output_format: Optional[str] = None,
+                 workers: Optional[int] = None, retry_failed: bool = True,
+                 on_record: Optional[Callable[[Dict[str, Any], int, int], None]] = None):
+        self.items = items
+        self.output_path = output_path
+        self.output_format = output_format or ("parquet" if output_path.endswith(".parquet") else "jsonl")
+        if self.output_format not in BATCH_OUTPUT_FORMATS:
+            raise BatchError(f"Desteklenmeyen çıktı biçimi: {self.output_format}")
+        if self.output_format == "parquet":
+            _check_parquet_support()
+        # JSONL çıktısı kontrol noktasının kendisidir; Parquet en sonda kontrol noktasından yazılır
+        self.checkpoint_path = output_path if self.output_format == "jsonl" else output_path + ".checkpoint.jsonl"
+        self.workers = workers
+        self.retry_failed = retry_failed
+        self.on_record = on_record
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """Yeni video başlatma; çalışan videolar bitince dur (tekrar çalıştırınca kaldığı yerden devam eder)"""
+        self._cancelled.set()
+
+    def run(self) -> BatchSummary:
+        os.makedirs(os.path.dirname(os.path.abspath(self.output_path)), exist_ok=True)
+        previous = read_checkpoint(self.checkpoint_path)
+        finished_statuses = {JOB_COMPLETED} if self.retry_failed else {JOB_COMPLETED, JOB_FAILED}
+        pending = [
+            item for item in self.items
+            if previous.get(item.item_id, {}).get("status") not in finished_statuses
+        ]
+        skipped = len(self.items) - len(pending)
+        workers = plan_workers(len(pending), self.workers) if pending else 0
+        print(f"Toplu analiz: {len(self.items)} video, {skipped} tanesi daha önce tamamlanmış, {workers} işçi")
+
+        start = time.perf_counter()
+        completed = failed = 0
+        video_seconds = 0.0
+        if pending:
+            completed, failed, video_seconds = self._run_pool(pending, workers)
+        wall_seconds = time.perf_counter() - start
+
+        self._write_output()
+        summary = BatchSummary(
+            total=len(self.items), skipped=skipped, completed=completed, failed=failed, workers=workers,
+            wall_seconds=round(wall_seconds, 3), video_seconds=round(video_seconds, 3),
+            output_path=self.output_path, cancelled=self._cancelled.is_set()
+        )
+        print(
+            f"Toplu analiz bitti: {completed} tamamlandı, {failed} başarısız, {wall_seconds / 60:.1f} dk, "
+            f"{summary.videos_per_hour:.1f} video/saat ({summary.video_hours_per_hour:.2f}x gerçek zaman)"
+        )
+        return summary
+
+    def _run_pool(self, pending: List[BatchItem], workers: int) -> Tuple[int, int, float]:
+        completed = failed = 0
+        video_seconds = 0.0
+        cpus_per_worker = max(1, (os.cpu_count() or 1) // workers)
+        # MediaPipe ve iş parçacıklı üst süreçle fork güvenli değil; spawn kullan
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(cpus_per_worker,)
+        ) as pool, open(self.checkpoint_path, "a", encoding="utf-8") as checkpoint:
+            futures = {pool.submit(_analyze_item, item): item for item in pending}
+            for future in as_completed(futures):
+                item = futures[future]
+                try:
+                    record = future.result()
+                except CancelledError:
+                    continue
+                except Exception as e:
+                    record = _failed_record(item, e)
+
+                checkpoint.write(json.dumps(record, ensure_ascii=False) + "\n")
+                checkpoint.flush()
+                os.fsync(checkpoint.fileno())
+
+                if record["status"] == JOB_COMPLETED:
+                    completed += 1
+                    video_seconds += record["result"].get("video_duration") or 0.0
+                    outcome = f"{record['result'].get('total_score', 0):.1f} puan"
+                else:
+                    failed += 1
+                    outcome = f"hata: {record['error']}"
+                done = completed + failed
+                print(f"[{done}/{len(pending)}] {item.item_id}: {outcome} ({record.get('elapsed_seconds') or 0:.0f} sn)")
+                if self.on_record is not None:
+                    try:
+                        self.on_record(record, done, len(pending))
+                    except Exception as e:
+                        print(f"Toplu analiz bildirimi hatası: {e}")
+
+                if self._cancelled.is_set():
+                    for other in futures:
+                        other.cancel()
+        return completed, failed, video_seconds
+
+    def _write_output(self) -> None:
+        """Kontrol noktasını video sırasıyla (her video için son kayıt) çıktıya yaz"""
+        records = read_checkpoint(self.checkpoint_path)
+        ordered = [records[item.item_id] for item in self.items if item.item_id in records]
+        temporary = f"{self.output_path}.tmp"
+        if self.output_format == "parquet":
+            import pandas as pd
+
+            pd.DataFrame([_flat_row(record) for record in ordered]).to_parquet(temporary, index=False)
+        else:
+            with open(temporary, "w", encoding="utf-8") as f:
+                for record in ordered:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.replace(temporary, self.output_path)
+
+
+def _check_parquet_support() -> None:
+    """Parquet yazımı için pandas ve bir Parquet motoru gerekir (saatler süren işten önce kontrol edilir)"""
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        raise BatchError("Parquet çıktısı için pandas gerekli")
+    for engine in ("pyarrow", "fastparquet"):
+        try:
+            __import__(engine)
+            return
+        except ImportError:
+            continue
+    raise BatchError("Parquet çıktısı için pyarrow ya da fastparquet gerekli; JSONL kullanabilirsiniz")
+
+
+class BatchJobManager:
+    """API'den başlatılan toplu analizleri iş deposu üzerinden yürüten yönetici
+
+    Kaynaklar BATCH_INPUT_DIR, çıktılar BATCH_OUTPUT_DIR altında olmalıdır.
+    Aynı çıktı adıyla yeniden başlatılan toplu analiz kaldığı yerden devam eder.
+    """
+
+    def __init__(self, store: JobStore):
+        self.store = store
+        self._active: Dict[str, Tuple[asyncio.Task, BatchRunner]] = {}
+        # Başlatılmakta olan (girdisi okunan, kaydı yazılan) toplu analizler; sınıra dahildir
+        self._starting = 0
+
+    async def start(self, source: str, output: Optional[str] = None, output_format: Optional[str] = None,
+                    subject_topic: Optional[str] = None, workers: int = 0,
+                    retry_failed: bool = True) -> str:
+        """Toplu analizi başlat ve iş kimliğini döndür"""
+        # Yer ilk await'ten önce ayrılır; eşzamanlı istekler sınırı birlikte aşamaz
+        if len(self._active) + self._starting >= settings.BATCH_MAX_ACTIVE:
+            raise BatchLimitError("Aynı anda çalışabilecek toplu analiz sınırına ulaşıldı")
+        self._starting += 1
+        try:
+            return await self._start(source, output, output_format, subject_topic, workers, retry_failed)
+        finally:
+            self._starting -= 1
+
+    async def _start(self, source: str, output: Optional[str], output_format: Optional[str],
+                     subject_topic: Optional[str], workers: int, retry_failed: bool) -> str:
+        if output is not None and output_format is not None:
+            extension = os.path.splitext(output)[1].lower().lstrip(".")
+            if extension in BATCH_OUTPUT_FORMATS and extension != output_format:
+                raise BatchError(f"Çıktı uzantısı ({extension}) ile biçim ({output_format}) uyuşmuyor")
+
+        loop = asyncio.get_running_loop()
+        source_path = _resolve_under(settings.BATCH_INPUT_DIR, source)
+        items = await loop.run_in_executor(None, load_batch_items, source_path, subject_topic, True)
+        if not items:
+            raise BatchError("Kaynakta analiz edilecek video bulunamadı")
+
+        job_id = f"batch_{uuid.uuid4().hex}"
+        # Biçim verilmezse çıktı uzantısından belirlenir (bkz. BatchRunner)
+        output = output or f"{os.path.splitext(os.path.basename(source_path.rstrip(os.sep)))[0]}.{output_format or 'jsonl'}"
+        output_path = _resolve_under(settings.BATCH_OUTPUT_DIR, output)
+
+        def on_record(record: Dict[str, Any], done: int, total: int):
+            # Yürütücünün iş parçacığından event loop'a aktarılır
+            loop.call_soon_threadsafe(progress_bus.publish, job_id, ProgressEvent(
+                stage="batch", status=EVENT_PROGRESS, done=done, total=total, unit="videos",
+                message=f"{record['item_id']}: {record['status']}"
+            ))
+            asyncio.run_coroutine_threadsafe(
+                self.store.update(job_id, progress=round(done / total * 100, 1)), loop
+            )
+
+        runner = BatchRunner(items, output_path, output_format, workers or None, retry_failed, on_record)
+        now = datetime.now()
+        await self.store.create(AnalysisJob(
+            job_id=job_id, status=JOB_RUNNING, created_at=now, updated_at=now,
+            filename=source, subject_topic=subject_topic, stages={"batch": "running"}
+        ))
+        publish_job_status(job_id, JOB_RUNNING)
+        task = asyncio.create_task(self._run(job_id, runner), name=job_id)
+        self._active[job_id] = (task, runner)
+        return job_id
+
+    def stop(self, job_id: str) -> bool:
+        """Yeni video başlatmayı durdur; iş bulunamazsa False"""
+        entry = self._active.get(job_id)
+        if entry is None:
+            return False
+        entry[1].cancel()
+        return True
+
+    def shutdown(self) -> None:
+        for _, runner in self._active.values():
+            runner.cancel()
+
+    async def _run(self, job_id: str, runner: BatchRunner) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            # Yürütücü süreç havuzunu bekleyerek bloklar; analiz havuzunu meşgul etmemesi için varsayılan havuzda çalışır
+            summary = await loop.run_in_executor(None, runner.run)
+            await self.store.update(
+                job_id, status=JOB_COMPLETED, progress=100.0, stages={"batch": "completed"},
+                result=summary.to_dict()
+            )
+            publish_job_status(job_id, JOB_COMPLETED)
+        except Exception as e:
+            print(f"Toplu analiz hatası ({job_id}): {e}")
+            await self.store.update(job_id, status=JOB_FAILED, error=str(e))
+            publish_job_status(job_id, JOB_FAILED, str(e))
+        finally:
+            self._active.pop(job_id, None)
@@ -1,12 +1,27 @@
-import google.generativeai as genai
+import asyncio
 import re
+import time
 import numpy as np
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple, Optional, Union
+from dataclasses import dataclass, field
 from collections import Counter
 import nltk
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize, sent_tokenize
+from nltk.tokenize import sent_tokenize
+
+from .llm_client import LLMClient, get_llm_client, is_llm_configured
+from .local_content_scorer import LocalContentScorer, LocalContentScores, LOCAL_SCORER_VERSION
+from .keyword_engine import TextStats, analyze_text
+from .topic_heatmap import TopicHeatmap, build_topic_heatmap
+from .transcription import TranscriptSegment
+from .transcript_chunker import TranscriptChunk, chunk_transcript
+from .progress import StageProgress
+from .metrics import bind_context, span
+from ..core.config import settings
+from ..core.concurrency import get_analysis_executor
+
+# Sonuçları etkileyen algoritma değişikliklerinde artırılır (önbellek anahtarına girer)
+CONTENT_ANALYZER_VERSION = "3"
 
 @dataclass
 class ContentAnalysisResult:
@@ -19,12 +34,43 @@ class ContentAnalysisResult:
     educational_structure_score: float
     overall_content_score: float
     topic_heatmap: List[Dict[str, any]]  # segment-wise topic analysis
+    # Aynı haritanın segmentler x kavramlar matrisi (grafikler için)
+    topic_matrix: Optional[TopicHeatmap] = field(default=None, compare=False)
+    # Uzun transkriptlerde map-reduce parçaları: boyut (token), zaman aralığı ve gecikme
+    chunk_stats: List[Dict[str, Any]] = field(default_factory=list)
+    # LLM yanıtlarından biri alınamadı ve varsayılan skor kullanıldı (önbelleğe yazılmaz)
+    degraded: bool = field(default=False, compare=False)
+
+@dataclass
+class _LLMCallProgress:
+    """Bir içerik analizinde tamamlanan LLM çağrıları (aşama ilerlemesi için)"""
+    progress: StageProgress
+    total: int
+    done: int = 0
+
+    def call_finished(self) -> None:
+        self.done += 1
+        self.progress.update(self.done, self.total, "calls", f"{self.done}/{self.total} LLM çağrısı")
+
+def resolve_content_engine(engine: Optional[str] = None) -> str:
+    """CONTENT_ENGINE ayarını "llm" ya da "local" olarak çöz"""
+    engine = engine or settings.CONTENT_ENGINE
+    if engine == "auto":
+        return "llm" if is_llm_configured() else "local"
+    if engine not in ("llm", "local"):
+        raise ValueError(f"Bilinmeyen içerik motoru: {engine}")
+    return engine
 
 class ContentAnalyzer:
-    def __init__(self, api_key: str):
-        """Gemini API anahtarı ile başlat"""
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
+    def __init__(self, api_key: Optional[str] = None, llm_client: Optional[LLMClient] = None,
+                 engine: Optional[str] = None):
+        """İçerik motoruyla başlat
+        
+        engine="llm" ise LLM istemcisi (verilmezse süreç genelindeki istemci),
+        engine="local" ise ağ gerektirmeyen yerel puanlayıcı kullanılır.
+        Verilmezse CONTENT_ENGINE ayarı geçerlidir.
+        """
+        self.engine = "llm" if llm_client is not None else resolve_content_engine(engine)
         
         # NLTK verilerini indir (ilk çalıştırma için)
         try:
@@ -43,33 +89,59 @@ class ContentAnalyzer:
                 'bir', 'bu', 'da', 'de', 'den', 'ile', 'için', 'gibi', 'daha',
                 've', 'var', 'yok', 'olan', 'olan', 'çok', 'tüm', 'her'
             }
-    
-    def analyze_content(self, transcription: str, subject_topic: str = None) -> ContentAnalysisResult:
-        """Ana içerik analiz fonksiyonu"""
         
-        try:
-            # İçerik bütünlüğü analizi
-            completeness_score, missing_topics = self._analyze_content_completeness(
-                transcription, subject_topic
-            )
-        except Exception as e:
-            print(f"İçerik bütünlüğü analizi hatası: {e}")
-            completeness_score, missing_topics = 75.0, []
+        self.llm: Optional[LLMClient] = None
+        self.local_scorer: Optional[LocalContentScorer] = None
+        if self.engine == "llm":
+            self.llm = llm_client or get_llm_client(api_key)
+        else:
+            self.local_scorer = LocalContentScorer(self.turkish_stopwords)
+    
+    @property
+    def engine_name(self) -> str:
+        """Sonucu etkileyen motor kimliği (önbellek anahtarına girer)"""
+        if self.llm is not None:
+            return self.llm.model_name
+        return f"local-{LOCAL_SCORER_VERSION}"
+    
+    def analyze_content(self, transcription: str, subject_topic: str = None,
+                        segments: Optional[List[TranscriptSegment]] = None) -> ContentAnalysisResult:
+        """Ana içerik analiz fonksiyonu (event loop dışından çağıranlar için)"""
+        return asyncio.run(self.analyze_content_async(transcription, subject_topic, segments))
+    
+    async def analyze_content_async(self, transcription: str, subject_topic: str = None,
+                                    segments: Optional[List[TranscriptSegment]] = None,
+                                    progress: Optional[StageProgress] = None) -> ContentAnalysisResult:
+        """Ana içerik analiz fonksiyonu
         
-        # Anahtar kavram analizi
-        key_concepts, concept_density = self._extract_key_concepts(transcription)
+        Bütünlük, akış ve yapı istemleri aynı anda gönderilir; yerel hesaplamalar
+        (anahtar kavramlar, etkileşim sayısı, yoğunluk haritası) yanıtlar
+        beklenirken yapılır. Toplam süre yaklaşık tek bir LLM gidiş-dönüşüdür.
         
-        # Konu akışı analizi
-        topic_flow_score = self._analyze_topic_flow(transcription)
+        Transkript CONTENT_CHUNK_MAX_TOKENS'ı aşarsa segment sınırlarından
+        parçalara bölünür ve map-reduce ile analiz edilir (bkz. _analyze_chunked).
         
-        # Etkileşim ve örneklendirme analizi
-        interaction_count = self._count_interaction_examples(transcription)
+        Yerel motorda skorlar ağ bağlantısı olmadan, aynı havuzda hesaplanır.
         
-        # Eğitimsel yapı analizi
-        structure_score = self._analyze_educational_structure(transcription)
+        progress verilirse tamamlanan LLM çağrısı / toplam çağrı bildirilir.
+        """
+        loop = asyncio.get_running_loop()
+        if self.local_scorer is not None:
+            score_analysis = loop.run_in_executor(
+                get_analysis_executor(), bind_context(self._analyze_offline), transcription, subject_topic
+            )
+        else:
+            score_analysis = self._start_score_analysis(transcription, subject_topic, segments, progress)
         
-        # Konu yoğunluk haritası
-        topic_heatmap = self._create_topic_heatmap(transcription, key_concepts)
+        try:
+            key_concepts, concept_density, interaction_count, topic_matrix = await loop.run_in_executor(
+                get_analysis_executor(), bind_context(self._analyze_locally), transcription, segments
+            )
+            (completeness_score, missing_topics, topic_flow_score, structure_score,
+             chunk_stats, degraded) = await score_analysis
+        except BaseException:
+            score_analysis.cancel()
+            raise
         
         # Genel içerik skoru
         overall_score = self._calculate_overall_content_score(
@@ -86,13 +158,178 @@ class ContentAnalyzer:
             interaction_examples_count=interaction_count,
             educational_structure_score=structure_score,
             overall_content_score=overall_score,
-            topic_heatmap=topic_heatmap
+            topic_heatmap=topic_matrix.to_records(),
+            topic_matrix=topic_matrix,
+            chunk_stats=chunk_stats,
+            degraded=degraded
+        )
+    
+    def _start_score_analysis(self, transcription: str, subject_topic: Optional[str],
+                            segments: Optional[List[TranscriptSegment]],
+                            progress: Optional[StageProgress] = None) -> asyncio.Future:
+        """LLM skorlarını arka planda istemeye başla"""
+        chunks = chunk_transcript(transcription, segments, settings.CONTENT_CHUNK_MAX_TOKENS)
+        if len(chunks) > 1:
+            # Parça başına özet + akış, ardından bütünlük + yapı
+            calls = _LLMCallProgress(progress, 2 * len(chunks) + 2) if progress is not None else None
+            score_analysis = asyncio.ensure_future(self._analyze_chunked(chunks, subject_topic, calls))
+        else:
+            calls = _LLMCallProgress(progress, 3) if progress is not None else None
+            score_analysis = asyncio.ensure_future(self._analyze_whole(transcription, subject_topic, calls))
+        return score_analysis
+    
+    async def _generate_many(self, prompts: List[str],
+                             calls: Optional[_LLMCallProgress] = None) -> List[Union[str, BaseException]]:
+        """İstemleri eşzamanlı gönder; her yanıt geldiğinde ilerlemeyi bildir"""
+        if calls is None:
+            return await self.llm.generate_many(prompts)
+        
+        async def generate(prompt: str) -> str:
+            try:
+                return await self.llm.generate(prompt)
+            finally:
+                calls.call_finished()
+        
+        return await asyncio.gather(*(generate(p) for p in prompts), return_exceptions=True)
+    
+    def _score_locally(self, transcription: str, subject_topic: Optional[str]) -> LocalContentScores:
+        """Yerel puanlayıcı (CPU işi; havuzda çalıştırılır)"""
+        with span("content.local_scoring"):
+            return self.local_scorer.score(transcription, subject_topic)
+    
+    def _analyze_offline(self, transcription: str, subject_topic: Optional[str]):
+        """Yerel puanlayıcı ile bütünlük, akış ve yapı skorları"""
+        scores = self._score_locally(transcription, subject_topic)
+        return (
+            scores.completeness_score, scores.missing_topics, scores.topic_flow_score,
+            scores.educational_structure_score, [], False
         )
     
-    def _analyze_content_completeness(self, transcription: str, subject_topic: str = None) -> Tuple[float, List[str]]:
-        """İçerik bütünlüğü ve eksik konuları analiz et"""
+    async def _analyze_whole(self, transcription: str, subject_topic: Optional[str],
+                             calls: Optional[_LLMCallProgress] = None):
+        """Transkriptin tamamını tek istemlerle analiz et"""
+        completeness_response, flow_response, structure_response = await self._generate_many([
+            self._content_completeness_prompt(transcription, subject_topic),
+            self._topic_flow_prompt(transcription),
+            self._educational_structure_prompt(transcription)
+        ], calls)
+        
+        # İçerik bütünlüğü analizi
+        completeness_score, missing_topics = self._parse_content_completeness(completeness_response)
         
-        prompt = f"""
+        # Konu akışı analizi
+        topic_flow_score = self._parse_topic_flow(flow_response)
+        
+        # Eğitimsel yapı analizi
+        structure_score = self._parse_educational_structure(structure_response)
+        
+        degraded = any(
+            isinstance(response, BaseException)
+            for response in (completeness_response, flow_response, structure_response)
+        )
+        return completeness_score, missing_topics, topic_flow_score, structure_score, [], degraded
+    
+    async def _analyze_chunked(self, chunks: List[TranscriptChunk], subject_topic: Optional[str],
+                               calls: Optional[_LLMCallProgress] = None):
+        """Uzun transkripti map-reduce ile analiz et
+        
+        Map: her parça için konu akışı skoru ve kısa bir bölüm özeti (parçalar
+        paralel gönderilir). Reduce: akış skoru parçaların token ağırlıklı
+        ortalamasıdır; bütünlük ve eğitimsel yapı dersin geneline ait olduğu
+        için sıralı bölüm özetleri üzerinden değerlendirilir.
+        """
+        async def map_chunk(chunk: TranscriptChunk):
+            start = time.perf_counter()
+            summary_response, flow_response = await self._generate_many([
+                self._chunk_summary_prompt(chunk.text),
+                self._topic_flow_prompt(chunk.text)
+            ], calls)
+            return summary_response, flow_response, time.perf_counter() - start
+        
+        map_start = time.perf_counter()
+        mapped = await asyncio.gather(*(map_chunk(chunk) for chunk in chunks))
+        map_seconds = time.perf_counter() - map_start
+        
+        chunk_stats = [
+            {
+                'chunk_id': chunk.chunk_id,
+                'start': chunk.start,
+                'end': chunk.end,
+                'tokens': chunk.tokens,
+                'latency_seconds': round(latency, 3)
+            }
+            for chunk, (_, _, latency) in zip(chunks, mapped)
+        ]
+        
+        # Konu akışı: parça skorlarının token ağırlıklı ortalaması
+        flow_scores = [self._parse_topic_flow(flow_response) for _, flow_response, _ in mapped]
+        topic_flow_score = float(np.average(flow_scores, weights=[chunk.tokens for chunk in chunks]))
+        
+        # Bütünlük ve yapı: bölüm özetleri üzerinden
+        summaries = []
+        for chunk, (summary_response, _, _) in zip(chunks, mapped):
+            if isinstance(summary_response, BaseException):
+                print(f"Bölüm özeti hatası (parça {chunk.chunk_id}): {summary_response}")
+                continue
+            summaries.append(f"[Bölüm {chunk.chunk_id + 1}/{len(chunks)}]\n{summary_response.strip()}")
+        
+        reduce_start = time.perf_counter()
+        if summaries:
+            digest = "(Uzun bir dersin sırayla bölüm özetleri)\n\n" + "\n\n".join(summaries)
+            completeness_response, structure_response = await self._generate_many([
+                self._content_completeness_prompt(digest, subject_topic),
+                self._educational_structure_prompt(digest)
+            ], calls)
+        else:
+            completeness_response = structure_response = RuntimeError("Hiçbir bölüm özeti alınamadı")
+        reduce_seconds = time.perf_counter() - reduce_start
+        
+        completeness_score, missing_topics = self._parse_content_completeness(completeness_response)
+        structure_score = self._parse_educational_structure(structure_response)
+        
+        # Eksik bölüm özeti de bütünlük ve yapı skorlarını eksik bir özetten hesaplatır
+        responses = [response for summary, flow, _ in mapped for response in (summary, flow)]
+        responses += [completeness_response, structure_response]
+        degraded = any(isinstance(response, BaseException) for response in responses)
+        
+        token_counts = [chunk.tokens for chunk in chunks]
+        print(
+            f"İçerik analizi {len(chunks)} parçada yapıldı "
+            f"(token: {min(token_counts)}-{max(token_counts)}, map {map_seconds:.1f}s, reduce {reduce_seconds:.1f}s)"
+        )
+        
+        return completeness_score, missing_topics, topic_flow_score, structure_score, chunk_stats, degraded
+    
+    def _chunk_summary_prompt(self, text: str) -> str:
+        return f"""
+        Aşağıdaki metin uzun bir eğitim videosu transkriptinin bir bölümüdür:
+        
+        "{text}"
+        
+        Bu bölümde anlatılan konuları, verilen örnekleri ve varsa hedef belirleme,
+        tekrar, soru sorma ve özetleme gibi pedagojik öğeleri en fazla 6 madde
+        halinde özetle. Her maddeyi yeni satırda "- " ile başlat.
+        """
+    
+    def _analyze_locally(self, transcription: str, segments: Optional[List[TranscriptSegment]] = None):
+        """LLM gerektirmeyen analizler"""
+        with span("content.local_features"):
+            # Kelime sıklıkları ve etkileşim ifadeleri tek taramadan gelir
+            stats = analyze_text(transcription)
+            
+            # Anahtar kavram analizi
+            key_concepts, concept_density = self._extract_key_concepts(stats)
+            
+            # Etkileşim ve örneklendirme analizi
+            interaction_count = self._count_interaction_examples(stats)
+            
+            # Konu yoğunluk haritası
+            topic_matrix = self._create_topic_heatmap(transcription, key_concepts, segments)
+        
+        return key_concepts, concept_density, interaction_count, topic_matrix
+    
+    def _content_completeness_prompt(self, transcription: str, subject_topic: str = None) -> str:
+        return f"""
         Aşağıdaki eğitim videosu transkriptini analiz et:
         
         "{transcription}"
@@ -108,49 +345,44 @@ class ContentAnalyzer:
         BÜTÜNLÜK SKORU: [0-100 arası sayı]
         EKSİK KONULAR: [eksik konuları virgülle ayırarak listele]
         """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            result_text = response.text
-            
-            # Skoru parse et
-            score_match = re.search(r'BÜTÜNLÜK SKORU:\s*(\d+)', result_text)
-            completeness_score = float(score_match.group(1)) if score_match else 70.0
-            
-            # Eksik konuları parse et
-            missing_match = re.search(r'EKSİK KONULAR:\s*(.+)', result_text)
-            missing_topics = []
-            if missing_match:
-                missing_text = missing_match.group(1).strip()
-                if missing_text and missing_text.lower() not in ['yok', 'bulunmuyor', 'eksik yok']:
-                    missing_topics = [topic.strip() for topic in missing_text.split(',')]
-            
-            return completeness_score, missing_topics
-            
-        except Exception as e:
-            print(f"İçerik bütünlüğü analizi hatası: {e}")
-            return 70.0, []  # Varsayılan değerler
     
-    def _extract_key_concepts(self, transcription: str) -> Tuple[List[str], Dict[str, float]]:
-        """Anahtar kavramları çıkar ve yoğunluklarını hesapla"""
+    def _parse_content_completeness(self, response: Union[str, BaseException]) -> Tuple[float, List[str]]:
+        """İçerik bütünlüğü ve eksik konuları yanıttan çıkar"""
+        if isinstance(response, BaseException):
+            print(f"İçerik bütünlüğü analizi hatası: {response}")
+            return 70.0, []  # Varsayılan değerler
+        
+        # Skoru parse et
+        score_match = re.search(r'BÜTÜNLÜK SKORU:\s*(\d+)', response)
+        completeness_score = float(score_match.group(1)) if score_match else 70.0
         
-        # Basit NLP ile anahtar kelime çıkarma
-        words = word_tokenize(transcription.lower())
+        # Eksik konuları parse et
+        missing_match = re.search(r'EKSİK KONULAR:\s*(.+)', response)
+        missing_topics = []
+        if missing_match:
+            missing_text = missing_match.group(1).strip()
+            if missing_text and missing_text.lower() not in ['yok', 'bulunmuyor', 'eksik yok']:
+                missing_topics = [topic.strip() for topic in missing_text.split(',')]
         
+        return completeness_score, missing_topics
+    
+    def _extract_key_concepts(self, stats: TextStats) -> Tuple[List[str], Dict[str, float]]:
+        """Anahtar kavramları çıkar ve yoğunluklarını hesapla"""
+        return self.key_concepts_from_frequencies(stats.term_frequencies)
+    
+    def key_concepts_from_frequencies(self, term_frequencies: Counter) -> Tuple[List[str], Dict[str, float]]:
+        """Kelime sıklıklarından anahtar kavramlar ve yoğunlukları (akış modunda biriken sayımlar için de)"""
         # Stopwords ve kısa kelimeleri filtrele
-        filtered_words = [
-            word for word in words 
+        word_freq = Counter({
+            word: freq for word, freq in term_frequencies.items()
             if len(word) > 3 and word.isalpha() and word not in self.turkish_stopwords
-        ]
-        
-        # Kelime sıklığı
-        word_freq = Counter(filtered_words)
+        })
         
         # En sık kullanılan kelimeleri al (anahtar kavramlar)
         key_concepts = [word for word, freq in word_freq.most_common(10) if freq > 1]
         
         # Kavram yoğunluğu hesapla
-        total_words = len(filtered_words)
+        total_words = sum(word_freq.values())
         concept_density = {
             concept: (word_freq[concept] / total_words * 100) 
             for concept in key_concepts
@@ -158,10 +390,8 @@ class ContentAnalyzer:
         
         return key_concepts, concept_density
     
-    def _analyze_topic_flow(self, transcription: str) -> float:
-        """Konu akışı ve mantıksal geçişleri analiz et"""
-        
-        prompt = f"""
+    def _topic_flow_prompt(self, transcription: str) -> str:
+        return f"""
         Bu eğitim içeriğinin konu akışını analiz et:
         
         "{transcription}"
@@ -175,43 +405,24 @@ class ContentAnalyzer:
         0-100 arası bir akış skoru ver:
         AKIŞ SKORU: [sayı]
         """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            result_text = response.text
-            
-            # Skoru parse et
-            score_match = re.search(r'AKIŞ SKORU:\s*(\d+)', result_text)
-            flow_score = float(score_match.group(1)) if score_match else 75.0
-            
-            return flow_score
-            
-        except Exception as e:
-            print(f"Konu akışı analizi hatası: {e}")
+    
+    def _parse_topic_flow(self, response: Union[str, BaseException]) -> float:
+        """Konu akışı skorunu yanıttan çıkar"""
+        if isinstance(response, BaseException):
+            print(f"Konu akışı analizi hatası: {response}")
             return 75.0  # Varsayılan değer
+        
+        score_match = re.search(r'AKIŞ SKORU:\s*(\d+)', response)
+        return float(score_match.group(1)) if score_match else 75.0
     
-    def _count_interaction_examples(self, transcription: str) -> int:
+    def _count_interaction_examples(self, stats: TextStats) -> int:
         """Etkileşim ve örneklendirme sayısını hesapla"""
         
-        # Etkileşim belirten ifadeler
-        interaction_patterns = [
-            r'\b(örnek|örneğin|mesela|şöyle|böyle)\b',
-            r'\b(soru|soruyor|düşünelim|bakalım)\b',
-            r'\b(gördüğünüz|dikkat|fark ettiniz)\b',
-            r'\b(yapabiliriz|deneyebiliriz|uygulayalım)\b'
-        ]
-        
-        interaction_count = 0
-        for pattern in interaction_patterns:
-            matches = re.findall(pattern, transcription.lower())
-            interaction_count += len(matches)
-        
-        return interaction_count
+        # Etkileşim belirten ifadeler keyword_engine.INTERACTION_PHRASES içinde
+        return stats.count("interaction")
     
-    def _analyze_educational_structure(self, transcription: str) -> float:
-        """Eğitimsel yapı ve metodoloji analizi"""
-        
-        prompt = f"""
+    def _educational_structure_prompt(self, transcription: str) -> str:
+        return f"""
         Bu eğitim içeriğinin pedagojik yapısını analiz et:
         
         "{transcription}"
@@ -226,54 +437,31 @@ class ContentAnalyzer:
         0-100 arası eğitimsel yapı skoru:
         YAPI SKORU: [sayı]
         """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            result_text = response.text
-            
-            # Skoru parse et
-            score_match = re.search(r'YAPI SKORU:\s*(\d+)', result_text)
-            structure_score = float(score_match.group(1)) if score_match else 70.0
-            
-            return structure_score
-            
-        except Exception as e:
-            print(f"Eğitimsel yapı analizi hatası: {e}")
-            return 70.0  # Varsayılan değer
     
-    def _create_topic_heatmap(self, transcription: str, key_concepts: List[str]) -> List[Dict[str, any]]:
-        """Konu yoğunluk haritası oluştur"""
-        
-        # Metni segmentlere ayır (her segment ~30 saniye = ~50 kelime)
-        words = transcription.split()
-        segment_size = 50
-        segments = [words[i:i+segment_size] for i in range(0, len(words), segment_size)]
-        
-        heatmap = []
+    def _parse_educational_structure(self, response: Union[str, BaseException]) -> float:
+        """Eğitimsel yapı skorunu yanıttan çıkar"""
+        if isinstance(response, BaseException):
+            print(f"Eğitimsel yapı analizi hatası: {response}")
+            return 70.0  # Varsayılan değer
         
-        for i, segment in enumerate(segments):
-            segment_text = ' '.join(segment).lower()
-            
-            # Bu segmentteki anahtar kavram yoğunluğu
-            concept_scores = {}
-            for concept in key_concepts:
-                count = segment_text.count(concept)
-                density = count / len(segment) if segment else 0
-                concept_scores[concept] = density
-            
-            # Segment bilgisi
-            segment_info = {
-                'segment_id': i,
-                'start_word': i * segment_size,
-                'end_word': min((i + 1) * segment_size, len(words)),
-                'concept_scores': concept_scores,
-                'dominant_concept': max(concept_scores.items(), key=lambda x: x[1])[0] if concept_scores else None,
-                'density_score': sum(concept_scores.values())
-            }
-            
-            heatmap.append(segment_info)
+        score_match = re.search(r'YAPI SKORU:\s*(\d+)', response)
+        return float(score_match.group(1)) if score_match else 70.0
+    
+    def _create_topic_heatmap(self, transcription: str, key_concepts: List[str],
+                              segments: Optional[List[TranscriptSegment]] = None) -> TopicHeatmap:
+        """Konu yoğunluk haritası oluştur
         
-        return heatmap
+        Zaman damgalı segmentler varsa pencereler HEATMAP_SEGMENT_SECONDS,
+        yoksa HEATMAP_SEGMENT_WORDS uzunluğundadır. Kavramlar alt dize olarak
+        değil, tam kelime olarak sayılır.
+        """
+        return build_topic_heatmap(
+            transcription, key_concepts, segments,
+            segment_words=settings.HEATMAP_SEGMENT_WORDS,
+            overlap_words=settings.HEATMAP_OVERLAP_WORDS,
+            segment_seconds=settings.HEATMAP_SEGMENT_SECONDS,
+            overlap_seconds=settings.HEATMAP_OVERLAP_SECONDS
+        )
     
     def _calculate_overall_content_score(self, completeness: float, flow: float, 
                                        structure: float, interaction_count: int, 
@@ -298,8 +486,27 @@ class ContentAnalyzer:
         return overall_score
     
     def generate_recommendations(self, analysis_result: ContentAnalysisResult, 
-                               transcription: str) -> List[str]:
-        """İyileştirme önerileri oluştur"""
+                               transcription: str, subject_topic: Optional[str] = None) -> List[str]:
+        """İyileştirme önerileri oluştur (event loop dışından çağıranlar için)"""
+        return asyncio.run(self.generate_recommendations_async(analysis_result, transcription, subject_topic))
+    
+    async def generate_recommendations_async(self, analysis_result: ContentAnalysisResult, 
+                                             transcription: str,
+                                             subject_topic: Optional[str] = None) -> List[str]:
+        """İyileştirme önerileri oluştur
+        
+        Yerel motorda öneriler yapısal işaretlerden çıkar; işaretler içerik
+        sonucunda (ve önbellekte) tutulmadığından puanlayıcı analizle aynı
+        konu başlığıyla, event loop dışında yeniden çalıştırılır.
+        """
+        
+        if self.local_scorer is not None:
+            loop = asyncio.get_running_loop()
+            scores = await loop.run_in_executor(
+                get_analysis_executor(), bind_context(self._score_locally), transcription, subject_topic
+            )
+            scores.missing_topics = analysis_result.missing_topics
+            return self.local_scorer.recommendations(scores)[:7]
         
         prompt = f"""
         Bu eğitim analiz sonuçlarına göre iyileştirme önerileri oluştur:
@@ -316,8 +523,7 @@ class ContentAnalyzer:
         """
         
         try:
-            response = self.model.generate_content(prompt)
-            recommendations_text = response.text
+            recommendations_text = await self.llm.generate(prompt)
             
             # Önerileri liste olarak parse et
             recommendations = []
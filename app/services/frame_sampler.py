@@ -0,0 +1,199 @@
+import math
+import cv2
+import numpy as np
+from typing import Dict, Iterator, List, Optional, Tuple
+from dataclasses import dataclass
+
+# Bu adımdan büyük atlamalarda grab() yerine doğrudan konumlanma (seek) yapılır.
+# Seek anahtar kareye dönüp yeniden decode ettiği için küçük adımlarda grab()
+# daha ucuzdur.
+SEEK_THRESHOLD_FRAMES = 300
+
+# Hareket skoru bu boyuta küçültülmüş gri kareler üzerinden hesaplanır
+MOTION_PROBE_SIZE = (64, 36)
+
+@dataclass
+class SampledFrame:
+    frame_index: int
+    timestamp: float  # saniye
+    image: np.ndarray  # BGR
+    motion: float = 0.0  # Önceki yoklama karesine göre hareket skoru (uyarlamalı modda)
+
+
+@dataclass
+class SamplingDecision:
+    """Uyarlamalı örnekleyicinin bir kararı (maliyet/doğruluk karşılaştırması için)"""
+    frame_index: int
+    motion: float
+    reason: str  # start, motion, static, budget_skip
+
+
+def _read_frame(cap, position: int, target: int) -> Tuple[Optional[np.ndarray], int]:
+    """Hedef kareye ilerle ve decode et; (kare, yeni konum) döndürür, video bittiyse kare None"""
+    gap = target - position
+    if gap > SEEK_THRESHOLD_FRAMES:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+        position = target
+    else:
+        while position < target:
+            if not cap.grab():
+                return None, position
+            position += 1
+
+    if not cap.grab():
+        return None, position
+    position += 1
+    ret, frame = cap.retrieve()
+    return (frame if ret else None), position
+
+
+def _resolve_range(cap, start_frame: int, end_frame: Optional[int], step: int) -> Tuple[float, int, int]:
+    """(fps, ilk hedef kare, bitiş karesi); hedefler step'in katlarına hizalanır
+
+    Hizalama başlangıçtan bağımsızdır; video parçalara bölünse de aynı kareler seçilir.
+    """
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    end = end_frame if end_frame is not None else total_frames
+    if total_frames > 0:
+        end = min(end, total_frames)
+    first = -(-start_frame // step) * step
+    return fps, first, end
+
+
+class FrameSampler:
+    """Videodan yalnızca örneklenen kareleri decode eden okuyucu
+
+    Atlanan kareler için grab() kullanılır; grab() kareyi demux eder ama
+    piksel verisine çözmez. Yalnızca örneklenen karelerde retrieve() çağrılır,
+    böylece decode maliyeti toplam kare sayısıyla değil örnek sayısıyla ölçeklenir.
+    """
+
+    def __init__(self, video_path: str, sample_rate: int = 30,
+                 start_frame: int = 0, end_frame: Optional[int] = None):
+        self.video_path = video_path
+        self.sample_rate = max(1, int(sample_rate))
+        self.start_frame = max(0, int(start_frame))
+        self.end_frame = end_frame
+        self.stats: Dict[str, int] = {"probed": 0, "analyzed": 0}
+        self.decisions: List[SamplingDecision] = []
+
+    def __iter__(self) -> Iterator[SampledFrame]:
+        cap = cv2.VideoCapture(self.video_path)
+        if not cap.isOpened():
+            return
+        try:
+            fps, target, end_frame = _resolve_range(cap, self.start_frame, self.end_frame, self.sample_rate)
+            position = 0
+            if target > 0:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+                position = target
+
+            while end_frame <= 0 or target < end_frame:
+                frame, position = _read_frame(cap, position, target)
+                if frame is None:
+                    break
+                self.stats["probed"] += 1
+                self.stats["analyzed"] += 1
+                yield SampledFrame(frame_index=target, timestamp=target / fps, image=frame)
+                target += self.sample_rate
+        finally:
+            cap.release()
+
+
+class AdaptiveFrameSampler:
+    """Sahne hareketine göre örnekleyen okuyucu
+
+    Her probe_rate. kare decode edilip küçültülmüş gri görüntüsü bir önceki
+    yoklama karesiyle karşılaştırılır (ortalama mutlak fark). Hareket skoru
+    eşiği aşarsa kare analiz edilir; durağan bölümlerde en fazla
+    max_interval karede bir örnek alınır.
+
+    budget video (ya da parça) başına analiz edilecek en fazla kare sayısıdır.
+    Durağan taban örnekleri için gereken pay ayrılır, hareket örnekleri kalan
+    bütçeden karşılanır; bütçe hiçbir durumda aşılmaz.
+    """
+
+    def __init__(self, video_path: str, probe_rate: int = 5, max_interval: int = 60,
+                 motion_threshold: float = 0.02, budget: Optional[int] = None,
+                 start_frame: int = 0, end_frame: Optional[int] = None):
+        self.video_path = video_path
+        self.probe_rate = max(1, int(probe_rate))
+        self.max_interval = max(self.probe_rate, int(max_interval))
+        self.motion_threshold = motion_threshold
+        self.budget = budget if budget and budget > 0 else None
+        self.start_frame = max(0, int(start_frame))
+        self.end_frame = end_frame
+        self.stats: Dict[str, int] = {
+            "probed": 0, "analyzed": 0, "start": 0, "motion": 0, "static": 0, "budget_skip": 0
+        }
+        self.decisions: List[SamplingDecision] = []
+
+    def __iter__(self) -> Iterator[SampledFrame]:
+        cap = cv2.VideoCapture(self.video_path)
+        if not cap.isOpened():
+            return
+        try:
+            fps, target, end_frame = _resolve_range(cap, self.start_frame, self.end_frame, self.probe_rate)
+            position = 0
+            if target > 0:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+                position = target
+
+            # Bütçe taban örneklerine yetmiyorsa durağan aralık uzatılır
+            static_interval = self.max_interval
+            remaining_budget = math.inf
+            if self.budget is not None:
+                remaining_budget = self.budget
+                if end_frame > target:
+                    static_interval = max(static_interval, math.ceil((end_frame - target) / self.budget))
+
+            previous_probe = None
+            last_sampled = None
+            while (end_frame <= 0 or target < end_frame) and remaining_budget >= 1:
+                frame, position = _read_frame(cap, position, target)
+                if frame is None:
+                    break
+                self.stats["probed"] += 1
+
+                probe = cv2.resize(
+                    cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), MOTION_PROBE_SIZE, interpolation=cv2.INTER_AREA
+                ).astype(np.float32)
+                motion = float(np.mean(np.abs(probe - previous_probe))) / 255 if previous_probe is not None else 0.0
+                previous_probe = probe
+
+                reason = None
+                if last_sampled is None:
+                    reason = "start"
+                elif target - last_sampled >= static_interval:
+                    reason = "static"
+                elif motion >= self.motion_threshold:
+                    # Kalan videonun durağan taban örnekleri için ayrılan pay
+                    reserve = (end_frame - target) / static_interval if end_frame > 0 else 0
+                    if remaining_budget - 1 >= reserve:
+                        reason = "motion"
+                    else:
+                        self.stats["budget_skip"] += 1
+                        self.decisions.append(SamplingDecision(target, round(motion, 4), "budget_skip"))
+
+                if reason is not None:
+                    remaining_budget -= 1
+                    last_sampled = target
+                    self.stats[reason] += 1
+                    self.stats["analyzed"] += 1
+                    self.decisions.append(SamplingDecision(target, round(motion, 4), reason))
+                    yield SampledFrame(frame_index=target, timestamp=target / fps, image=frame, motion=motion)
+                target += self.probe_rate
+        finally:
+            cap.release()
+
+
+def get_video_properties(video_path: str) -> Tuple[float, int]:
+    """Video FPS ve toplam kare sayısını döndür"""
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened():
+            return 0.0, 0
+        return cap.get(cv2.CAP_PROP_FPS), int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    finally:
+        cap.release()
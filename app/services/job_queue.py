@@ -0,0 +1,134 @@
+from typing import Optional, List
+import asyncio
+import os
+import time
+import uuid
+from datetime import datetime
+
+from .analysis_orchestrator import AnalysisOrchestrator, serialize_analysis_result
+from .job_store import (
+    JobStore, AnalysisJob, JOB_QUEUED, JOB_RUNNING, JOB_COMPLETED, JOB_FAILED
+)
+from .progress import ProgressEvent, progress_bus, publish_job_status
+from .metrics import JOBS_TOTAL, record_span, tracing
+from ..core.config import settings
+
+
+class QueueFullError(Exception):
+    """İş kuyruğu dolu"""
+
+
+class AnalysisJobQueue:
+    """Yüklenen videoları kuyruğa alıp işçi havuzunda analiz eden kuyruk"""
+
+    def __init__(self, orchestrator: AnalysisOrchestrator, store: JobStore,
+                 workers: int = None, max_size: int = None):
+        self.orchestrator = orchestrator
+        self.store = store
+        self.workers = workers or settings.JOB_WORKERS
+        self.max_size = max_size if max_size is not None else settings.JOB_QUEUE_MAX_SIZE
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """İşçi görevlerini başlat"""
+        if self._worker_tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._worker_tasks = [
+            asyncio.create_task(self._worker(), name=f"analysis-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """İşçi görevlerini durdur"""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        await self.store.close()
+
+    @property
+    def depth(self) -> int:
+        """Kuyrukta bekleyen iş sayısı"""
+        return self._queue.qsize() if self._queue else 0
+
+    async def submit(self, video_path: str, filename: Optional[str] = None,
+                     subject_topic: Optional[str] = None, video_hash: Optional[str] = None) -> str:
+        """Videoyu kuyruğa ekle ve benzersiz iş kimliğini döndür"""
+        if self._queue is None:
+            await self.start()
+        if self._queue.full():
+            raise QueueFullError("Analiz kuyruğu dolu")
+
+        job_id = f"analysis_{uuid.uuid4().hex}"
+        now = datetime.now()
+        await self.store.create(AnalysisJob(
+            job_id=job_id,
+            status=JOB_QUEUED,
+            created_at=now,
+            updated_at=now,
+            filename=filename,
+            subject_topic=subject_topic
+        ))
+        try:
+            self._queue.put_nowait((job_id, video_path, subject_topic, video_hash, time.perf_counter()))
+        except asyncio.QueueFull:
+            # Kayıt oluşturulurken kuyruk dolmuş olabilir; iş QUEUED'da kalmasın
+            await self.store.update(job_id, status=JOB_FAILED, error="Analiz kuyruğu dolu")
+            publish_job_status(job_id, JOB_FAILED, "Analiz kuyruğu dolu")
+            raise QueueFullError("Analiz kuyruğu dolu") from None
+        publish_job_status(job_id, JOB_QUEUED)
+        return job_id
+
+    async def _worker(self) -> None:
+        while True:
+            job_id, video_path, subject_topic, video_hash, queued_at = await self._queue.get()
+            try:
+                with tracing(job_id, origin=queued_at):
+                    record_span("job.queue_wait", queued_at, time.perf_counter() - queued_at)
+                    await self._run_job(job_id, video_path, subject_topic, video_hash)
+            except Exception as e:
+                # Depo hatası (ör. MongoDB zaman aşımı) işçiyi sonlandırmamalı
+                print(f"Analiz işçisi hatası ({job_id}): {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job_id: str, video_path: str, subject_topic: Optional[str],
+                       video_hash: Optional[str]) -> None:
+        async def on_progress(stage: str, status: str):
+            await self.store.set_stage(job_id, stage, status)
+
+        def on_event(event: ProgressEvent):
+            progress_bus.publish(job_id, event)
+
+        try:
+            await self.store.update(job_id, status=JOB_RUNNING)
+            publish_job_status(job_id, JOB_RUNNING)
+            result = await self.orchestrator.analyze_video(
+                video_path, subject_topic, progress_callback=on_progress, video_hash=video_hash,
+                on_event=on_event
+            )
+            await self.store.update(
+                job_id,
+                status=JOB_COMPLETED,
+                progress=100.0,
+                result=serialize_analysis_result(result)
+            )
+            publish_job_status(job_id, JOB_COMPLETED)
+            JOBS_TOTAL.inc(status=JOB_COMPLETED)
+        except asyncio.CancelledError:
+            await self.store.update(job_id, status=JOB_FAILED, error="İş iptal edildi")
+            publish_job_status(job_id, JOB_FAILED, "İş iptal edildi")
+            JOBS_TOTAL.inc(status="cancelled")
+            raise
+        except Exception as e:
+            print(f"Analiz işi hatası ({job_id}): {e}")
+            await self.store.update(job_id, status=JOB_FAILED, error=str(e))
+            publish_job_status(job_id, JOB_FAILED, str(e))
+            JOBS_TOTAL.inc(status=JOB_FAILED)
+        finally:
+            # Geçici dosyayı temizle
+            if os.path.exists(video_path):
+                os.unlink(video_path)
+
@@ -0,0 +1,166 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Optional
+from dataclasses import dataclass, field, asdict
+from collections import OrderedDict
+from datetime import datetime
+
+from ..core.config import settings
+
+try:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from pymongo import ReturnDocument
+    MOTOR_AVAILABLE = True
+except ImportError:
+    MOTOR_AVAILABLE = False
+
+# İş durumları
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+# İlerleme takibi yapılan analiz aşamaları
+ANALYSIS_STAGES = ["vision", "audio", "content", "recommendations", "timeline"]
+
+@dataclass
+class AnalysisJob:
+    job_id: str
+    status: str
+    created_at: datetime
+    updated_at: datetime
+    filename: Optional[str] = None
+    subject_topic: Optional[str] = None
+    # Aşama -> "pending" / "running" / "completed"
+    stages: Dict[str, str] = field(default_factory=lambda: {stage: "pending" for stage in ANALYSIS_STAGES})
+    progress: float = 0.0  # 0-100
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AnalysisJob":
+        data = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
+        return cls(**data)
+
+
+def stage_progress(stages: Dict[str, str]) -> float:
+    """Tamamlanan aşamaların yüzdesi"""
+    completed = sum(1 for value in stages.values() if value == "completed")
+    return round(completed / max(len(stages), 1) * 100, 1)
+
+
+class JobStore(ABC):
+    """Analiz işlerinin durumunu ve sonuçlarını saklayan arayüz"""
+
+    @abstractmethod
+    async def create(self, job: AnalysisJob) -> None:
+        ...
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[AnalysisJob]:
+        ...
+
+    @abstractmethod
+    async def update(self, job_id: str, **fields) -> None:
+        ...
+
+    async def set_stage(self, job_id: str, stage: str, status: str) -> None:
+        """Tek bir aşamanın durumunu güncelle ve ilerleme yüzdesini hesapla"""
+        job = await self.get(job_id)
+        if job is None:
+            return
+        stages = dict(job.stages)
+        stages[stage] = status
+        await self.update(job_id, stages=stages, progress=stage_progress(stages))
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryJobStore(JobStore):
+    """Süreç içi iş deposu (testler ve tek süreçli kurulumlar için)"""
+
+    def __init__(self, max_jobs: int = 1000):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, AnalysisJob]" = OrderedDict()
+
+    async def create(self, job: AnalysisJob) -> None:
+        self._jobs[job.job_id] = job
+        self._evict()
+
+    async def get(self, job_id: str) -> Optional[AnalysisJob]:
+        return self._jobs.get(job_id)
+
+    async def update(self, job_id: str, **fields) -> None:
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        for key, value in fields.items():
+            setattr(job, key, value)
+        job.updated_at = datetime.now()
+
+    def _evict(self) -> None:
+        """Limit aşılırsa en eski bitmiş işleri sil"""
+        if len(self._jobs) <= self.max_jobs:
+            return
+        finished = [
+            job_id for job_id, job in self._jobs.items()
+            if job.status in (JOB_COMPLETED, JOB_FAILED)
+        ]
+        for job_id in finished[:len(self._jobs) - self.max_jobs]:
+            del self._jobs[job_id]
+
+
+class MongoJobStore(JobStore):
+    """MongoDB tabanlı iş deposu (MONGODB_URL / DATABASE_NAME)"""
+
+    def __init__(self, mongodb_url: str, database_name: str, collection_name: str = "analysis_jobs"):
+        self.client = AsyncIOMotorClient(mongodb_url)
+        self.collection = self.client[database_name][collection_name]
+
+    async def create(self, job: AnalysisJob) -> None:
+        document = job.to_dict()
+        document["_id"] = job.job_id
+        await self.collection.insert_one(document)
+
+    async def get(self, job_id: str) -> Optional[AnalysisJob]:
+        document = await self.collection.find_one({"_id": job_id})
+        if document is None:
+            return None
+        return AnalysisJob.from_dict(document)
+
+    async def update(self, job_id: str, **fields) -> None:
+        fields["updated_at"] = datetime.now()
+        await self.collection.update_one({"_id": job_id}, {"$set": fields})
+
+    async def set_stage(self, job_id: str, stage: str, status: str) -> None:
+        """Aşamayı atomik olarak güncelle
+        
+        Görüntü ve ses aşamaları aynı anda bittiğinde oku-değiştir-yaz
+        birinin güncellemesini ezebilir; bunun yerine yalnızca bu aşamanın
+        alanı yazılır ve ilerleme dönen belgeden hesaplanır. İlerleme $max
+        ile yazılır; geç gelen eski bir hesap yüzdeyi geri almaz.
+        """
+        document = await self.collection.find_one_and_update(
+            {"_id": job_id},
+            {"$set": {f"stages.{stage}": status, "updated_at": datetime.now()}},
+            return_document=ReturnDocument.AFTER
+        )
+        if document is None:
+            return
+        progress = stage_progress(document.get("stages", {}))
+        await self.collection.update_one({"_id": job_id}, {"$max": {"progress": progress}})
+
+    async def close(self) -> None:
+        self.client.close()
+
+
+def create_job_store() -> JobStore:
+    """Ayarlara göre iş deposunu oluştur"""
+    if settings.JOB_STORE_BACKEND == "mongodb":
+        if MOTOR_AVAILABLE:
+            return MongoJobStore(settings.MONGODB_URL, settings.DATABASE_NAME)
+        print("Uyarı: motor bulunamadı. Bellek içi iş deposu kullanılacak.")
+    return InMemoryJobStore(max_jobs=settings.JOB_STORE_MAX_JOBS)
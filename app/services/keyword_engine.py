@@ -0,0 +1,147 @@
+"""
+Tek geçişli anahtar kelime motoru
+
+Transkript bir kez kelimelere ayrılır; ardından kelime dizisi üzerinde
+çalışan bir Aho-Corasick otomatı tüm kalıpları (dolgu kelimeleri, etkileşim
+ifadeleri, çok kelimeli ifadeler dahil) tek taramada bulur. Aynı geçişte
+kelime sayısı ve kelime sıklıkları da çıkarılır; her aşama metni bir kez
+analiz edip sonucu kendi yardımcılarına geçirir.
+
+Büyük/küçük harf dönüşümü Türkçe kurallarıyla yapılır (I -> ı, İ -> i).
+"""
+
+import re
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+# Türkçe dolgu kelimeleri
+FILLER_WORDS = [
+    'eee', 'ee', 'ııı', 'şey', 'işte', 'yani', 'hani', 'böyle',
+    'falan', 'filan', 'tabi', 'tabii', 'şöyle', 'böylece',
+    'um', 'uh', 'hmm', 'ah', 'oh'
+]
+
+# Etkileşim ve örneklendirme ifadeleri
+INTERACTION_PHRASES = [
+    'örnek', 'örneğin', 'mesela', 'şöyle', 'böyle',
+    'soru', 'soruyor', 'düşünelim', 'bakalım',
+    'gördüğünüz', 'dikkat', 'fark ettiniz',
+    'yapabiliriz', 'deneyebiliriz', 'uygulayalım'
+]
+
+
+def turkish_lower(text: str) -> str:
+    """Türkçe büyük/küçük harf dönüşümü (I -> ı, İ -> i)
+
+    str.lower() "İ" harfini "i" + birleşik nokta (U+0307) yapar; bu da
+    kelimeyi ikiye böler ve "I" harfini yanlışlıkla "i" yapar.
+    """
+    return text.replace("I", "ı").replace("İ", "i").lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """Türkçe küçük harfe çevrilmiş kelime listesi"""
+    return _WORD_PATTERN.findall(turkish_lower(text))
+
+
+@dataclass
+class TextStats:
+    tokens: List[str]
+    word_count: int
+    term_frequencies: Counter
+    # kategori -> kalıp -> eşleşme sayısı
+    hits: Dict[str, Counter] = field(default_factory=dict)
+
+    def count(self, category: str) -> int:
+        """Kategorideki toplam eşleşme sayısı"""
+        return sum(self.hits.get(category, Counter()).values())
+
+
+class KeywordEngine:
+    """Kelime dizisi üzerinde çalışan çok kalıplı (Aho-Corasick) eşleştirici"""
+
+    def __init__(self, categories: Dict[str, Iterable[str]]):
+        # Düğüm i: geçişler, hata bağlantısı ve o düğümde biten (kategori, kalıp) çiftleri
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, str]]] = [[]]
+
+        for category, patterns in categories.items():
+            for pattern in patterns:
+                self._add(category, pattern)
+        self._build_failure_links()
+        self.categories = list(categories)
+
+    def _add(self, category: str, pattern: str) -> None:
+        node = 0
+        for token in tokenize(pattern):
+            next_node = self._goto[node].get(token)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][token] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        if node and (category, pattern) not in self._output[node]:
+            self._output[node].append((category, pattern))
+
+    def _build_failure_links(self) -> None:
+        # Kök altındaki düğümlerin hata bağlantısı köktür; gerisi genişlik öncelikli
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child].extend(self._output[self._fail[child]])
+
+    def _matches(self, tokens: List[str]) -> Iterator[Tuple[int, str, str]]:
+        """(eşleşmenin bittiği kelime indeksi, kategori, kalıp) üçlüleri"""
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        for index, token in enumerate(tokens):
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            for category, pattern in output[node]:
+                yield index, category, pattern
+
+    def scan(self, tokens: List[str]) -> Dict[str, Counter]:
+        """Kelime dizisindeki tüm kalıp eşleşmelerini say"""
+        hits: Dict[str, Counter] = defaultdict(Counter)
+        for _, category, pattern in self._matches(tokens):
+            hits[category][pattern] += 1
+        return {category: hits.get(category, Counter()) for category in self.categories}
+
+    def positions(self, tokens: List[str], category: str) -> List[int]:
+        """Kategorideki eşleşmelerin bittiği kelime indeksleri (zaman çizelgesi için)"""
+        return [index for index, matched, _ in self._matches(tokens) if matched == category]
+
+    def analyze(self, text: str) -> TextStats:
+        """Tek geçişte kelime sayısı, kelime sıklıkları ve kalıp eşleşmeleri"""
+        tokens = tokenize(text)
+        return TextStats(
+            tokens=tokens,
+            word_count=len(tokens),
+            term_frequencies=Counter(tokens),
+            hits=self.scan(tokens)
+        )
+
+
+default_keyword_engine = KeywordEngine({
+    "filler": FILLER_WORDS,
+    "interaction": INTERACTION_PHRASES
+})
+
+
+def analyze_text(text: str) -> TextStats:
+    """Varsayılan motorla metni analiz et (her çağrı yeni bir TextStats döndürür)"""
+    return default_keyword_engine.analyze(text)
@@ -0,0 +1,179 @@
+"""
+Yer işareti (landmark) geometrisi
+
+MediaPipe çıktıları her karede bir kez NumPy dizilerine çevrilir; bakış
+yönü, yüz yönü ve el hareketi gibi özellikler örneklenen karelerin
+tamamı üzerinde toplu (vektörel) hesaplanır.
+
+Bakış tahmini iki bileşenlidir:
+- Baş pozu: göz köşeleri ve alın-çene eksenindeki derinlik (z) farkından
+  sapma (yaw) ve eğim (pitch) açıları
+- İris: irisin göz köşeleri ve göz kapakları arasındaki göreli konumu
+
+İkisinin toplamı kameraya göre bakış açısını verir; açı eşiklerin içindeyse
+göz teması var sayılır. İris noktaları (refine_landmarks) yoksa yalnızca baş
+pozu kullanılır.
+
+Kaskad modunda pose noktalarından yüz ve el bölgeleri (ROI) çıkarılır;
+kırpılmış görüntüdeki sonuçlar tam kare koordinatlarına geri taşınır.
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+# FaceMesh indeksleri (görüntüdeki sol/sağ)
+NOSE_TIP = 1
+FACE_DIRECTION_CHIN = 18  # Yüz yönü ölçüsü için burun altı/çene noktası
+FOREHEAD = 10
+CHIN = 152
+LEFT_EYE_OUTER = 33
+LEFT_EYE_INNER = 133
+LEFT_EYE_TOP = 159
+LEFT_EYE_BOTTOM = 145
+RIGHT_EYE_INNER = 362
+RIGHT_EYE_OUTER = 263
+RIGHT_EYE_TOP = 386
+RIGHT_EYE_BOTTOM = 374
+LEFT_IRIS = 468
+RIGHT_IRIS = 473
+
+# Karede yalnızca bu noktalar diziye çevrilir (satır sırası aşağıdaki sabitlerle aynı)
+FACE_KEYPOINTS = [
+    NOSE_TIP, FACE_DIRECTION_CHIN, FOREHEAD, CHIN,
+    LEFT_EYE_OUTER, LEFT_EYE_INNER, LEFT_EYE_TOP, LEFT_EYE_BOTTOM,
+    RIGHT_EYE_INNER, RIGHT_EYE_OUTER, RIGHT_EYE_TOP, RIGHT_EYE_BOTTOM,
+    LEFT_IRIS, RIGHT_IRIS
+]
+(_NOSE, _DIRECTION_CHIN, _FOREHEAD, _CHIN,
+ _L_OUTER, _L_INNER, _L_TOP, _L_BOTTOM,
+ _R_INNER, _R_OUTER, _R_TOP, _R_BOTTOM,
+ _L_IRIS, _R_IRIS) = range(len(FACE_KEYPOINTS))
+
+# İrisin göz içindeki göreli kayması (-0.5..0.5) -> derece
+IRIS_YAW_GAIN_DEGREES = 70.0
+IRIS_PITCH_GAIN_DEGREES = 50.0
+# Bu açıların içindeki bakışlar göz teması kabul edilir
+EYE_CONTACT_MAX_YAW_DEGREES = 15.0
+EYE_CONTACT_MAX_PITCH_DEGREES = 20.0
+
+
+def landmarks_to_array(landmarks, indices: Optional[Sequence[int]] = None) -> np.ndarray:
+    """Landmark listesini (N, 3) float32 diziye çevir; olmayan indeksler NaN"""
+    points = landmarks.landmark
+    if indices is None:
+        return np.array([(p.x, p.y, p.z) for p in points], dtype=np.float32)
+    count = len(points)
+    return np.array([
+        (points[i].x, points[i].y, points[i].z) if i < count else (np.nan, np.nan, np.nan)
+        for i in indices
+    ], dtype=np.float32)
+
+
+def _ratio_along(point: np.ndarray, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """Noktanın start->end doğrusu üzerine izdüşümü (0 = start, 1 = end)"""
+    axis = end - start
+    return np.sum((point - start) * axis, axis=-1) / np.maximum(np.sum(axis * axis, axis=-1), 1e-9)
+
+
+def head_pose(face_points: np.ndarray):
+    """(F, K, 3) yüz noktalarından sapma ve eğim açıları (derece)
+
+    Sapma: pozitifse yüz görüntünün sağına dönük. Eğim: pozitifse aşağı bakıyor.
+    """
+    left, right = face_points[:, _L_OUTER], face_points[:, _R_OUTER]
+    forehead, chin = face_points[:, _FOREHEAD], face_points[:, _CHIN]
+    yaw = np.degrees(np.arctan2(right[:, 2] - left[:, 2], right[:, 0] - left[:, 0]))
+    pitch = np.degrees(np.arctan2(chin[:, 2] - forehead[:, 2], chin[:, 1] - forehead[:, 1]))
+    return yaw, pitch
+
+
+def iris_offsets(face_points: np.ndarray):
+    """İrisin iki gözdeki ortalama yatay ve dikey kayması (-0.5..0.5; iris yoksa 0)"""
+    xy = face_points[..., :2]
+    horizontal = (
+        _ratio_along(xy[:, _L_IRIS], xy[:, _L_OUTER], xy[:, _L_INNER]) +
+        _ratio_along(xy[:, _R_IRIS], xy[:, _R_INNER], xy[:, _R_OUTER])
+    ) / 2 - 0.5
+    vertical = (
+        _ratio_along(xy[:, _L_IRIS], xy[:, _L_TOP], xy[:, _L_BOTTOM]) +
+        _ratio_along(xy[:, _R_IRIS], xy[:, _R_TOP], xy[:, _R_BOTTOM])
+    ) / 2 - 0.5
+    return np.nan_to_num(horizontal), np.nan_to_num(vertical)
+
+
+def estimate_gaze(face_points: np.ndarray):
+    """Kameraya göre bakış açıları (derece) ve göz teması maskesi"""
+    if len(face_points) == 0:
+        empty = np.zeros(0, dtype=np.float32)
+        return empty, empty, np.zeros(0, dtype=bool)
+    yaw, pitch = head_pose(face_points)
+    iris_x, iris_y = iris_offsets(face_points)
+    gaze_yaw = yaw + iris_x * IRIS_YAW_GAIN_DEGREES
+    gaze_pitch = pitch + iris_y * IRIS_PITCH_GAIN_DEGREES
+    eye_contact = (
+        (np.abs(gaze_yaw) <= EYE_CONTACT_MAX_YAW_DEGREES) &
+        (np.abs(gaze_pitch) <= EYE_CONTACT_MAX_PITCH_DEGREES)
+    )
+    return gaze_yaw, gaze_pitch, eye_contact
+
+
+def face_direction(face_points: np.ndarray) -> np.ndarray:
+    """Burun ucu ile çene noktası arasındaki yatay fark (yüz yönü değişimi ölçüsü)"""
+    return np.abs(face_points[:, _NOSE, 0] - face_points[:, _DIRECTION_CHIN, 0])
+
+
+def count_direction_changes(directions: np.ndarray, threshold: float = 0.3) -> int:
+    """Ardışık yüz yönleri arasında eşiği aşan değişim sayısı (önceki yön 0 ise sayılmaz)"""
+    if len(directions) < 2:
+        return 0
+    previous = directions[:-1]
+    return int(np.sum((previous != 0) & (np.abs(np.diff(directions)) > threshold)))
+
+
+def hand_movements(hand_centers: np.ndarray) -> np.ndarray:
+    """(H, 2) ardışık el merkezleri arasındaki mesafeler"""
+    if len(hand_centers) < 2:
+        return np.zeros(0, dtype=np.float32)
+    return np.hypot(*np.diff(hand_centers, axis=0).T)
+
+
+# Pose indeksleri: yüz (burun, gözler, kulaklar, ağız), omuzlar ve eller
+POSE_FACE = list(range(0, 11))
+POSE_SHOULDERS = [11, 12]
+POSE_HANDS = [15, 16, 17, 18, 19, 20, 21, 22]  # bilekler, serçe, işaret ve başparmak
+
+
+def pose_to_array(landmarks) -> np.ndarray:
+    """Pose landmark'larını (33, 4) diziye çevir: x, y, z, görünürlük"""
+    return np.array([(p.x, p.y, p.z, p.visibility) for p in landmarks.landmark], dtype=np.float32)
+
+
+def roi_box(points_xy: np.ndarray, width: int, height: int, margin: float,
+            min_side: float = 0.0) -> Optional[tuple]:
+    """Normalize noktaları kapsayan kare piksel kutusu (x0, y0, x1, y1)
+
+    Kutunun kenarı noktaların kapsadığı alanın (1 + 2 * margin) katıdır ve en
+    az min_side (kare genişliğine oranla) kadardır; kare dışına taşan kısım
+    kırpılır. Kutu boş kalırsa None.
+    """
+    low, high = points_xy.min(axis=0), points_xy.max(axis=0)
+    center_x, center_y = (low[0] + high[0]) / 2 * width, (low[1] + high[1]) / 2 * height
+    side = max((high[0] - low[0]) * width, (high[1] - low[1]) * height, min_side * width) * (1 + 2 * margin)
+    x0, y0 = int(max(0, center_x - side / 2)), int(max(0, center_y - side / 2))
+    x1, y1 = int(min(width, center_x + side / 2)), int(min(height, center_y + side / 2))
+    if x1 - x0 < 2 or y1 - y0 < 2:
+        return None
+    return x0, y0, x1, y1
+
+
+def crop_to_frame(points: np.ndarray, box: tuple, width: int, height: int) -> np.ndarray:
+    """Kırpılmış görüntüde normalize noktaları tam karenin normalize koordinatlarına taşı"""
+    x0, y0, x1, y1 = box
+    crop_width, crop_height = x1 - x0, y1 - y0
+    mapped = points.copy()
+    mapped[:, 0] = (points[:, 0] * crop_width + x0) / width
+    mapped[:, 1] = (points[:, 1] * crop_height + y0) / height
+    # MediaPipe z değeri görüntü genişliği ölçeğindedir
+    mapped[:, 2] = points[:, 2] * crop_width / width
+    return mapped
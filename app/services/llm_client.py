@@ -0,0 +1,179 @@
+"""
+İçerik analizi için asenkron LLM istemcisi
+
+Tüm istekler süreç genelinde tek bir istemciden geçer: eşzamanlı istek sayısı
+LLM_MAX_CONCURRENCY ile sınırlanır, her istek LLM_TIMEOUT_SECONDS içinde
+yanıtlanmazsa iptal edilir ve geçici hatalarda üstel bekleme ile yeniden
+denenir. Aynı analizdeki istemler birbirini beklemeden gönderilebilir.
+
+Başarılı yanıtlar model adı ve normalleştirilmiş istemle anahtarlanan kalıcı
+bir önbellekte (TTL + LRU) tutulur; aynı transkript ya da aynı skorlarla
+istenen öneriler yeniden ücretlendirilmez.
+
+LLM_BACKEND="http" ile istekler basit bir JSON uç noktasına gider; testlerde
+benchmarks/fake_llm_server.py ile başlatılan sahte sunucu kullanılabilir.
+"""
+
+import asyncio
+import os
+import random
+import re
+import threading
+from typing import Any, Dict, List, Optional, Union
+
+from .result_cache import ResultCache, make_cache_key
+from .metrics import LLM_REQUESTS, span
+from ..core.config import settings
+from ..core.concurrency import get_analysis_executor, get_loop_semaphore
+
+# Yeniden denemenin anlamsız olduğu hatalar (geçersiz istek, yetki, engellenen yanıt)
+_NON_RETRYABLE_ERRORS = {"InvalidArgument", "PermissionDenied", "Unauthenticated", "ValueError"}
+
+
+class LLMError(Exception):
+    """LLM isteği tüm denemelere rağmen başarısız oldu"""
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Önbellek anahtarı için istemdeki girinti ve boşluk farklarını yok et"""
+    return re.sub(r"\s+", " ", prompt).strip()
+
+
+class GeminiModel:
+    def __init__(self, api_key: str, model_name: str):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self.name = model_name
+        self._model = genai.GenerativeModel(model_name)
+
+    async def generate(self, prompt: str) -> str:
+        response = await self._model.generate_content_async(prompt)
+        return response.text
+
+
+class HTTPModel:
+    """{"model", "prompt"} alıp {"text"} döndüren JSON uç noktası"""
+
+    def __init__(self, url: str, model_name: str, timeout: float):
+        self.url = url
+        self.name = model_name
+        self.timeout = timeout
+
+    def _post(self, prompt: str) -> str:
+        import requests
+
+        response = requests.post(
+            self.url, json={"model": self.name, "prompt": prompt}, timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()["text"]
+
+    async def generate(self, prompt: str) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._post, prompt)
+
+
+class LLMClient:
+    def __init__(self, model, max_concurrency: int = None, timeout: float = None,
+                 max_retries: int = None, backoff: float = None,
+                 cache: Optional[ResultCache] = None):
+        self.model = model
+        self.cache = cache
+        self.max_concurrency = max_concurrency or settings.LLM_MAX_CONCURRENCY
+        self.timeout = timeout or settings.LLM_TIMEOUT_SECONDS
+        self.max_retries = max_retries if max_retries is not None else settings.LLM_MAX_RETRIES
+        self.backoff = backoff if backoff is not None else settings.LLM_RETRY_BACKOFF_SECONDS
+
+    @property
+    def model_name(self) -> str:
+        return self.model.name
+
+    async def generate(self, prompt: str) -> str:
+        """Yanıtı önbellekten döndür ya da istemi modele gönder"""
+        if self.cache is None:
+            return await self._generate_uncached(prompt)
+
+        loop = asyncio.get_running_loop()
+        key = make_cache_key("llm", self.model_name, normalize_prompt(prompt))
+        cached = await loop.run_in_executor(get_analysis_executor(), self.cache.get, key)
+        if cached is not None:
+            return cached
+
+        text = await self._generate_uncached(prompt)
+        await loop.run_in_executor(get_analysis_executor(), self.cache.set, key, text)
+        return text
+
+    async def _generate_uncached(self, prompt: str) -> str:
+        """İstemi gönder; zaman aşımı ve geçici hatalarda yeniden dene"""
+        semaphore = get_loop_semaphore("llm", self.max_concurrency)
+        last_error: Optional[BaseException] = None
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                # Bekleme semafor dışında yapılır; diğer istekleri bloklamaz
+                delay = self.backoff * (2 ** (attempt - 1))
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+
+            async with semaphore:
+                try:
+                    with span("content.llm_call", model=self.model_name, attempt=attempt + 1):
+                        text = await asyncio.wait_for(self.model.generate(prompt), timeout=self.timeout)
+                    LLM_REQUESTS.inc(outcome="ok")
+                    return text
+                except asyncio.TimeoutError as e:
+                    LLM_REQUESTS.inc(outcome="timeout")
+                    last_error = e
+                    print(f"LLM zaman aşımı ({self.timeout}s), deneme {attempt + 1}/{self.max_retries + 1}")
+                except Exception as e:
+                    LLM_REQUESTS.inc(outcome="error")
+                    if type(e).__name__ in _NON_RETRYABLE_ERRORS:
+                        raise LLMError(str(e)) from e
+                    last_error = e
+                    print(f"LLM hatası: {e}, deneme {attempt + 1}/{self.max_retries + 1}")
+
+        raise LLMError(f"LLM isteği başarısız: {last_error}") from last_error
+
+    async def generate_many(self, prompts: List[str]) -> List[Union[str, BaseException]]:
+        """İstemleri eşzamanlı gönder; başarısız olanların yerine hata nesnesi döner"""
+        return await asyncio.gather(*(self.generate(p) for p in prompts), return_exceptions=True)
+
+    def cache_stats(self) -> Union[Dict[str, Any], str]:
+        return self.cache.stats() if self.cache is not None else "disabled"
+
+
+def is_llm_configured() -> bool:
+    """Seçili LLM motoru kullanılabilir mi (Gemini için API anahtarı gerekir)"""
+    return settings.LLM_BACKEND != "gemini" or bool(settings.GEMINI_API_KEY)
+
+
+def create_llm_model(api_key: Optional[str] = None):
+    backend = settings.LLM_BACKEND
+    if backend == "gemini":
+        return GeminiModel(api_key or settings.GEMINI_API_KEY, settings.LLM_MODEL_NAME)
+    if backend == "http":
+        return HTTPModel(settings.LLM_ENDPOINT_URL, settings.LLM_MODEL_NAME, settings.LLM_TIMEOUT_SECONDS)
+    raise ValueError(f"Bilinmeyen LLM motoru: {backend}")
+
+
+def create_llm_cache() -> Optional[ResultCache]:
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    return ResultCache(
+        os.path.join(settings.CACHE_DIR, "llm.sqlite3"),
+        max_bytes=settings.LLM_CACHE_MAX_MB * 1024 * 1024,
+        max_age_seconds=settings.LLM_CACHE_MAX_AGE_DAYS * 24 * 3600
+    )
+
+
+_llm_client: Optional[LLMClient] = None
+_llm_client_lock = threading.Lock()
+
+
+def get_llm_client(api_key: Optional[str] = None) -> LLMClient:
+    """Süreç genelinde paylaşılan LLM istemcisini döndür"""
+    global _llm_client
+    with _llm_client_lock:
+        if _llm_client is None:
+            _llm_client = LLMClient(create_llm_model(api_key), cache=create_llm_cache())
+        return _llm_client
@@ -0,0 +1,204 @@
+"""
+Ağ bağlantısı gerektirmeyen içerik puanlayıcı
+
+Bütünlük, konu akışı ve eğitimsel yapı skorlarını transkriptten, yalnızca
+NumPy ile ve milisaniyeler içinde hesaplar:
+
+- Akış: ardışık metin pencerelerinin TF-IDF kosinüs benzerliği (konu
+  sürekliliği) ve geçiş ifadelerinin sıklığı
+- Yapı: giriş/hedef ve özet/kapanış ifadeleri, sorular, örnekler ve
+  pekiştirme ifadeleri
+- Bütünlük: ders konusundaki terimlerin kapsanması, anahtar kavramların
+  birden fazla bölümde işlenmesi ve anlatım uzunluğu
+
+Skorlar sezgiseldir; LLM skorlarıyla aynı ölçekte (0-100) olacak şekilde
+ayarlanmıştır.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from .keyword_engine import tokenize, turkish_lower
+
+# Sonuçları etkileyen değişikliklerde artırılır (önbellek anahtarına girer)
+LOCAL_SCORER_VERSION = "1"
+
+WINDOW_WORDS = 60  # Akış hesabında pencere boyutu (kelime)
+INTRO_FRACTION = 0.15  # Giriş ifadelerinin aranacağı baştaki bölüm
+OUTRO_FRACTION = 0.15  # Özet ifadelerinin aranacağı sondaki bölüm
+
+INTRO_MARKERS = [
+    "bugün", "bu derste", "bu videoda", "bu bölümde", "konumuz", "öğreneceğiz",
+    "göreceğiz", "hedefimiz", "amacımız", "hoş geldiniz", "merhaba"
+]
+SUMMARY_MARKERS = [
+    "özetle", "özetlersek", "özet olarak", "sonuç olarak", "toparlarsak", "toparlayalım",
+    "kısaca", "öğrendik", "gördük", "bir sonraki derste", "gelecek derste"
+]
+TRANSITION_MARKERS = [
+    "öncelikle", "ilk olarak", "ikinci olarak", "ardından", "daha sonra", "şimdi",
+    "bunun yanında", "ayrıca", "bu nedenle", "bu yüzden", "dolayısıyla", "peki",
+    "buna göre", "diğer taraftan", "öte yandan", "son olarak"
+]
+QUESTION_MARKERS = ["neden", "nasıl", "sizce", "ne olur", "ne demek", "düşünelim"]
+EXAMPLE_MARKERS = ["örneğin", "mesela", "örnek", "diyelim ki", "düşünün"]
+REINFORCEMENT_MARKERS = [
+    "tekrar", "hatırlayalım", "hatırlarsanız", "başka bir deyişle", "yani", "önemli", "dikkat"
+]
+
+
+def _stem(word: str) -> str:
+    """Ekleri kabaca atmak için kelime kökü yaklaşımı (ilk 5 harf)"""
+    return word[:5]
+
+
+@dataclass
+class LocalContentScores:
+    completeness_score: float
+    missing_topics: List[str]
+    topic_flow_score: float
+    educational_structure_score: float
+    markers: Dict[str, float] = field(default_factory=dict)
+
+
+class LocalContentScorer:
+    def __init__(self, stopwords: Optional[Iterable[str]] = None):
+        self.stopwords: Set[str] = set(stopwords or ())
+
+    def score(self, transcription: str, subject_topic: Optional[str] = None) -> LocalContentScores:
+        text = turkish_lower(transcription)
+        words = tokenize(transcription)
+        content_words = [w for w in words if len(w) > 3 and w.isalpha() and w not in self.stopwords]
+        windows = [content_words[i:i + WINDOW_WORDS] for i in range(0, len(content_words), WINDOW_WORDS)]
+        windows = [w for w in windows if w]
+
+        markers = self._detect_markers(text, words)
+        flow = self._flow_score(windows, markers)
+        structure = self._structure_score(markers)
+        completeness, missing_topics = self._completeness_score(
+            content_words, windows, len(words), subject_topic
+        )
+        markers["adjacent_similarity"] = round(self._adjacent_similarity(windows), 3)
+
+        return LocalContentScores(
+            completeness_score=round(completeness, 1),
+            missing_topics=missing_topics,
+            topic_flow_score=round(flow, 1),
+            educational_structure_score=round(structure, 1),
+            markers=markers
+        )
+
+    def _detect_markers(self, text: str, words: List[str]) -> Dict[str, float]:
+        """İfade sayıları ve 1000 kelimedeki yoğunlukları"""
+        word_count = max(len(words), 1)
+        intro_end = max(1, int(len(text) * INTRO_FRACTION))
+        outro_start = int(len(text) * (1 - OUTRO_FRACTION))
+
+        def count(markers: List[str], segment: str) -> int:
+            return sum(len(re.findall(rf"\b{re.escape(m)}", segment)) for m in markers)
+
+        per_thousand = 1000 / word_count
+        return {
+            "intro": count(INTRO_MARKERS, text[:intro_end]),
+            "summary": count(SUMMARY_MARKERS, text[outro_start:]),
+            "transitions_per_1000": count(TRANSITION_MARKERS, text) * per_thousand,
+            "questions_per_1000": (text.count("?") + count(QUESTION_MARKERS, text)) * per_thousand,
+            "examples_per_1000": count(EXAMPLE_MARKERS, text) * per_thousand,
+            "reinforcement_per_1000": count(REINFORCEMENT_MARKERS, text) * per_thousand,
+        }
+
+    def _tfidf(self, windows: List[List[str]]) -> np.ndarray:
+        """Pencereler x terimler L2-normalize TF-IDF matrisi"""
+        vocabulary = {term: i for i, term in enumerate(sorted({_stem(w) for win in windows for w in win}))}
+        matrix = np.zeros((len(windows), len(vocabulary)), dtype=np.float32)
+        for row, window in enumerate(windows):
+            for term, n in Counter(_stem(w) for w in window).items():
+                matrix[row, vocabulary[term]] = n
+
+        document_frequency = np.count_nonzero(matrix, axis=0)
+        idf = np.log((1 + len(windows)) / (1 + document_frequency)) + 1
+        matrix *= idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-9)
+
+    def _adjacent_similarity(self, windows: List[List[str]]) -> float:
+        """Ardışık pencerelerin ortalama kosinüs benzerliği"""
+        if len(windows) < 2:
+            return 0.0
+        matrix = self._tfidf(windows)
+        return float(np.mean(np.sum(matrix[:-1] * matrix[1:], axis=1)))
+
+    def _flow_score(self, windows: List[List[str]], markers: Dict[str, float]) -> float:
+        if len(windows) < 2:
+            # Tek pencerelik kısa anlatımda süreklilik ölçülemez; nötr kabul et
+            coherence = 0.6
+        else:
+            # Aynı konuyu işleyen ardışık bölümlerde benzerlik tipik olarak 0.1-0.3 aralığında
+            coherence = min(1.0, self._adjacent_similarity(windows) / 0.25)
+        transitions = min(1.0, markers["transitions_per_1000"] / 10)
+        return 40 + 55 * (0.65 * coherence + 0.35 * transitions)
+
+    def _structure_score(self, markers: Dict[str, float]) -> float:
+        structure = (
+            0.25 * min(1.0, markers["intro"]) +
+            0.25 * min(1.0, markers["summary"]) +
+            0.2 * min(1.0, markers["questions_per_1000"] / 5) +
+            0.15 * min(1.0, markers["examples_per_1000"] / 5) +
+            0.15 * min(1.0, markers["reinforcement_per_1000"] / 8)
+        )
+        return 20 + 80 * structure
+
+    def _completeness_score(self, content_words: List[str], windows: List[List[str]],
+                            word_count: int, subject_topic: Optional[str]):
+        stems = {_stem(w) for w in content_words}
+
+        # Anahtar kavramların birden fazla bölümde işlenmesi (yalnızca geçip gitmemesi)
+        frequencies = Counter(_stem(w) for w in content_words)
+        key_terms = [term for term, n in frequencies.most_common(10) if n > 1]
+        if key_terms and len(windows) > 1:
+            window_stems = [{_stem(w) for w in win} for win in windows]
+            development = float(np.mean([
+                sum(term in ws for ws in window_stems) >= 2 for term in key_terms
+            ]))
+        else:
+            development = 0.5
+
+        # Ders konusundaki terimlerin kapsanması
+        missing_topics: List[str] = []
+        if subject_topic:
+            topic_terms = [
+                w for w in tokenize(subject_topic)
+                if len(w) > 2 and w not in self.stopwords
+            ]
+            missing_topics = [t for t in topic_terms if _stem(t) not in stems]
+            coverage = 1 - len(missing_topics) / len(topic_terms) if topic_terms else development
+        else:
+            coverage = development
+
+        # ~4 dakikalık anlatım (150 kelime/dk) yeterli uzunluk kabul edilir
+        length_factor = min(1.0, word_count / 600)
+
+        completeness = 100 * (0.4 * coverage + 0.35 * development + 0.25 * length_factor)
+        return completeness, missing_topics
+
+    def recommendations(self, scores: LocalContentScores) -> List[str]:
+        """Tespit edilen yapısal eksiklere göre öneriler"""
+        markers = scores.markers
+        recommendations = []
+        if not markers.get("intro"):
+            recommendations.append("Derse konuyu ve öğrenme hedeflerini belirterek başlayın")
+        if not markers.get("summary"):
+            recommendations.append("Dersi ana noktaları özetleyerek kapatın")
+        if markers.get("questions_per_1000", 0) < 2:
+            recommendations.append("Öğrencilere düşündürücü sorular yöneltin")
+        if markers.get("transitions_per_1000", 0) < 4:
+            recommendations.append("Bölümler arasında 'öncelikle', 'ardından', 'son olarak' gibi geçiş ifadeleri kullanın")
+        if markers.get("examples_per_1000", 0) < 2:
+            recommendations.append("Kavramları somut örneklerle destekleyin")
+        if scores.missing_topics:
+            recommendations.append(f"Şu konulara da değinin: {', '.join(scores.missing_topics)}")
+        return recommendations
@@ -0,0 +1,374 @@
+"""
+Metrikler ve zaman izleri
+
+Analiz aşamaları ve alt adımları (decode, her MediaPipe modeli, Whisper,
+librosa, parselmouth, LLM çağrıları, PDF oluşturma) span(...) ile ölçülür.
+Her span süreç genelindeki eduview_span_seconds histogramına yazılır;
+/metrics uç noktası kayıt defterini Prometheus metin biçiminde sunar
+(prometheus_client gerekmez).
+
+TRACE_DIR doluysa iş başına bir iz (trace) tutulur ve iş bitince Chrome
+trace biçiminde (chrome://tracing, Perfetto) yazılır. Etkin iz contextvar
+ile taşınır; havuzda çalışan fonksiyonlar bind_context ile gönderilmelidir.
+Kare başına adımlar (aggregate=True) izde tek tek değil toplam olarak
+tutulur. Paralel görüntü analizinin alt süreçlerindeki span'ler bu
+sürecin metriklerine girmez.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from ..core.config import settings
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Saniye cinsinden kova sınırları: kare başına model çağrısından uzun derslerin aşamalarına kadar
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0
+)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{_escape(extra[1])}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        ...
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}", *self._samples()]
+
+
+class Counter(_Metric):
+    """Yalnızca artan sayaç"""
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """Anlık değer; callback verilirse değer her okumada ondan alınır (etiketsiz)"""
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 callback: Optional[Callable[[], float]] = None):
+        super().__init__(name, documentation, labels)
+        self.callback = callback
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def _samples(self) -> List[str]:
+        if self.callback is not None:
+            try:
+                return [f"{self.name} {_format_value(self.callback())}"]
+            except Exception as e:
+                print(f"Metrik okunamadı ({self.name}): {e}")
+                return []
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram(_Metric):
+    """Kovalara ayrılmış gözlemler (Prometheus histogramı)"""
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Etiket değerleri -> [kova sayıları, toplam, adet]
+        self._series: Dict[Tuple[str, ...], List[Any]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return series[2] if series is not None else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            snapshot = sorted((key, list(counts), total, count) for key, (counts, total, count) in self._series.items())
+        lines = []
+        for key, counts, total, count in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.label_names, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key, ("le", "+Inf"))
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Süreç genelindeki metrikler; aynı adla yeniden kayıt mevcut metriği döndürür"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Sequence[str] = (),
+              callback: Optional[Callable[[], float]] = None) -> Gauge:
+        gauge = self._register(Gauge(name, documentation, labels, callback))
+        if callback is not None:
+            gauge.callback = callback
+        return gauge
+
+    def histogram(self, name: str, documentation: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def render(self) -> str:
+        """Prometheus metin biçimi (0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Süreç genelinde tek kayıt defteri
+metrics_registry = MetricsRegistry()
+
+SPAN_SECONDS = metrics_registry.histogram(
+    "eduview_span_seconds", "Analiz aşaması ve alt adım süreleri (saniye)", ["span"]
+)
+CACHE_REQUESTS = metrics_registry.counter(
+    "eduview_cache_requests_total", "Önbellek sorguları (results: aşama sonuçları, llm: LLM yanıtları)",
+    ["cache", "result"]
+)
+MODEL_LOAD_SECONDS = metrics_registry.gauge(
+    "eduview_model_load_seconds", "Modelin yüklenme süresi (saniye)", ["model"]
+)
+MODEL_MEMORY_MB = metrics_registry.gauge(
+    "eduview_model_memory_megabytes", "Model yüklenirken artan bellek (MB)", ["model"]
+)
+JOBS_TOTAL = metrics_registry.counter(
+    "eduview_jobs_total", "Biten analiz işleri", ["status"]
+)
+LLM_REQUESTS = metrics_registry.counter(
+    "eduview_llm_requests_total", "LLM istek denemeleri", ["outcome"]
+)
+
+
+class Trace:
+    """Bir işin span kayıtları (iş parçacığı güvenli)
+
+    Ayrı tutulan span sayısı TRACE_MAX_SPANS ile sınırlıdır; sınır
+    aşılınca ve aggregate span'lerde yalnızca ad başına adet/süre toplanır.
+    """
+
+    def __init__(self, trace_id: str, max_spans: int = None, origin: Optional[float] = None):
+        self.trace_id = re.sub(r"[^\w.-]", "_", trace_id)
+        self.max_spans = max_spans or settings.TRACE_MAX_SPANS
+        # Zaman ekseninin başlangıcı (perf_counter); ör. işin kuyruğa girdiği an
+        self._origin = origin if origin is not None else time.perf_counter()
+        self.started_at = datetime.fromtimestamp(time.time() - (time.perf_counter() - self._origin))
+        self.spans: List[Dict[str, Any]] = []
+        self.totals: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, start: float, duration: float, aggregate: bool = False,
+            attributes: Optional[Dict[str, Any]] = None) -> None:
+        with self._lock:
+            if aggregate or len(self.spans) >= self.max_spans:
+                total = self.totals.setdefault(name, {"count": 0, "seconds": 0.0})
+                total["count"] += 1
+                total["seconds"] += duration
+                return
+            thread = threading.current_thread()
+            self.spans.append({
+                "name": name,
+                "start": start - self._origin,
+                "duration": duration,
+                "thread_id": thread.ident,
+                "thread": thread.name,
+                "attributes": attributes or {}
+            })
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Chrome trace olay biçimi (tam olaylar + iş parçacığı adları)"""
+        with self._lock:
+            spans = list(self.spans)
+            totals = {name: dict(total) for name, total in self.totals.items()}
+        pid = os.getpid()
+        events = []
+        threads: Dict[int, str] = {}
+        for record in spans:
+            threads[record["thread_id"]] = record["thread"]
+            events.append({
+                "name": record["name"],
+                "cat": record["name"].split(".")[0],
+                "ph": "X",
+                "ts": round(record["start"] * 1e6, 1),
+                "dur": round(record["duration"] * 1e6, 1),
+                "pid": pid,
+                "tid": record["thread_id"],
+                "args": record["attributes"]
+            })
+        events.extend(
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        )
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "trace_id": self.trace_id,
+                "started_at": self.started_at.isoformat(),
+                "totals": {
+                    name: {"count": int(total["count"]), "seconds": round(total["seconds"], 4)}
+                    for name, total in sorted(totals.items())
+                }
+            }
+        }
+
+    def dump(self, directory: str) -> str:
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.trace_id}.trace.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+        return path
+
+
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("eduview_trace", default=None)
+
+
+@contextmanager
+def tracing(trace_id: str, origin: Optional[float] = None) -> Iterator[Optional[Trace]]:
+    """TRACE_DIR doluysa blok boyunca işin izini tut ve sonunda dosyaya yaz"""
+    if not settings.TRACE_DIR:
+        yield None
+        return
+
+    trace = Trace(trace_id, origin=origin)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        try:
+            path = trace.dump(settings.TRACE_DIR)
+            print(f"İz yazıldı: {path}")
+        except OSError as e:
+            print(f"İz yazılamadı ({trace_id}): {e}")
+
+
+def record_span(name: str, start: float, duration: float, aggregate: bool = False, **attributes) -> None:
+    """Ölçülmüş bir süreyi histograma ve etkin ize ekle (start: perf_counter değeri)"""
+    if settings.METRICS_ENABLED:
+        SPAN_SECONDS.observe(duration, span=name)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(name, start, duration, aggregate, attributes)
+
+
+@contextmanager
+def span(name: str, aggregate: bool = False, **attributes) -> Iterator[None]:
+    """Bloğun süresini ölç (hata olsa da kaydedilir)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, start, time.perf_counter() - start, aggregate, **attributes)
+
+
+def timed_iter(iterable: Iterable, name: str) -> Iterator:
+    """Her next() çağrısını toplam span olarak ölç (decode gibi üretici adımlar için)"""
+    iterator = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        record_span(name, start, time.perf_counter() - start, aggregate=True)
+        yield item
+
+
+def bind_context(func: Callable) -> Callable:
+    """func'u çağıranın contextvar'larıyla (etkin iz) çalıştıran sarmalayıcı; havuza gönderilen işler için"""
+    return functools.partial(contextvars.copy_context().run, func)
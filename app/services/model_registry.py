@@ -0,0 +1,120 @@
+"""
+Süreç genelinde paylaşılan model kayıt defteri
+
+Ağır modeller (Whisper, MediaPipe grafikleri) analizör örnekleri oluşturulurken
+değil, ilk ihtiyaç duyulduğunda bir kez yüklenir ve tüm orchestrator örnekleri
+arasında paylaşılır. Yükleme süresi ve bellek artışı kaydedilir; sağlık
+kontrolleri yalnızca bu kayıtları okur, asla model yüklemez.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from .metrics import MODEL_LOAD_SECONDS, MODEL_MEMORY_MB, record_span
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+def current_rss_mb() -> float:
+    """Sürecin anlık bellek kullanımı (MB)"""
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+@dataclass
+class ModelInfo:
+    name: str
+    loaded: bool = False
+    load_seconds: Optional[float] = None
+    memory_mb: Optional[float] = None  # Yükleme sırasındaki RSS artışı
+    loaded_at: Optional[str] = None
+    error: Optional[str] = None
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._info: Dict[str, ModelInfo] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any]) -> None:
+        """Bir model yükleyicisini kaydet (model yüklenmez)"""
+        with self._registry_lock:
+            if name in self._loaders:
+                return
+            self._loaders[name] = loader
+            self._info[name] = ModelInfo(name=name)
+            self._locks[name] = threading.Lock()
+
+    def get(self, name: str) -> Any:
+        """Modeli döndür; ilk çağrıda yükle"""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        if name not in self._loaders:
+            raise KeyError(f"Kayıtlı olmayan model: {name}")
+
+        with self._locks[name]:
+            # Kilit beklenirken başka bir iş parçacığı yüklemiş olabilir
+            model = self._models.get(name)
+            if model is not None:
+                return model
+
+            print(f"Model yükleniyor: {name}")
+            rss_before = current_rss_mb()
+            start = time.perf_counter()
+            try:
+                model = self._loaders[name]()
+            except Exception as e:
+                self._info[name].error = str(e)
+                raise
+
+            info = self._info[name]
+            info.loaded = True
+            info.load_seconds = round(time.perf_counter() - start, 3)
+            info.memory_mb = round(max(0.0, current_rss_mb() - rss_before), 1)
+            info.loaded_at = datetime.now().isoformat()
+            info.error = None
+            MODEL_LOAD_SECONDS.set(info.load_seconds, model=name)
+            MODEL_MEMORY_MB.set(info.memory_mb, model=name)
+            record_span(f"model_load.{name}", start, time.perf_counter() - start)
+            self._models[name] = model
+            print(f"Model yüklendi: {name} ({info.load_seconds}s, +{info.memory_mb} MB)")
+            return model
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def warm_up(self, names: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Modelleri önceden yükle (uygulama başlangıcı için)"""
+        for name in names or list(self._loaders):
+            try:
+                self.get(name)
+            except Exception as e:
+                print(f"Model ısıtma hatası ({name}): {e}")
+        return self.status()
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Model durumlarını döndür; hiçbir modeli yüklemez"""
+        return {name: asdict(info) for name, info in self._info.items()}
+
+
+# Süreç genelinde tek kayıt defteri
+model_registry = ModelRegistry()
@@ -0,0 +1,177 @@
+"""
+İlerleme olayları
+
+Analiz aşamaları ilerlemelerini ProgressEvent olarak bildirir: işlenen
+kare / toplam kare (vision), transkript edilen ses saniyesi (audio),
+tamamlanan LLM çağrısı (content). Kuyruktaki işlerin olayları iş
+kimliğiyle progress_bus'a yayınlanır; SSE uç noktası buradan okur.
+
+Analizörler iş parçacığı havuzunda çalışır. StageProgress.update her
+iş parçacığından çağrılabilir; olay event loop'a aktarılır ve sık
+güncellemeler PROGRESS_MIN_INTERVAL_SECONDS ile seyreltilir (aralığın
+sonu her zaman gönderilir).
+"""
+
+import asyncio
+import inspect
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from ..core.config import settings
+
+# Olay durumları: aşama başladı/bitti, aşama içi ilerleme
+EVENT_RUNNING = "running"
+EVENT_COMPLETED = "completed"
+EVENT_PROGRESS = "progress"
+
+# İş düzeyindeki olayların aşama adı (durum: queued/running/completed/failed)
+JOB_EVENT_STAGE = "job"
+
+# Son olayları tutulan en fazla iş (geç bağlanan aboneler için)
+MAX_TRACKED_JOBS = 256
+
+
+@dataclass
+class ProgressEvent:
+    stage: str
+    status: str
+    done: Optional[float] = None
+    total: Optional[float] = None
+    unit: Optional[str] = None  # frames, seconds, calls
+    message: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def fraction(self) -> Optional[float]:
+        """Tamamlanan oran (0-1); toplam bilinmiyorsa None"""
+        if self.done is None or not self.total:
+            return None
+        return min(1.0, self.done / self.total)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "fraction": self.fraction}
+
+
+class StageProgress:
+    """Bir aşamanın ilerleme bildirici (iş parçacığı güvenli)"""
+
+    def __init__(self, reporter: "ProgressReporter", stage: str):
+        self.reporter = reporter
+        self.stage = stage
+        self._last_sent = 0.0
+
+    def update(self, done: float, total: Optional[float] = None, unit: Optional[str] = None,
+               message: Optional[str] = None) -> None:
+        now = time.monotonic()
+        finished = total is not None and done >= total
+        if not finished and now - self._last_sent < settings.PROGRESS_MIN_INTERVAL_SECONDS:
+            return
+        self._last_sent = now
+        self.reporter.emit(ProgressEvent(
+            stage=self.stage, status=EVENT_PROGRESS, done=done, total=total, unit=unit, message=message
+        ))
+
+
+class ProgressReporter:
+    """Bir analiz çalıştırmasının olaylarını tek bir alıcıya ileten yayıncı
+
+    sink(event) her zaman event loop üzerinde çağrılır; senkron ya da async
+    olabilir. Alıcı hataları analizi durdurmaz.
+    """
+
+    def __init__(self, sink: Callable[[ProgressEvent], Any],
+                 loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.sink = sink
+        self.loop = loop or asyncio.get_running_loop()
+
+    def stage(self, name: str) -> StageProgress:
+        return StageProgress(self, name)
+
+    def emit(self, event: ProgressEvent) -> None:
+        """Olayı event loop'a aktar (herhangi bir iş parçacığından)"""
+        try:
+            self.loop.call_soon_threadsafe(self._deliver, event)
+        except RuntimeError:
+            # Event loop kapanmış; analiz sonucu yine de döner
+            pass
+
+    def _deliver(self, event: ProgressEvent) -> None:
+        try:
+            outcome = self.sink(event)
+            if inspect.isawaitable(outcome):
+                asyncio.ensure_future(outcome).add_done_callback(_log_sink_error)
+        except Exception as e:
+            print(f"İlerleme olayı hatası: {e}")
+
+
+def _log_sink_error(future: asyncio.Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        print(f"İlerleme olayı hatası: {future.exception()}")
+
+
+class ProgressBus:
+    """İş kimliğine göre süreç içi olay yayını
+
+    Her abonenin sınırlı bir kuyruğu vardır; kuyruk dolarsa en eski olay
+    atılır, analiz hiçbir zaman yavaş bir abone yüzünden beklemez. Geç
+    bağlanan abonelere her aşamanın son olayı yeniden gönderilir.
+
+    publish/subscribe event loop üzerinde çağrılmalıdır.
+    """
+
+    def __init__(self, queue_size: int = None):
+        self.queue_size = queue_size or settings.PROGRESS_QUEUE_SIZE
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._latest: "OrderedDict[str, Dict[str, ProgressEvent]]" = OrderedDict()
+
+    def publish(self, job_id: str, event: ProgressEvent) -> None:
+        latest = self._latest.setdefault(job_id, {})
+        latest[event.stage] = event
+        self._latest.move_to_end(job_id)
+        while len(self._latest) > MAX_TRACKED_JOBS:
+            self._latest.popitem(last=False)
+
+        for queue in self._subscribers.get(job_id, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        """İşin olay kuyruğu; aşamaların son olaylarıyla doldurulmuş olarak döner"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        for event in self.latest(job_id)[-self.queue_size:]:
+            queue.put_nowait(event)
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(job_id)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[job_id]
+
+    def latest(self, job_id: str) -> List[ProgressEvent]:
+        """Her aşamanın son olayı (zaman sırasıyla)"""
+        return sorted(self._latest.get(job_id, {}).values(), key=lambda event: event.timestamp)
+
+    def subscriber_count(self, job_id: str) -> int:
+        return len(self._subscribers.get(job_id, ()))
+
+
+# Süreç genelinde paylaşılan olay yolu
+progress_bus = ProgressBus()
+
+
+def publish_job_status(job_id: str, status: str, message: Optional[str] = None) -> None:
+    """İş düzeyindeki durum değişikliğini olay yoluna yayınla
+
+    Olay event loop'un sırasına eklenir; iş parçacıklarından daha önce
+    gönderilmiş aşama olayları abonelere bundan önce ulaşır.
+    """
+    asyncio.get_running_loop().call_soon(
+        progress_bus.publish, job_id, ProgressEvent(stage=JOB_EVENT_STAGE, status=status, message=message)
+    )
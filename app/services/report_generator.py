@@ -12,6 +12,7 @@ from datetime import datetime
 from typing import Dict, List, Any
 
 from .analysis_orchestrator import OverallAnalysisResult
+from .metrics import span
 
 class ReportGenerator:
     def __init__(self):
@@ -113,7 +114,8 @@ class ReportGenerator:
         story.extend(self._create_transcript_section(analysis_result))
         
         # PDF'i oluştur
-        doc.build(story)
+        with span("report.pdf_build"):
+            doc.build(story)
         
         # Buffer'dan byte'ları al
         pdf_bytes = buffer.getvalue()
@@ -0,0 +1,182 @@
+"""
+İçerik adresli kalıcı sonuç önbelleği
+
+Değerler SQLite içinde pickle olarak saklanır. Anahtarlar, girdinin içerik
+özeti (ör. video dosyasının SHA-256'sı) ile analizör sürümü ve sonucu etkileyen
+ayarlardan türetilir; bu parçalardan biri değişince eski kayıt kendiliğinden
+geçersiz olur. Eski kayıtlar yaşa (max_age) göre, toplam boyut aşıldığında ise
+en uzun süre erişilmeyenden başlanarak (LRU) silinir.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .metrics import CACHE_REQUESTS
+from ..core.config import settings
+
+_HASH_CHUNK_BYTES = 1 << 20
+
+
+def hash_file(path: str) -> str:
+    """Dosyanın SHA-256 özetini döndür"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_text(text: str) -> str:
+    """Metnin SHA-256 özetini döndür"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def make_cache_key(*parts: Any) -> str:
+    """Anahtar parçalarından kararlı bir önbellek anahtarı üret"""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, path: str, max_bytes: int, max_age_seconds: float):
+        self.path = path
+        # Metrik etiketi: dosya adı (results, llm)
+        self.name = os.path.splitext(os.path.basename(path))[0]
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Kaydı döndür; yoksa ya da süresi dolmuşsa None"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                CACHE_REQUESTS.inc(cache=self.name, result="miss")
+                return None
+
+            value, created_at = row
+            if now - created_at > self.max_age_seconds:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                CACHE_REQUESTS.inc(cache=self.name, result="miss")
+                return None
+
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+
+        try:
+            result = pickle.loads(value)
+        except Exception:
+            # Bozuk ya da uyumsuz kayıt: sil ve yeniden hesaplat
+            self.delete(key)
+            with self._lock:
+                self.misses += 1
+            CACHE_REQUESTS.inc(cache=self.name, result="miss")
+            return None
+
+        with self._lock:
+            self.hits += 1
+        CACHE_REQUESTS.inc(cache=self.name, result="hit")
+        return result
+
+    def set(self, key: str, value: Any) -> None:
+        """Kaydı yaz ve gerekirse eski kayıtları temizle"""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, sqlite3.Binary(blob), len(blob), now, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        """Süresi dolanları sil; boyut sınırı aşılırsa LRU sırasıyla sil"""
+        self._conn.execute("DELETE FROM entries WHERE created_at < ?", (now - self.max_age_seconds,))
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute("SELECT key, size FROM entries ORDER BY accessed_at ASC").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "entries": count,
+                "size_mb": round(total / (1024 * 1024), 2),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+
+_result_cache: Optional[ResultCache] = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Analiz aşamaları için paylaşılan önbelleği döndür"""
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = ResultCache(
+                os.path.join(settings.CACHE_DIR, "results.sqlite3"),
+                max_bytes=settings.RESULT_CACHE_MAX_MB * 1024 * 1024,
+                max_age_seconds=settings.RESULT_CACHE_MAX_AGE_DAYS * 24 * 3600
+            )
+        return _result_cache
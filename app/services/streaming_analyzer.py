@@ -0,0 +1,576 @@
+"""
+Akış (artımlı) analiz modu
+
+Uzun kayıtlar ve canlı sınıf yayınları için video ve ses sabit uzunlukta
+pencereler (STREAM_WINDOW_SECONDS) halinde tüketilir. Her pencere görüntü,
+ses ve transkript aşamalarından geçirilir; sonuçlar yalnızca sayaçlar ve
+akan istatistikler (ortalama/varyans) olarak biriktirilir. Belirli aralıklarla
+OverallAnalysisResult ara sonuçları (partial=True) yayınlanır.
+
+Bellek kullanımı girdinin uzunluğundan bağımsızdır: bellekte bir pencerenin
+kareleri ve sesi, son STREAM_TRANSCRIPT_TAIL_SEGMENTS transkript segmenti ve
+son STREAM_TIMELINE_MAX_WINDOWS zaman çizelgesi parçası tutulur.
+
+Kaynaklar:
+- Büyümekte olan dosya (kayıt sürerken): FFmpeg "-follow" ile dosya sonunda
+  bekler; STREAM_IDLE_TIMEOUT_SECONDS boyunca veri gelmezse akış biter.
+  Dosya akışa uygun bir kapta olmalıdır (MKV, MPEG-TS, parçalı MP4).
+- Yerel RTSP/RTMP/SRT/UDP yayını.
+
+Video ve ses iki ayrı FFmpeg sürecinden okunur; borular geri basınç uygular,
+analiz yavaşsa çözme de yavaşlar.
+"""
+
+import asyncio
+import inspect
+import math
+import os
+import subprocess
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .analysis_orchestrator import AnalysisOrchestrator, OverallAnalysisResult, serialize_analysis_result
+from .audio_analyzer import AudioAnalysisResult, SAMPLE_RATE, pitch_scores, volume_consistency_score
+from .content_analyzer import ContentAnalysisResult
+from .frame_sampler import SampledFrame
+from .job_store import JobStore, AnalysisJob, JOB_RUNNING, JOB_COMPLETED, JOB_FAILED
+from .keyword_engine import analyze_text
+from .local_content_scorer import LocalContentScorer
+from .progress import ProgressEvent, EVENT_PROGRESS, progress_bus, publish_job_status
+from .timeline import Timeline, build_timeline, concat_timelines
+from .transcription import TranscriptSegment
+from .vision_analyzer import MEDIAPIPE_AVAILABLE, VisionCounters
+from ..core.config import settings
+from ..core.concurrency import get_analysis_executor
+
+STREAM_URL_SCHEMES = ("rtsp://", "rtmp://", "srt://", "udp://")
+
+# Biriken kelime sıklıkları bu sayıyı aşarsa en sık kelimeler tutulur
+MAX_TRACKED_TERMS = 50000
+
+
+class StreamSourceError(Exception):
+    """Akış kaynağı geçersiz ya da okunamıyor"""
+
+
+class StreamLimitError(Exception):
+    """Aynı anda çalışabilecek akış analizi sınırına ulaşıldı"""
+
+
+def resolve_stream_source(source: str, restrict: bool = True) -> Tuple[str, bool]:
+    """Kaynağı (FFmpeg girişi, dosya mı) olarak çöz
+
+    restrict açıkken (API) dosya kaynakları STREAM_INPUT_DIR altında olmalıdır.
+    """
+    if source.startswith(STREAM_URL_SCHEMES):
+        return source, False
+
+    if restrict:
+        base = os.path.realpath(settings.STREAM_INPUT_DIR)
+        path = os.path.realpath(os.path.join(base, source))
+        if os.path.commonpath([base, path]) != base:
+            raise StreamSourceError("Dosya kaynağı akış dizininin dışında")
+    else:
+        path = os.path.realpath(source)
+    if not os.path.isfile(path):
+        raise StreamSourceError(f"Akış kaynağı bulunamadı: {source}")
+    return path, True
+
+
+@dataclass
+class MediaWindow:
+    index: int
+    start: float  # saniye
+    duration: float  # son pencerede kısa olabilir
+    waveform: np.ndarray  # 16 kHz mono float32
+    frames: List[SampledFrame]
+
+
+def _read_exact(stream, size: int) -> bytes:
+    """Borudan size bayt oku; akış biterse eksik döner"""
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = stream.read(size - len(buffer))
+        if not chunk:
+            break
+        buffer.extend(chunk)
+    return bytes(buffer)
+
+
+class StreamReader:
+    """Kaynağı sabit uzunlukta pencereler halinde okuyan okuyucu"""
+
+    def __init__(self, source: str, is_file: bool, window_seconds: float, vision_fps: float,
+                 frame_width: int, idle_timeout: float):
+        self.source = source
+        self.is_file = is_file
+        self.window_seconds = window_seconds
+        self.vision_fps = vision_fps
+        self.frame_width = frame_width
+        self.idle_timeout = idle_timeout
+        self._processes: List[subprocess.Popen] = []
+
+    def _ffmpeg_input(self) -> List[str]:
+        command = ["ffmpeg", "-nostdin", "-loglevel", "error"]
+        if self.is_file:
+            command += ["-follow", "1", "-rw_timeout", str(int(self.idle_timeout * 1_000_000))]
+            return command + ["-i", f"file:{self.source}"]
+        return command + ["-i", self.source]
+
+    def _frame_size(self) -> Optional[Tuple[int, int]]:
+        """Çıkış kare boyutu (genişlik, yükseklik); video yoksa None"""
+        cap = cv2.VideoCapture(self.source)
+        try:
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) if cap.isOpened() else 0
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) if cap.isOpened() else 0
+        finally:
+            cap.release()
+        if width <= 0 or height <= 0:
+            return None
+        if width > self.frame_width:
+            height, width = height * self.frame_width / width, self.frame_width
+        # rawvideo çıktısı için çift boyutlar
+        return int(width) // 2 * 2, int(round(height)) // 2 * 2
+
+    def __iter__(self) -> Iterator[MediaWindow]:
+        frame_size = self._frame_size()
+        audio = subprocess.Popen(
+            self._ffmpeg_input() + ["-vn", "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "f32le", "-"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        self._processes.append(audio)
+        video = None
+        if frame_size is not None:
+            width, height = frame_size
+            video = subprocess.Popen(
+                self._ffmpeg_input() + [
+                    "-an", "-vf", f"fps={self.vision_fps},scale={width}:{height}",
+                    "-pix_fmt", "bgr24", "-f", "rawvideo", "-"
+                ],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+            )
+            self._processes.append(video)
+        else:
+            print(f"Uyarı: Akışta video bulunamadı, yalnızca ses analiz edilecek: {self.source}")
+
+        window_samples = int(self.window_seconds * SAMPLE_RATE)
+        frames_per_window = max(1, round(self.window_seconds * self.vision_fps))
+        try:
+            index = 0
+            frame_index = 0
+            while True:
+                raw_audio = _read_exact(audio.stdout, window_samples * 4)
+                waveform = np.frombuffer(raw_audio[:len(raw_audio) - len(raw_audio) % 4], dtype=np.float32)
+
+                frames: List[SampledFrame] = []
+                if video is not None:
+                    width, height = frame_size
+                    for _ in range(frames_per_window):
+                        raw_frame = _read_exact(video.stdout, width * height * 3)
+                        if len(raw_frame) < width * height * 3:
+                            break
+                        frames.append(SampledFrame(
+                            frame_index=frame_index,
+                            timestamp=frame_index / self.vision_fps,
+                            image=np.frombuffer(raw_frame, dtype=np.uint8).reshape(height, width, 3)
+                        ))
+                        frame_index += 1
+
+                if len(waveform) == 0 and not frames:
+                    break
+                duration = max(len(waveform) / SAMPLE_RATE, len(frames) / self.vision_fps)
+                yield MediaWindow(
+                    index=index, start=index * self.window_seconds, duration=duration,
+                    waveform=waveform, frames=frames
+                )
+                index += 1
+                if len(waveform) < window_samples and len(frames) < frames_per_window:
+                    break
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """FFmpeg süreçlerini durdur (bekleyen okuma boş dönerek biter)"""
+        for process in self._processes:
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+            process.stdout.close()
+        self._processes = []
+
+
+@dataclass
+class RunningStats:
+    """Toplu güncellenebilen akan ortalama/varyans (Chan yöntemi)"""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        batch_mean = float(values.mean())
+        batch_m2 = float(np.sum((values - batch_mean) ** 2))
+        total = self.count + len(values)
+        delta = batch_mean - self.mean
+        self.mean += delta * len(values) / total
+        self.m2 += batch_m2 + delta ** 2 * self.count * len(values) / total
+        self.count = total
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.m2 / self.count) if self.count else 0.0
+
+
+@dataclass
+class _AudioWindow:
+    pause_count: int
+    pause_seconds: float
+    series: Dict[str, np.ndarray]
+    segments: List[TranscriptSegment]  # pencereye göre zaman damgaları
+
+
+@dataclass
+class StreamState:
+    """Akış boyunca biriken ve boyutu sınırlı durum"""
+    processed_seconds: float = 0.0
+    windows: int = 0
+    vision: VisionCounters = field(default_factory=VisionCounters)
+    pause_count: int = 0
+    pause_seconds: float = 0.0
+    pitch: RunningStats = field(default_factory=RunningStats)
+    rms: RunningStats = field(default_factory=RunningStats)
+    word_count: int = 0
+    filler_count: int = 0
+    interaction_count: int = 0
+    term_frequencies: Counter = field(default_factory=Counter)
+    transcript_tail: Deque[TranscriptSegment] = field(
+        default_factory=lambda: deque(maxlen=settings.STREAM_TRANSCRIPT_TAIL_SEGMENTS)
+    )
+    timeline_parts: Deque[Timeline] = field(
+        default_factory=lambda: deque(maxlen=settings.STREAM_TIMELINE_MAX_WINDOWS)
+    )
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+
+
+def _compact_counters(counters: VisionCounters) -> VisionCounters:
+    """Örnek başına serileri at; yalnızca sayaçlar ve sınır durumu kalır"""
+    return replace(
+        counters,
+        sample_times=np.zeros(0, dtype=np.float64),
+        eye_contact=np.zeros(0, dtype=np.float32),
+        hand_x=np.zeros(0, dtype=np.float32),
+        hand_y=np.zeros(0, dtype=np.float32),
+        motion=np.zeros(0, dtype=np.float32),
+        decisions=[]
+    )
+
+
+class StreamingAnalyzer:
+    """Pencere pencere analiz edip ara sonuç yayınlayan analizör
+
+    Görüntü ve ses analizörleri orkestratörle paylaşılır (modeller bir kez
+    yüklenir). İçerik skorları akış modunda her ara sonuçta LLM'e gitmemek için
+    yerel puanlayıcıyla, bellekteki son transkript bölümü üzerinden hesaplanır.
+    """
+
+    def __init__(self, orchestrator: AnalysisOrchestrator):
+        self.orchestrator = orchestrator
+        self.vision_analyzer = orchestrator.vision_analyzer
+        self.audio_analyzer = orchestrator.audio_analyzer
+        self.content_analyzer = orchestrator.content_analyzer
+        self.content_scorer = LocalContentScorer(self.content_analyzer.turkish_stopwords)
+        self.executor = get_analysis_executor()
+
+    async def analyze_stream(self, source: str, subject_topic: Optional[str] = None,
+                             on_snapshot: Optional[Callable] = None, restrict_source: bool = True,
+                             stop_event: Optional[threading.Event] = None) -> OverallAnalysisResult:
+        """Kaynağı sonuna (ya da stop_event'e) kadar işle ve son sonucu döndür
+
+        on_snapshot(result) her STREAM_SNAPSHOT_EVERY_WINDOWS pencerede bir ve
+        akış bitince (partial=False) çağrılır; senkron ya da async olabilir.
+        """
+        path, is_file = resolve_stream_source(source, restrict_source)
+        reader = StreamReader(
+            path, is_file, settings.STREAM_WINDOW_SECONDS, settings.STREAM_VISION_FPS,
+            settings.STREAM_FRAME_WIDTH, settings.STREAM_IDLE_TIMEOUT_SECONDS
+        )
+        print(f"Akış analizi başlıyor: {source}")
+        loop = asyncio.get_running_loop()
+        state = StreamState()
+        windows = iter(reader)
+
+        try:
+            while stop_event is None or not stop_event.is_set():
+                window = await loop.run_in_executor(self.executor, next, windows, None)
+                if window is None:
+                    break
+                await self._process_window(window, state)
+                if state.windows % max(1, settings.STREAM_SNAPSHOT_EVERY_WINDOWS) == 0:
+                    await self._publish(on_snapshot, await self._snapshot(state, subject_topic, partial=True))
+        finally:
+            reader.close()
+
+        result = await self._snapshot(state, subject_topic, partial=False)
+        await self._publish(on_snapshot, result)
+        print(f"Akış analizi tamamlandı: {state.processed_seconds:.0f} sn, {state.windows} pencere")
+        return result
+
+    async def _process_window(self, window: MediaWindow, state: StreamState) -> None:
+        """Pencerenin görüntü ve ses analizini paralel çalıştır ve durumu güncelle"""
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        vision_counters, audio_window = await asyncio.gather(
+            loop.run_in_executor(self.executor, self._analyze_window_vision, window),
+            loop.run_in_executor(self.executor, self._analyze_window_audio, window)
+        )
+        self._update_state(state, window, vision_counters, audio_window)
+        state.stage_timings["windows"] = round(state.stage_timings.get("windows", 0.0) + time.perf_counter() - start, 3)
+
+    def _analyze_window_vision(self, window: MediaWindow) -> VisionCounters:
+        if not MEDIAPIPE_AVAILABLE or not window.frames:
+            return VisionCounters()
+        return self.vision_analyzer.analyze_frames(window.frames)
+
+    def _analyze_window_audio(self, window: MediaWindow) -> Optional[_AudioWindow]:
+        if len(window.waveform) == 0:
+            return None
+        y = window.waveform
+        series: Dict[str, np.ndarray] = {}
+        pause_count, average_pause = self.audio_analyzer._analyze_pauses(y, SAMPLE_RATE, series)
+        self.audio_analyzer._analyze_pitch(y, SAMPLE_RATE, series)
+        self.audio_analyzer._analyze_volume_consistency(y, SAMPLE_RATE, series)
+        transcript = self.audio_analyzer._transcribe_audio(y)
+        return _AudioWindow(
+            pause_count=pause_count,
+            pause_seconds=float(pause_count * average_pause),
+            series=series,
+            segments=transcript.segments
+        )
+
+    def _update_state(self, state: StreamState, window: MediaWindow, vision_counters: VisionCounters,
+                      audio_window: Optional[_AudioWindow]) -> None:
+        """Pencere sonuçlarını biriken duruma ekle; pencereye ait diziler burada bırakılır"""
+        state.windows += 1
+        state.processed_seconds = window.start + window.duration
+
+        vision_series = {
+            "time": vision_counters.sample_times - window.start,
+            "eye_contact": vision_counters.eye_contact,
+            "hand_x": vision_counters.hand_x,
+            "hand_y": vision_counters.hand_y
+        }
+        state.vision = _compact_counters(state.vision.merge(vision_counters))
+
+        segments: List[TranscriptSegment] = []
+        audio_series: Dict[str, np.ndarray] = {}
+        if audio_window is not None:
+            segments = audio_window.segments
+            audio_series = audio_window.series
+            state.pause_count += audio_window.pause_count
+            state.pause_seconds += audio_window.pause_seconds
+            if "pitch" in audio_series:
+                pitch = audio_series["pitch"]
+                state.pitch.update(pitch[pitch > 0])
+            if "rms" in audio_series:
+                state.rms.update(audio_series["rms"])
+
+            text = " ".join(segment.text for segment in segments)
+            stats = analyze_text(text)
+            state.word_count += stats.word_count
+            state.filler_count += stats.count("filler")
+            state.interaction_count += stats.count("interaction")
+            state.term_frequencies.update(stats.term_frequencies)
+            if len(state.term_frequencies) > MAX_TRACKED_TERMS:
+                state.term_frequencies = Counter(dict(state.term_frequencies.most_common(MAX_TRACKED_TERMS // 2)))
+            state.transcript_tail.extend(
+                TranscriptSegment(start=segment.start + window.start, end=segment.end + window.start, text=segment.text)
+                for segment in segments
+            )
+
+        key_concepts, _ = self.content_analyzer.key_concepts_from_frequencies(state.term_frequencies)
+        # Tek pencerenin zaman çizelgesi hatası akış analizini durdurmamalı
+        try:
+            timeline = build_timeline(
+                window.duration, settings.TIMELINE_WINDOW_SECONDS,
+                vision_series=vision_series, audio_series=audio_series,
+                segments=segments, key_concepts=key_concepts
+            )
+        except Exception as e:
+            print(f"Zaman çizelgesi hatası (pencere {window.start:.0f} sn): {e}")
+            timeline = None
+        if timeline is not None:
+            timeline.start = timeline.start + window.start
+            state.timeline_parts.append(timeline)
+
+    async def _snapshot(self, state: StreamState, subject_topic: Optional[str],
+                        partial: bool) -> OverallAnalysisResult:
+        """Biriken durumdan OverallAnalysisResult oluştur"""
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+
+        if MEDIAPIPE_AVAILABLE and state.vision.sampled_frames:
+            vision = self.vision_analyzer._summarize(state.vision)
+        else:
+            vision = self.vision_analyzer._create_fallback_result()
+
+        duration_minutes = state.processed_seconds / 60
+        speech_rate = state.word_count / duration_minutes if duration_minutes > 0 else 0
+        filler_percentage = state.filler_count / state.word_count * 100 if state.word_count else 0
+        pitch_variation, monotony_score = pitch_scores(state.pitch.count, state.pitch.mean, state.pitch.std)
+        volume_consistency = volume_consistency_score(state.rms.mean, state.rms.std)
+        tail = list(state.transcript_tail)
+        audio = AudioAnalysisResult(
+            transcription=" ".join(segment.text for segment in tail),
+            filler_words_count=state.filler_count,
+            filler_words_percentage=filler_percentage,
+            speech_rate=speech_rate,
+            pause_count=state.pause_count,
+            average_pause_duration=state.pause_seconds / state.pause_count if state.pause_count else 0,
+            pitch_variation=pitch_variation,
+            monotony_score=monotony_score,
+            volume_consistency=volume_consistency,
+            overall_voice_score=self.audio_analyzer._calculate_overall_voice_score(
+                filler_percentage, speech_rate, monotony_score, volume_consistency
+            ),
+            segments=tail
+        )
+
+        key_concepts, concept_density = self.content_analyzer.key_concepts_from_frequencies(state.term_frequencies)
+        scores = await loop.run_in_executor(
+            self.executor, self.content_scorer.score, audio.transcription, subject_topic
+        )
+        content = ContentAnalysisResult(
+            content_completeness_score=scores.completeness_score,
+            missing_topics=scores.missing_topics,
+            key_concepts=key_concepts,
+            concept_density=concept_density,
+            topic_flow_score=scores.topic_flow_score,
+            interaction_examples_count=state.interaction_count,
+            educational_structure_score=scores.educational_structure_score,
+            overall_content_score=self.content_analyzer._calculate_overall_content_score(
+                scores.completeness_score, scores.topic_flow_score, scores.educational_structure_score,
+                state.interaction_count, len(key_concepts)
+            ),
+            topic_heatmap=[]
+        )
+
+        overall_scores = self.orchestrator._calculate_overall_scores(vision, audio, content)
+        engine_recommendations = loop.create_future()
+        engine_recommendations.set_result(self.content_scorer.recommendations(scores)[:7])
+        recommendations = await self.orchestrator._generate_recommendations(
+            vision, audio, content, engine_recommendations
+        )
+        stage_timings = dict(state.stage_timings)
+        stage_timings["snapshot"] = round(time.perf_counter() - start, 3)
+
+        return OverallAnalysisResult(
+            vision_analysis=vision,
+            audio_analysis=audio,
+            content_analysis=content,
+            body_language_score=overall_scores['body_language'],
+            voice_score=overall_scores['voice'],
+            content_flow_score=overall_scores['content_flow'],
+            interaction_score=overall_scores['interaction'],
+            total_score=overall_scores['total'],
+            video_duration=state.processed_seconds,
+            analysis_timestamp=datetime.now(),
+            recommendations=recommendations,
+            stage_timings=stage_timings,
+            timeline=concat_timelines(state.timeline_parts),
+            partial=partial
+        )
+
+    async def _publish(self, on_snapshot: Optional[Callable], result: OverallAnalysisResult) -> None:
+        """Ara sonucu yayınla; yayın hataları analizi durdurmaz"""
+        if on_snapshot is None:
+            return
+        try:
+            outcome = on_snapshot(result)
+            if inspect.isawaitable(outcome):
+                await outcome
+        except Exception as e:
+            print(f"Ara sonuç yayın hatası: {e}")
+
+
+class StreamJobManager:
+    """Akış analizlerini iş deposu üzerinden yürüten yönetici
+
+    Her ara sonuç işin result alanına yazılır; istemciler mevcut durum ve sonuç
+    uçlarıyla ders sürerken sonuçları okuyabilir.
+    """
+
+    def __init__(self, orchestrator: AnalysisOrchestrator, store: JobStore):
+        self.analyzer = StreamingAnalyzer(orchestrator)
+        self.store = store
+        self._active: Dict[str, Tuple[asyncio.Task, threading.Event]] = {}
+
+    @property
+    def active_count(self) -> int:
+        return len(self._active)
+
+    async def start(self, source: str, subject_topic: Optional[str] = None) -> str:
+        """Akış analizini başlat ve iş kimliğini döndür"""
+        resolve_stream_source(source)
+        if len(self._active) >= settings.STREAM_MAX_ACTIVE:
+            raise StreamLimitError("Aynı anda çalışabilecek akış analizi sınırına ulaşıldı")
+
+        job_id = f"stream_{uuid.uuid4().hex}"
+        now = datetime.now()
+        await self.store.create(AnalysisJob(
+            job_id=job_id, status=JOB_RUNNING, created_at=now, updated_at=now,
+            filename=source, subject_topic=subject_topic
+        ))
+        publish_job_status(job_id, JOB_RUNNING)
+        stop_event = threading.Event()
+        task = asyncio.create_task(self._run(job_id, source, subject_topic, stop_event), name=job_id)
+        self._active[job_id] = (task, stop_event)
+        return job_id
+
+    def stop(self, job_id: str) -> bool:
+        """Akışı mevcut pencereden sonra durdur; iş bulunamazsa False"""
+        entry = self._active.get(job_id)
+        if entry is None:
+            return False
+        entry[1].set()
+        return True
+
+    async def shutdown(self) -> None:
+        for task, stop_event in list(self._active.values()):
+            stop_event.set()
+            task.cancel()
+        await asyncio.gather(*(task for task, _ in self._active.values()), return_exceptions=True)
+
+    async def _run(self, job_id: str, source: str, subject_topic: Optional[str],
+                   stop_event: threading.Event) -> None:
+        async def on_snapshot(result: OverallAnalysisResult):
+            await self.store.update(job_id, result=serialize_analysis_result(result))
+            progress_bus.publish(job_id, ProgressEvent(
+                stage="stream", status=EVENT_PROGRESS, done=round(result.video_duration, 1), unit="seconds",
+                message=f"Toplam skor: {result.total_score:.1f}"
+            ))
+
+        try:
+            await self.analyzer.analyze_stream(source, subject_topic, on_snapshot, stop_event=stop_event)
+            await self.store.update(job_id, status=JOB_COMPLETED, progress=100.0)
+            publish_job_status(job_id, JOB_COMPLETED)
+        except asyncio.CancelledError:
+            await self.store.update(job_id, status=JOB_FAILED, error="Akış analizi iptal edildi")
+            publish_job_status(job_id, JOB_FAILED, "Akış analizi iptal edildi")
+            raise
+        except Exception as e:
+            print(f"Akış analizi hatası ({job_id}): {e}")
+            await self.store.update(job_id, status=JOB_FAILED, error=str(e))
+            publish_job_status(job_id, JOB_FAILED, str(e))
+        finally:
+            self._active.pop(job_id, None)
@@ -0,0 +1,249 @@
+"""
+Zaman çizelgesi: pencere başına metrikler
+
+Görüntü, ses ve içerik analizlerinin ham zaman serileri (örneklenen kareler,
+RMS/pitch kareleri, duraklamalar, transkript kelimeleri) ortak bir zaman
+ızgarasına (TIMELINE_WINDOW_SECONDS) indirgenir. Her metrik bir float32
+sütundur; veri olmayan pencereler NaN'dır.
+
+Sütunlar dilimlenebilir ve seyreltilebilir (arayüzde yakınlaştırma için);
+bunun için analiz yeniden çalıştırılmaz.
+"""
+
+import io
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from .keyword_engine import default_keyword_engine
+from .topic_heatmap import timed_tokens
+from .transcription import TranscriptSegment
+
+# Sütun adları ve anlamları
+TIMELINE_COLUMNS = {
+    "face_visible": "Yüzün göründüğü örnek oranı (0-1)",
+    "eye_contact": "Yüz görünen örneklerde göz teması oranı (0-1)",
+    "gesture_energy": "Ardışık el konumları arası ortalama hareket (normalize koordinat)",
+    "rms": "Ortalama ses enerjisi (RMS)",
+    "pitch_hz": "Sesli karelerin ortalama perdesi (Hz)",
+    "pause_ratio": "0.5 sn'den uzun duraklamalarda geçen süre oranı (0-1)",
+    "words_per_minute": "Konuşma hızı (kelime/dakika)",
+    "filler_hits": "Dolgu kelimesi sayısı",
+    "concept_density": "Anahtar kavram kelimelerinin oranı (0-1)",
+}
+
+
+@dataclass
+class Timeline:
+    window_seconds: float
+    start: np.ndarray  # pencere başlangıçları (saniye)
+    columns: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    @property
+    def end(self) -> np.ndarray:
+        return self.start + self.window_seconds
+
+    def slice(self, start_seconds: float = 0.0, end_seconds: Optional[float] = None) -> "Timeline":
+        """Zaman aralığındaki pencereler (kopya değil, görünüm)"""
+        first = int(np.searchsorted(self.start, start_seconds - self.window_seconds, side="right"))
+        last = len(self) if end_seconds is None else int(np.searchsorted(self.start, end_seconds, side="left"))
+        return Timeline(
+            window_seconds=self.window_seconds,
+            start=self.start[first:last],
+            columns={name: values[first:last] for name, values in self.columns.items()}
+        )
+
+    def downsample(self, max_points: int) -> "Timeline":
+        """Pencereleri birleştirerek en fazla max_points noktaya indir (NaN'lar yoksayılır)"""
+        factor = math.ceil(len(self) / max(1, max_points))
+        if factor <= 1:
+            return self
+
+        padded = math.ceil(len(self) / factor) * factor
+        columns = {}
+        for name, values in self.columns.items():
+            grouped = np.full(padded, np.nan, dtype=np.float32)
+            grouped[:len(values)] = values
+            grouped = grouped.reshape(-1, factor)
+            if name == "filler_hits":
+                columns[name] = np.nansum(grouped, axis=1).astype(np.float32)
+            else:
+                counts = np.sum(~np.isnan(grouped), axis=1)
+                sums = np.nansum(grouped, axis=1)
+                columns[name] = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan).astype(np.float32)
+        return Timeline(
+            window_seconds=self.window_seconds * factor,
+            start=self.start[::factor],
+            columns=columns
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON uyumlu sözlük (NaN -> None)"""
+        def to_list(values: np.ndarray):
+            return [None if math.isnan(v) else round(float(v), 4) for v in values]
+
+        return {
+            "window_seconds": self.window_seconds,
+            "start": [round(float(s), 3) for s in self.start],
+            "columns": {name: to_list(values) for name, values in self.columns.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Timeline":
+        def to_array(values):
+            return np.array([np.nan if v is None else v for v in values], dtype=np.float32)
+
+        return cls(
+            window_seconds=float(data["window_seconds"]),
+            start=np.asarray(data["start"], dtype=np.float64),
+            columns={name: to_array(values) for name, values in data["columns"].items()}
+        )
+
+    def to_npz(self) -> bytes:
+        """Sıkıştırılmış ikili biçim (depolama ve aktarım için)"""
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer, window_seconds=np.float64(self.window_seconds), start=self.start,
+            **{f"col_{name}": values for name, values in self.columns.items()}
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_npz(cls, payload: bytes) -> "Timeline":
+        with np.load(io.BytesIO(payload)) as data:
+            return cls(
+                window_seconds=float(data["window_seconds"]),
+                start=data["start"],
+                columns={key[4:]: data[key] for key in data.files if key.startswith("col_")}
+            )
+
+    def to_dataframe(self):
+        """pandas DataFrame (Parquet/Arrow dışa aktarımı için)"""
+        import pandas as pd
+
+        return pd.DataFrame({"start": self.start, "end": self.end, **self.columns})
+
+
+def concat_timelines(parts: Sequence[Timeline]) -> Optional[Timeline]:
+    """Aynı pencere boyutundaki ardışık zaman çizelgelerini birleştir (eksik sütunlar NaN)"""
+    parts = [part for part in parts if part is not None and len(part)]
+    if not parts:
+        return None
+    names = list(dict.fromkeys(name for part in parts for name in part.columns))
+    return Timeline(
+        window_seconds=parts[0].window_seconds,
+        start=np.concatenate([part.start for part in parts]),
+        columns={
+            name: np.concatenate([
+                part.columns.get(name, np.full(len(part), np.nan, dtype=np.float32)) for part in parts
+            ])
+            for name in names
+        }
+    )
+
+
+def _window_index(times: np.ndarray, window_seconds: float, n_windows: int) -> np.ndarray:
+    return np.clip((np.asarray(times, dtype=np.float64) // window_seconds).astype(np.int64), 0, n_windows - 1)
+
+
+def _binned_sum(times: np.ndarray, values: np.ndarray, window_seconds: float, n_windows: int) -> np.ndarray:
+    if len(times) == 0:
+        return np.zeros(n_windows)
+    return np.bincount(_window_index(times, window_seconds, n_windows), weights=values, minlength=n_windows)
+
+
+def _binned_mean(times: np.ndarray, values: np.ndarray, window_seconds: float, n_windows: int) -> np.ndarray:
+    """Pencere başına ortalama; NaN değerler ve boş pencereler NaN"""
+    times = np.asarray(times, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    sums = _binned_sum(times[valid], values[valid], window_seconds, n_windows)
+    counts = _binned_sum(times[valid], np.ones(valid.sum()), window_seconds, n_windows)
+    return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+
+def _interval_coverage(starts: np.ndarray, ends: np.ndarray, window_seconds: float,
+                       n_windows: int) -> np.ndarray:
+    """Aralıkların her pencerede kapladığı süre oranı"""
+    if len(starts) == 0:
+        return np.zeros(n_windows)
+    window_starts = np.arange(n_windows)[:, None] * window_seconds
+    overlap = np.clip(
+        np.minimum(window_starts + window_seconds, ends[None, :]) - np.maximum(window_starts, starts[None, :]),
+        0, None
+    )
+    return overlap.sum(axis=1) / window_seconds
+
+
+def build_timeline(duration: float, window_seconds: float,
+                   vision_series: Optional[Dict[str, np.ndarray]] = None,
+                   audio_series: Optional[Dict[str, np.ndarray]] = None,
+                   segments: Optional[Sequence[TranscriptSegment]] = None,
+                   key_concepts: Optional[Sequence[str]] = None) -> Optional[Timeline]:
+    """Ham serileri ortak zaman ızgarasına indirge"""
+    if duration <= 0 or window_seconds <= 0:
+        return None
+
+    n_windows = max(1, math.ceil(duration / window_seconds))
+    columns: Dict[str, np.ndarray] = {}
+
+    # Görüntü: örneklenen kareler
+    if vision_series and len(vision_series.get("time", ())):
+        times = vision_series["time"]
+        eye_contact = vision_series["eye_contact"]
+        columns["face_visible"] = _binned_mean(times, (~np.isnan(eye_contact)).astype(np.float64), window_seconds, n_windows)
+        columns["eye_contact"] = _binned_mean(times, eye_contact, window_seconds, n_windows)
+
+        # El hareketi: ardışık geçerli el konumları arası mesafe, ikinci gözlemin zamanına yazılır
+        hand_x, hand_y = vision_series["hand_x"], vision_series["hand_y"]
+        has_hand = ~np.isnan(hand_x)
+        movement = np.hypot(np.diff(hand_x[has_hand]), np.diff(hand_y[has_hand]))
+        movement_sum = _binned_sum(times[has_hand][1:], movement, window_seconds, n_windows)
+        samples = _binned_sum(times, np.ones(len(times)), window_seconds, n_windows)
+        columns["gesture_energy"] = np.where(samples > 0, movement_sum / np.maximum(samples, 1), np.nan)
+
+    # Ses: RMS ve perde kareleri, duraklama aralıkları
+    # Her seri ayrı adımda üretilir; biri hata verip yazılmadıysa diğerleri yine kullanılır
+    audio_series = audio_series or {}
+    if len(audio_series.get("rms_time", ())) and "rms" in audio_series:
+        columns["rms"] = _binned_mean(audio_series["rms_time"], audio_series["rms"], window_seconds, n_windows)
+    if len(audio_series.get("pitch_time", ())) and "pitch" in audio_series:
+        pitch = np.asarray(audio_series["pitch"], dtype=np.float64)
+        pitch = np.where(pitch > 0, pitch, np.nan)
+        columns["pitch_hz"] = _binned_mean(audio_series["pitch_time"], pitch, window_seconds, n_windows)
+    if "pause_start" in audio_series and "pause_end" in audio_series:
+        columns["pause_ratio"] = _interval_coverage(
+            np.asarray(audio_series["pause_start"], dtype=np.float64),
+            np.asarray(audio_series["pause_end"], dtype=np.float64),
+            window_seconds, n_windows
+        )
+
+    # Transkript: kelime, dolgu ve kavram sayıları
+    if segments:
+        tokens, token_times = timed_tokens(segments)
+        # Zaman damgası olmayan transkript ızgaraya yerleştirilemez
+        if tokens and token_times.max() > 0:
+            words = _binned_sum(token_times, np.ones(len(tokens)), window_seconds, n_windows)
+            columns["words_per_minute"] = words * (60.0 / window_seconds)
+
+            filler_positions = default_keyword_engine.positions(tokens, "filler")
+            columns["filler_hits"] = _binned_sum(
+                token_times[filler_positions], np.ones(len(filler_positions)), window_seconds, n_windows
+            )
+
+            if key_concepts:
+                concepts = set(key_concepts)
+                is_concept = np.fromiter((token in concepts for token in tokens), dtype=bool, count=len(tokens))
+                concept_words = _binned_sum(token_times[is_concept], np.ones(is_concept.sum()), window_seconds, n_windows)
+                columns["concept_density"] = np.where(words > 0, concept_words / np.maximum(words, 1), np.nan)
+
+    return Timeline(
+        window_seconds=window_seconds,
+        start=np.arange(n_windows, dtype=np.float64) * window_seconds,
+        columns={name: np.asarray(values, dtype=np.float32) for name, values in columns.items()}
+    )
@@ -0,0 +1,133 @@
+"""
+Konu yoğunluk haritası
+
+Transkript bir kez kelimelere ayrılır, her kelime bir kavram kimliğine
+eşlenir (kavram değilse -1) ve kelime x kavram göstergelerinin kümülatif
+toplamı alınır. Herhangi bir pencerenin kavram sayıları iki satırın farkıdır;
+böylece tüm segmentler x kavramlar matrisi tek vektörel işlemle çıkar.
+
+Segment zaman damgaları varsa pencereler saniye cinsinden, yoksa kelime
+sayısına göre belirlenir. Pencereler örtüşebilir.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .keyword_engine import tokenize
+from .transcription import TranscriptSegment
+
+
+@dataclass
+class TopicHeatmap:
+    concepts: List[str]
+    counts: np.ndarray          # segmentler x kavramlar, kavram geçiş sayısı
+    word_counts: np.ndarray     # segment başına kelime sayısı
+    start_words: np.ndarray
+    end_words: np.ndarray
+    start_times: Optional[np.ndarray] = None  # saniye (zaman damgası varsa)
+    end_times: Optional[np.ndarray] = None
+
+    @property
+    def density(self) -> np.ndarray:
+        """Kavram geçişi / segmentteki kelime sayısı"""
+        return self.counts / np.maximum(self.word_counts, 1)[:, None]
+
+    @property
+    def segment_labels(self) -> List[str]:
+        if self.start_times is None:
+            return [f"Segment {i + 1}" for i in range(len(self.counts))]
+        return [
+            f"{int(start) // 60:02d}:{int(start) % 60:02d}-{int(end) // 60:02d}:{int(end) % 60:02d}"
+            for start, end in zip(self.start_times, self.end_times)
+        ]
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """API ve PDF raporu için segment başına sözlük listesi"""
+        density = self.density
+        records = []
+        for i in range(len(self.counts)):
+            concept_scores = {concept: float(density[i, j]) for j, concept in enumerate(self.concepts)}
+            record = {
+                'segment_id': i,
+                'start_word': int(self.start_words[i]),
+                'end_word': int(self.end_words[i]),
+                'concept_scores': concept_scores,
+                'dominant_concept': self.concepts[int(np.argmax(density[i]))] if self.concepts else None,
+                'density_score': float(density[i].sum())
+            }
+            if self.start_times is not None:
+                record['start_time'] = round(float(self.start_times[i]), 2)
+                record['end_time'] = round(float(self.end_times[i]), 2)
+            records.append(record)
+        return records
+
+
+def _window_starts(total: float, size: float, overlap: float) -> np.ndarray:
+    """Pencere başlangıçları; önceki pencereye yeni bir şey katmayan son pencereler atılır"""
+    if total <= 0:
+        return np.zeros(0)
+    if not 0 <= overlap < size:
+        overlap = 0
+    starts = np.arange(0, total, size - overlap)
+    return starts[(starts == 0) | (starts + overlap < total)]
+
+
+def timed_tokens(segments: Sequence[TranscriptSegment]):
+    """Segment kelimelerine, segment süresine eşit dağıtılmış zaman damgaları ver"""
+    tokens: List[str] = []
+    times: List[np.ndarray] = []
+    for segment in segments:
+        segment_tokens = tokenize(segment.text)
+        if not segment_tokens:
+            continue
+        tokens.extend(segment_tokens)
+        times.append(np.linspace(segment.start, segment.end, len(segment_tokens), endpoint=False))
+    return tokens, (np.concatenate(times) if times else np.zeros(0))
+
+
+def build_topic_heatmap(transcription: str, concepts: List[str],
+                        segments: Optional[Sequence[TranscriptSegment]] = None,
+                        segment_words: int = 50, overlap_words: int = 0,
+                        segment_seconds: float = 30.0, overlap_seconds: float = 0.0) -> TopicHeatmap:
+    """Segmentler x kavramlar sayım matrisini oluştur"""
+    total_seconds = max((segment.end for segment in segments), default=0.0) if segments else 0.0
+    if total_seconds > 0:
+        tokens, token_times = timed_tokens(segments)
+    else:
+        tokens, token_times = tokenize(transcription), None
+
+    concept_ids = {concept: j for j, concept in enumerate(concepts)}
+    ids = np.fromiter((concept_ids.get(token, -1) for token in tokens), dtype=np.int64, count=len(tokens))
+
+    # Kelime x kavram göstergelerinin kümülatif toplamı (başa sıfır satırı eklenir)
+    indicators = np.zeros((len(tokens) + 1, len(concepts)), dtype=np.int32)
+    hits = np.nonzero(ids >= 0)[0]
+    indicators[hits + 1, ids[hits]] = 1
+    cumulative = np.cumsum(indicators, axis=0)
+
+    if not tokens:
+        start_times = end_times = None
+        start_words = end_words = np.zeros(0, dtype=np.int64)
+    elif token_times is not None:
+        start_times = _window_starts(total_seconds, segment_seconds, overlap_seconds)
+        end_times = np.minimum(start_times + segment_seconds, total_seconds)
+        start_words = np.searchsorted(token_times, start_times, side="left")
+        end_words = np.searchsorted(token_times, end_times, side="left")
+        end_words[-1] = len(tokens)
+    else:
+        start_times = end_times = None
+        start_words = _window_starts(len(tokens), segment_words, overlap_words).astype(np.int64)
+        end_words = np.minimum(start_words + segment_words, len(tokens))
+
+    counts = cumulative[end_words] - cumulative[start_words]
+    return TopicHeatmap(
+        concepts=list(concepts),
+        counts=counts,
+        word_counts=end_words - start_words,
+        start_words=start_words,
+        end_words=end_words,
+        start_times=start_times,
+        end_times=end_times
+    )
@@ -0,0 +1,89 @@
+import math
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .transcription import TranscriptSegment
+
+# Türkçe metinde ortalama token uzunluğu (karakter); kaba ama tutarlı bir tahmin
+CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class TranscriptChunk:
+    chunk_id: int
+    text: str
+    start: Optional[float]  # saniye (segment yoksa None)
+    end: Optional[float]
+    tokens: int
+
+
+def estimate_tokens(text: str) -> int:
+    """Metnin yaklaşık token sayısı"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _split_oversized(segment: TranscriptSegment, max_tokens: int) -> List[TranscriptSegment]:
+    """Tek başına bütçeyi aşan segmenti kelime sınırlarından böl (süre orantılı dağıtılır)"""
+    words = segment.text.split()
+    pieces: List[List[str]] = [[]]
+    piece_chars = 0
+    for word in words:
+        if pieces[-1] and math.ceil((piece_chars + 1 + len(word)) / CHARS_PER_TOKEN) > max_tokens:
+            pieces.append([])
+            piece_chars = 0
+        piece_chars += len(word) + (1 if pieces[-1] else 0)
+        pieces[-1].append(word)
+
+    duration = segment.end - segment.start
+    result = []
+    offset = 0
+    for piece in pieces:
+        start = segment.start + duration * offset / max(len(words), 1)
+        offset += len(piece)
+        end = segment.start + duration * offset / max(len(words), 1)
+        result.append(TranscriptSegment(start=start, end=end, text=" ".join(piece)))
+    return result
+
+
+def _segments_from_text(transcription: str) -> List[TranscriptSegment]:
+    """Zaman damgası yoksa cümle sonlarından sahte segmentler üret"""
+    sentences = [s for s in re.split(r"(?<=[.!?])\s+", transcription.strip()) if s]
+    return [TranscriptSegment(start=0.0, end=0.0, text=s) for s in sentences]
+
+
+def chunk_transcript(transcription: str, segments: Optional[List[TranscriptSegment]],
+                     max_tokens: int) -> List[TranscriptChunk]:
+    """Transkripti segment sınırlarından, her parça max_tokens'ı aşmayacak şekilde böl"""
+    timed = bool(segments)
+    source = segments if timed else _segments_from_text(transcription)
+
+    chunks: List[TranscriptChunk] = []
+    current: List[TranscriptSegment] = []
+    current_tokens = 0
+
+    def flush():
+        nonlocal current, current_tokens
+        if not current:
+            return
+        chunks.append(TranscriptChunk(
+            chunk_id=len(chunks),
+            text=" ".join(seg.text.strip() for seg in current),
+            start=current[0].start if timed else None,
+            end=current[-1].end if timed else None,
+            tokens=current_tokens
+        ))
+        current, current_tokens = [], 0
+
+    for segment in source:
+        if not segment.text.strip():
+            continue
+        pieces = [segment] if estimate_tokens(segment.text) <= max_tokens else _split_oversized(segment, max_tokens)
+        for piece in pieces:
+            tokens = estimate_tokens(piece.text)
+            if current and current_tokens + 1 + tokens > max_tokens:
+                flush()
+            current_tokens += tokens + (1 if current else 0)
+            current.append(piece)
+    flush()
+    return chunks
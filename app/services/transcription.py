@@ -0,0 +1,134 @@
+import numpy as np
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Type
+from dataclasses import dataclass, field
+
+from ..core.config import settings
+
+WAVEFORM_SAMPLE_RATE = 16000  # Motorların beklediği dalga formu örnekleme hızı
+
+@dataclass
+class TranscriptSegment:
+    start: float  # saniye
+    end: float    # saniye
+    text: str
+
+@dataclass
+class TranscriptionResult:
+    text: str
+    segments: List[TranscriptSegment] = field(default_factory=list)
+    language: Optional[str] = None
+
+
+class TranscriptionBackend(ABC):
+    """Konuşmadan metne (STT) motorları için ortak arayüz
+
+    Tüm motorlar 16 kHz mono float32 dalga formu alır ve zaman damgalı
+    segmentler döndürür. on_progress(saniye) verilirse transkript edilen ses
+    süresi bildirilir (motor segment segment üretiyorsa her segmentte).
+    """
+
+    name = "base"
+
+    def __init__(self, model_size: str, compute_type: str, threads: int, beam_size: int):
+        self.model_size = model_size
+        self.compute_type = compute_type
+        self.threads = threads
+        self.beam_size = beam_size
+
+    @abstractmethod
+    def transcribe(self, waveform: np.ndarray, language: str = "tr",
+                   on_progress: Optional[Callable[[float], None]] = None) -> TranscriptionResult:
+        ...
+
+
+class OpenAIWhisperBackend(TranscriptionBackend):
+    """openai-whisper (PyTorch) motoru"""
+
+    name = "openai-whisper"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        import whisper
+        import torch
+
+        if self.threads > 0:
+            torch.set_num_threads(self.threads)
+        self.model = whisper.load_model(self.model_size, device="cpu")
+        # Whisper decode sırasında modele kv-cache hook'ları ekleyip kaldırır;
+        # aynı model iki iş parçacığından aynı anda kullanılamaz.
+        self._lock = threading.Lock()
+
+    def transcribe(self, waveform: np.ndarray, language: str = "tr",
+                   on_progress: Optional[Callable[[float], None]] = None) -> TranscriptionResult:
+        options = {"language": language, "fp16": False}
+        if self.beam_size > 1:
+            options["beam_size"] = self.beam_size
+
+        with self._lock:
+            result = self.model.transcribe(waveform, **options)
+
+        segments = [
+            TranscriptSegment(start=float(seg["start"]), end=float(seg["end"]), text=seg["text"].strip())
+            for seg in result.get("segments", [])
+        ]
+        # openai-whisper ara ilerleme vermez; yalnızca sonda bildirilir
+        if on_progress is not None:
+            on_progress(len(waveform) / WAVEFORM_SAMPLE_RATE)
+        return TranscriptionResult(text=result["text"], segments=segments, language=result.get("language"))
+
+
+class FasterWhisperBackend(TranscriptionBackend):
+    """faster-whisper (CTranslate2) motoru; int8 nicemleme ile CPU'da çok daha hızlıdır"""
+
+    name = "faster-whisper"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        from faster_whisper import WhisperModel
+
+        self.model = WhisperModel(
+            self.model_size,
+            device="cpu",
+            compute_type=self.compute_type,
+            cpu_threads=self.threads
+        )
+
+    def transcribe(self, waveform: np.ndarray, language: str = "tr",
+                   on_progress: Optional[Callable[[float], None]] = None) -> TranscriptionResult:
+        segment_iter, info = self.model.transcribe(
+            waveform, language=language, beam_size=max(1, self.beam_size)
+        )
+        # Segmentler tembel üretilir; her segment çözüldükçe ilerleme bildirilir
+        segments = []
+        for seg in segment_iter:
+            segments.append(TranscriptSegment(start=float(seg.start), end=float(seg.end), text=seg.text.strip()))
+            if on_progress is not None:
+                on_progress(float(seg.end))
+        text = " ".join(seg.text for seg in segments)
+        return TranscriptionResult(text=text, segments=segments, language=info.language)
+
+
+TRANSCRIPTION_BACKENDS: Dict[str, Type[TranscriptionBackend]] = {
+    OpenAIWhisperBackend.name: OpenAIWhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+
+def create_transcription_backend(name: Optional[str] = None, **overrides) -> TranscriptionBackend:
+    """Ayarlara göre STT motorunu oluştur (model bu çağrıda yüklenir)"""
+    name = name or settings.STT_BACKEND
+    if name not in TRANSCRIPTION_BACKENDS:
+        raise ValueError(
+            f"Bilinmeyen STT motoru: {name}. Seçenekler: {', '.join(TRANSCRIPTION_BACKENDS)}"
+        )
+
+    options = {
+        "model_size": settings.STT_MODEL_SIZE,
+        "compute_type": settings.STT_COMPUTE_TYPE,
+        "threads": settings.STT_THREADS,
+        "beam_size": settings.STT_BEAM_SIZE,
+    }
+    options.update(overrides)
+    return TRANSCRIPTION_BACKENDS[name](**options)
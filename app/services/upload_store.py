@@ -0,0 +1,183 @@
+import hashlib
+import os
+import tempfile
+import threading
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Optional
+
+from ..core.config import settings
+
+UPLOAD_CHUNK_BYTES = 1 << 20  # 1 MB
+
+
+class UploadError(Exception):
+    """Yükleme reddedildi; status_code HTTP yanıtında kullanılır"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def validate_video_filename(filename: Optional[str]) -> str:
+    """Dosya uzantısını kontrol et ve döndür"""
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension not in settings.ALLOWED_VIDEO_EXTENSIONS:
+        raise UploadError(
+            f"Desteklenmeyen dosya türü: {extension or '-'}. "
+            f"Desteklenenler: {', '.join(settings.ALLOWED_VIDEO_EXTENSIONS)}",
+            status_code=415
+        )
+    return extension
+
+
+class StreamingUploadWriter:
+    """Gelen parçaları diske yazarken SHA-256 hesaplayan ve boyutu denetleyen yazıcı"""
+
+    def __init__(self, suffix: str, directory: Optional[str] = None,
+                 max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes if max_bytes is not None else settings.MAX_FILE_SIZE
+        self.size = 0
+        self._hasher = hashlib.sha256()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix, dir=directory)
+        self.path = self._file.name
+
+    def write(self, chunk: bytes) -> None:
+        if self.size + len(chunk) > self.max_bytes:
+            raise UploadError(
+                f"Dosya boyutu sınırı aşıldı ({self.max_bytes // (1024 * 1024)} MB)",
+                status_code=413
+            )
+        self._file.write(chunk)
+        self._hasher.update(chunk)
+        self.size += len(chunk)
+
+    @property
+    def sha256(self) -> str:
+        return self._hasher.hexdigest()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def discard(self) -> None:
+        """Yarım kalan dosyayı sil"""
+        self.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+@dataclass
+class UploadSession:
+    upload_id: str
+    filename: str
+    total_size: int
+    writer: StreamingUploadWriter
+    created_at: datetime = field(default_factory=datetime.now)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @property
+    def received(self) -> int:
+        return self.writer.size
+
+    @property
+    def is_complete(self) -> bool:
+        return self.writer.size >= self.total_size
+
+
+class ChunkedUploadManager:
+    """Parçalı ve kaldığı yerden devam ettirilebilen yüklemeler
+
+    İstemci önce oturum açar, ardından dosyayı sıralı parçalar halinde gönderir.
+    Her parça beklenen ofsetle gönderilmelidir; bağlantı koparsa istemci
+    sunucudaki mevcut ofseti sorgulayıp oradan devam eder.
+    """
+
+    def __init__(self):
+        self._sessions: Dict[str, UploadSession] = {}
+        self._lock = threading.Lock()
+
+    def create(self, filename: str, total_size: int) -> UploadSession:
+        self._purge_stale()
+        extension = validate_video_filename(filename)
+        if total_size <= 0:
+            raise UploadError("Geçersiz dosya boyutu")
+        if total_size > settings.MAX_FILE_SIZE:
+            raise UploadError(
+                f"Dosya boyutu sınırı aşıldı ({settings.MAX_FILE_SIZE // (1024 * 1024)} MB)",
+                status_code=413
+            )
+
+        session = UploadSession(
+            upload_id=uuid.uuid4().hex,
+            filename=filename,
+            total_size=total_size,
+            writer=StreamingUploadWriter(
+                extension,
+                directory=os.path.join(settings.UPLOAD_DIR, "partial"),
+                max_bytes=total_size
+            )
+        )
+        with self._lock:
+            self._sessions[session.upload_id] = session
+        return session
+
+    def get(self, upload_id: str) -> UploadSession:
+        session = self._sessions.get(upload_id)
+        if session is None:
+            raise UploadError("Yükleme oturumu bulunamadı", status_code=404)
+        return session
+
+    def _ensure_active(self, session: UploadSession) -> None:
+        """Kilit alınana kadar iptal edilen oturuma yazılmasın (session.lock içinde çağrılır)"""
+        if self._sessions.get(session.upload_id) is not session:
+            raise UploadError("Yükleme oturumu bulunamadı", status_code=404)
+
+    def write_chunk(self, upload_id: str, offset: int, chunk: bytes) -> UploadSession:
+        session = self.get(upload_id)
+        with session.lock:
+            self._ensure_active(session)
+            if offset != session.received:
+                raise UploadError(
+                    f"Beklenen ofset {session.received}, gelen {offset}",
+                    status_code=409
+                )
+            session.writer.write(chunk)
+        return session
+
+    def finish(self, upload_id: str) -> UploadSession:
+        """Tamamlanan oturumu kapat ve listeden çıkar (dosya çağırana devredilir)"""
+        session = self.get(upload_id)
+        with session.lock:
+            self._ensure_active(session)
+            if not session.is_complete:
+                raise UploadError(
+                    f"Yükleme tamamlanmadı ({session.received}/{session.total_size} bayt)",
+                    status_code=409
+                )
+            session.writer.close()
+            with self._lock:
+                self._sessions.pop(upload_id, None)
+        return session
+
+    def _purge_stale(self) -> None:
+        """Terk edilmiş oturumları ve yarım dosyalarını temizle"""
+        now = datetime.now()
+        with self._lock:
+            stale = [
+                upload_id for upload_id, session in self._sessions.items()
+                if (now - session.created_at).total_seconds() > settings.UPLOAD_SESSION_TTL_HOURS * 3600
+            ]
+        for upload_id in stale:
+            self.abort(upload_id)
+
+    def abort(self, upload_id: str) -> None:
+        with self._lock:
+            session = self._sessions.pop(upload_id, None)
+        if session is not None:
+            # Süren bir parça yazımı bitmeden dosya silinmesin
+            with session.lock:
+                session.writer.discard()
@@ -7,9 +7,33 @@ except ImportError:
     print("⚠️  MediaPipe bulunamadı. Görüntü analizi sınırlı modda çalışacak.")
 
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Any, Dict, Iterable, List, Tuple, Optional
+import json
 import math
-from dataclasses import dataclass
+import os
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from .frame_sampler import FrameSampler, AdaptiveFrameSampler, SampledFrame, SamplingDecision, get_video_properties
+from .landmark_geometry import (
+    FACE_KEYPOINTS, POSE_FACE, POSE_HANDS, POSE_SHOULDERS, landmarks_to_array, pose_to_array,
+    roi_box, crop_to_frame, estimate_gaze, face_direction, count_direction_changes, hand_movements
+)
+from .model_registry import model_registry
+from .metrics import span, timed_iter
+from .progress import StageProgress
+from ..core.config import settings
+
+# Sonuçları etkileyen algoritma değişikliklerinde artırılır (önbellek anahtarına girer)
+VISION_ANALYZER_VERSION = "4"
+
+GESTURE_MOVEMENT_THRESHOLD = 0.1  # Önemli el hareketi (normalize koordinat)
+FIDGET_MOVEMENT_THRESHOLD = 0.3  # Aşırı hareket (fidgeting)
+POSE_VISIBILITY_THRESHOLD = 0.5  # Kaskadda yüz/el bölgesinin görünür sayılması için pose görünürlüğü
+HAND_ROI_MIN_SHOULDER_RATIO = 0.6  # El kutusunun en küçük kenarı (omuz genişliğine oranla)
 
 @dataclass
 class VisionAnalysisResult:
@@ -19,115 +43,463 @@ class VisionAnalysisResult:
     fidgeting_count: int
     face_direction_changes: int
     overall_body_language_score: float
+    # Örnek başına zaman serileri (zaman çizelgesi için): time, eye_contact, hand_x, hand_y, motion
+    frame_series: Dict[str, np.ndarray] = field(default_factory=dict, compare=False)
+    # Örnekleme modu ve karar sayıları (yoklanan/analiz edilen kare, hareket/durağan örnek)
+    sampling_stats: Dict[str, Any] = field(default_factory=dict, compare=False)
 
-class VisionAnalyzer:
-    def __init__(self):
-        if MEDIAPIPE_AVAILABLE:
-            self.mp_face_mesh = mp.solutions.face_mesh
-            self.mp_pose = mp.solutions.pose
-            self.mp_hands = mp.solutions.hands
-            self.mp_drawing = mp.solutions.drawing_utils
-            
-            self.face_mesh = self.mp_face_mesh.FaceMesh(
-                max_num_faces=1, refine_landmarks=True, min_detection_confidence=0.5, min_tracking_confidence=0.5
+@dataclass
+class VisionCounters:
+    """Bir kare aralığının sayaçları; parçalar birleştirilebilir"""
+    sampled_frames: int = 0
+    face_detected_frames: int = 0
+    eye_contact_frames: int = 0
+    gesture_count: int = 0
+    fidgeting_events: int = 0
+    face_direction_changes: int = 0
+    
+    # Parça sınırlarındaki durum (yüz yönü ve el konumu bir önceki örneğe göre hesaplanır)
+    first_face_direction: Optional[float] = None
+    last_face_direction: Optional[float] = None
+    first_hand_position: Optional[Tuple[float, float]] = None
+    last_hand_position: Optional[Tuple[float, float]] = None
+    
+    # Örnek başına seriler; yüz yoksa göz teması, el yoksa el konumu NaN
+    sample_times: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.float64), compare=False)
+    eye_contact: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.float32), compare=False)
+    hand_x: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.float32), compare=False)
+    hand_y: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.float32), compare=False)
+    motion: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.float32), compare=False)
+    
+    # Örnekleyici istatistikleri ve kararları
+    sampling: Dict[str, int] = field(default_factory=dict)
+    decisions: List[SamplingDecision] = field(default_factory=list, compare=False)
+    
+    def add_hand_movement(self, movement: float) -> None:
+        if movement > GESTURE_MOVEMENT_THRESHOLD:
+            self.gesture_count += 1
+        if movement > FIDGET_MOVEMENT_THRESHOLD:
+            self.fidgeting_events += 1
+    
+    def merge(self, other: "VisionCounters") -> "VisionCounters":
+        """Bu aralığın hemen ardından gelen aralığı birleştir
+        
+        Sonuç, iki aralık tek geçişte işlenmiş gibi aynıdır: sonraki parçanın
+        ilk gözlemi bu parçanın son gözlemiyle karşılaştırılır.
+        """
+        merged = VisionCounters(
+            sampled_frames=self.sampled_frames + other.sampled_frames,
+            face_detected_frames=self.face_detected_frames + other.face_detected_frames,
+            eye_contact_frames=self.eye_contact_frames + other.eye_contact_frames,
+            gesture_count=self.gesture_count + other.gesture_count,
+            fidgeting_events=self.fidgeting_events + other.fidgeting_events,
+            face_direction_changes=self.face_direction_changes + other.face_direction_changes,
+            first_face_direction=self.first_face_direction if self.first_face_direction is not None else other.first_face_direction,
+            last_face_direction=other.last_face_direction if other.last_face_direction is not None else self.last_face_direction,
+            first_hand_position=self.first_hand_position if self.first_hand_position is not None else other.first_hand_position,
+            last_hand_position=other.last_hand_position if other.last_hand_position is not None else self.last_hand_position,
+            sample_times=np.concatenate([self.sample_times, other.sample_times]),
+            eye_contact=np.concatenate([self.eye_contact, other.eye_contact]),
+            hand_x=np.concatenate([self.hand_x, other.hand_x]),
+            hand_y=np.concatenate([self.hand_y, other.hand_y]),
+            motion=np.concatenate([self.motion, other.motion]),
+            sampling={
+                key: self.sampling.get(key, 0) + other.sampling.get(key, 0)
+                for key in {**self.sampling, **other.sampling}
+            },
+            decisions=self.decisions + other.decisions
+        )
+        
+        # Parça sınırındaki yüz yönü değişimi
+        if self.last_face_direction and other.first_face_direction is not None:
+            if abs(other.first_face_direction - self.last_face_direction) > 0.3:
+                merged.face_direction_changes += 1
+        
+        # Parça sınırındaki el hareketi
+        if self.last_hand_position and other.first_hand_position is not None:
+            movement = math.sqrt(
+                (other.first_hand_position[0] - self.last_hand_position[0])**2 +
+                (other.first_hand_position[1] - self.last_hand_position[1])**2
             )
-            self.pose = self.mp_pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5)
-            self.hands = self.mp_hands.Hands(min_detection_confidence=0.5, min_tracking_confidence=0.5)
-        else:
-            self.face_mesh = None
-            self.pose = None
-            self.hands = None
-
-    def analyze_video(self, video_path: str) -> VisionAnalysisResult:
-        """Ana video analiz fonksiyonu"""
+            merged.add_hand_movement(movement)
+        
+        return merged
+
+class VisionModelPool:
+    """MediaPipe grafik setleri havuzu
+    
+    Grafikler takip (tracking) durumu tuttuğu için aynı anda tek bir video
+    tarafından kullanılabilir. Havuz, boşta bir set varsa onu verir, yoksa yeni
+    set oluşturur; iade edilen setler sıfırlanıp yeniden kullanılır.
+    
+    Kaskad modunda yüz ve el modelleri her örnekte farklı bir kırpılmış bölge
+    görür; takip anlamsız olduğundan tek görüntü modunda çalışırlar. Kaskad
+    kapalıyken pose kullanılmadığı için hiç yüklenmez.
+    """
+    
+    def __init__(self):
+        self._free = []
+        self._lock = threading.Lock()
+        # İlk set ısıtma sırasında oluşturulur (model dosyaları belleğe alınır)
+        self._free.append(self._create_models())
+    
+    def _create_models(self):
+        cascade = settings.VISION_CASCADE_ENABLED
+        face_mesh = mp.solutions.face_mesh.FaceMesh(
+            static_image_mode=cascade, max_num_faces=1, refine_landmarks=True,
+            min_detection_confidence=0.5, min_tracking_confidence=0.5
+        )
+        pose = mp.solutions.pose.Pose(
+            model_complexity=0, min_detection_confidence=0.5, min_tracking_confidence=0.5
+        ) if cascade else None
+        hands = mp.solutions.hands.Hands(
+            static_image_mode=cascade, min_detection_confidence=0.5, min_tracking_confidence=0.5
+        )
+        return face_mesh, pose, hands
+    
+    @contextmanager
+    def acquire(self):
+        """Bir grafik seti ödünç al: (face_mesh, pose, hands)"""
+        with self._lock:
+            models = self._free.pop() if self._free else None
+        if models is None:
+            models = self._create_models()
+        try:
+            yield models
+        finally:
+            # Önceki videonun takip durumunu temizle
+            for model in models:
+                if model is not None:
+                    model.reset()
+            with self._lock:
+                self._free.append(models)
+
+if MEDIAPIPE_AVAILABLE:
+    model_registry.register("vision", VisionModelPool)
+
+# Modeller VisionAnalyzer oluşturulurken değil, ilk analizde kayıt defterinden alınır
+class VisionAnalyzer:
+    def analyze_video(self, video_path: str, progress: Optional[StageProgress] = None) -> VisionAnalysisResult:
+        """Ana video analiz fonksiyonu
+        
+        progress verilirse işlenen kare konumu / toplam kare bildirilir
+        (paralel modda parça tamamlandıkça).
+        """
         if not MEDIAPIPE_AVAILABLE:
             return self._create_fallback_result()
-            
+        
         try:
-            cap = cv2.VideoCapture(video_path)
+            chunks = self._plan_chunks(video_path)
+            if len(chunks) > 1:
+                counters = self._analyze_chunks_parallel(video_path, chunks, progress)
+            else:
+                counters = self.analyze_frame_range(
+                    video_path, budget=settings.VISION_MAX_ANALYZED_FRAMES, progress=progress
+                )
+            self._log_sampling(video_path, counters)
+            return self._summarize(counters)
             
-            # Video özelliklerini al
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            
-            # Analiz değişkenleri
-            face_detected_frames = 0
-            eye_contact_frames = 0
-            gesture_count = 0
-            fidgeting_events = 0
-            face_direction_changes = 0
-            
-            previous_face_direction = None
-            previous_hand_position = None
-            
-            frame_count = 0
-            while cap.read()[0]:
-                frame_count += 1
-                if frame_count % 30 != 0:  # Her 30. frame'i işle
-                    continue
-                
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                
-                # Frame'i RGB'ye çevir
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                
-                # Yüz analizi
-                face_results = self.face_mesh.process(rgb_frame)
-                pose_results = self.pose.process(rgb_frame)
-                hand_results = self.hands.process(rgb_frame)
-                
-                if face_results.multi_face_landmarks:
-                    face_detected_frames += 1
-                    
-                    # Göz teması kontrolü
-                    if self._check_eye_contact(face_results.multi_face_landmarks[0]):
-                        eye_contact_frames += 1
-                    
-                    # Yüz yönü değişimi
-                    current_direction = self._get_face_direction(face_results.multi_face_landmarks[0])
-                    if previous_face_direction and abs(current_direction - previous_face_direction) > 0.3:
-                        face_direction_changes += 1
-                    previous_face_direction = current_direction
+        except Exception as e:
+            print(f"Vision analizi hatası: {e}")
+            return self._create_fallback_result()
+    
+    def analyze_frame_range(self, video_path: str, start_frame: int = 0,
+                            end_frame: Optional[int] = None,
+                            budget: Optional[int] = None,
+                            progress: Optional[StageProgress] = None) -> "VisionCounters":
+        """Verilen kare aralığını analiz et ve sayaçları döndür
+        
+        Karede yalnızca model çalıştırılır ve gereken landmark'lar diziye
+        çevrilir; geometrik özellikler aralığın sonunda toplu hesaplanır.
+        budget uyarlamalı modda bu aralıkta analiz edilecek en fazla karedir.
+        """
+        sampler = self._create_sampler(video_path, start_frame, end_frame, budget)
+        frames = sampler
+        if progress is not None:
+            if end_frame is None:
+                _, end_frame = get_video_properties(video_path)
+            frames = _track_progress(sampler, progress, start_frame, end_frame)
+        counters = self.analyze_frames(frames)
+        counters.sampling = {**sampler.stats, **counters.sampling}
+        counters.decisions = sampler.decisions
+        return counters
+    
+    def analyze_frames(self, frames: Iterable[SampledFrame]) -> "VisionCounters":
+        """Örneklenmiş kareleri analiz et (dosya, akış penceresi vb. herhangi bir kaynaktan)"""
+        sample_times: List[float] = []
+        motions: List[float] = []
+        face_points: List[Optional[np.ndarray]] = []
+        hand_points: List[Optional[np.ndarray]] = []
+        model_calls = {"pose_calls": 0, "face_mesh_calls": 0, "hands_calls": 0}
+        
+        with model_registry.get("vision").acquire() as models:
+            # Kare çözme (decode + örnekleme) süresi sonraki kareyi beklerken ölçülür
+            for sampled in timed_iter(frames, "vision.decode"):
+                if settings.VISION_CASCADE_ENABLED:
+                    face, hand = self._process_frame_cascade(sampled.image, models, model_calls)
+                else:
+                    face, hand = self._process_frame(sampled.image, models, model_calls)
                 
-                # El hareketi analizi
+                sample_times.append(sampled.timestamp)
+                motions.append(sampled.motion)
+                face_points.append(face)
+                hand_points.append(hand)
+        
+        with span("vision.features"):
+            counters = self._count_samples(sample_times, face_points, hand_points)
+        counters.motion = np.asarray(motions, dtype=np.float32)
+        counters.sampling = model_calls
+        return counters
+    
+    def _process_frame(self, image: np.ndarray, models, model_calls: Dict[str, int]):
+        """Yüz ve el modellerini tam çözünürlüklü karede çalıştır (pose kullanılmaz)"""
+        face_mesh, _, hands = models
+        rgb_frame = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        
+        with span("vision.face_mesh", aggregate=True):
+            face_results = face_mesh.process(rgb_frame)
+        with span("vision.hands", aggregate=True):
+            hand_results = hands.process(rgb_frame)
+        model_calls["face_mesh_calls"] += 1
+        model_calls["hands_calls"] += 1
+        
+        face = (
+            landmarks_to_array(face_results.multi_face_landmarks[0], FACE_KEYPOINTS)
+            if face_results.multi_face_landmarks else None
+        )
+        hand = (
+            landmarks_to_array(hand_results.multi_hand_landmarks[0])
+            if hand_results.multi_hand_landmarks else None
+        )
+        return face, hand
+    
+    def _process_frame_cascade(self, image: np.ndarray, models, model_calls: Dict[str, int]):
+        """Kaskad: kişiyi pose ile bul, yüz ve elleri yalnızca görünürlerse kırpılmış bölgede ara
+        
+        Pose küçültülmüş karede çalışır; yüz ve el modelleri tam çözünürlüklü
+        karenin kırpıntısını görür (küçük yüzlerde iris doğruluğu korunur).
+        Pose kişi bulamazsa yüz modeli küçültülmüş tam karede denenir.
+        """
+        face_mesh, pose, hands = models
+        height, width = image.shape[:2]
+        small = cv2.cvtColor(_downscale(image, settings.VISION_DOWNSCALE_WIDTH), cv2.COLOR_BGR2RGB)
+        
+        with span("vision.pose", aggregate=True):
+            pose_results = pose.process(small)
+        model_calls["pose_calls"] += 1
+        if not pose_results.pose_landmarks:
+            with span("vision.face_mesh", aggregate=True):
+                face_results = face_mesh.process(small)
+            model_calls["face_mesh_calls"] += 1
+            face = (
+                landmarks_to_array(face_results.multi_face_landmarks[0], FACE_KEYPOINTS)
+                if face_results.multi_face_landmarks else None
+            )
+            return face, None
+        
+        body = pose_to_array(pose_results.pose_landmarks)
+        visible = body[:, 3] >= POSE_VISIBILITY_THRESHOLD
+        margin = settings.VISION_ROI_MARGIN
+        
+        face = None
+        face_indices = [i for i in POSE_FACE if visible[i]]
+        face_box = roi_box(body[face_indices, :2], width, height, margin) if len(face_indices) >= 3 else None
+        if face_box is not None:
+            with span("vision.face_mesh", aggregate=True):
+                face_results = face_mesh.process(_crop_rgb(image, face_box))
+            model_calls["face_mesh_calls"] += 1
+            if face_results.multi_face_landmarks:
+                face = crop_to_frame(
+                    landmarks_to_array(face_results.multi_face_landmarks[0], FACE_KEYPOINTS),
+                    face_box, width, height
+                )
+        
+        hand = None
+        hand_indices = [i for i in POSE_HANDS if visible[i]]
+        if hand_indices:
+            shoulders = body[POSE_SHOULDERS, :2]
+            shoulder_width = float(np.hypot(*(shoulders[0] - shoulders[1]) * (width, height))) / width
+            hand_box = roi_box(
+                body[hand_indices, :2], width, height, margin,
+                min_side=shoulder_width * HAND_ROI_MIN_SHOULDER_RATIO
+            )
+            if hand_box is not None:
+                with span("vision.hands", aggregate=True):
+                    hand_results = hands.process(_crop_rgb(image, hand_box))
+                model_calls["hands_calls"] += 1
                 if hand_results.multi_hand_landmarks:
-                    current_hand_pos = self._get_hand_center(hand_results.multi_hand_landmarks[0])
-                    if previous_hand_position:
-                        movement = self._calculate_distance(current_hand_pos, previous_hand_position)
-                        if movement > 0.1:  # Önemli hareket
-                            gesture_count += 1
-                        if movement > 0.3:  # Aşırı hareket (fidgeting)
-                            fidgeting_events += 1
-                    previous_hand_position = current_hand_pos
-            
-            cap.release()
-            
-            # Sonuçları hesapla
-            eye_contact_percentage = (eye_contact_frames / max(face_detected_frames, 1)) * 100
-            posture_score = min(85, max(20, 80 - (fidgeting_events * 5)))
-            gesture_activity = min(gesture_count / max(frame_count / 30, 1) * 100, 100)
-            
-            # Genel beden dili skoru
-            overall_score = (
-                eye_contact_percentage * 0.4 +
-                posture_score * 0.3 +
-                min(gesture_activity, 70) * 0.3
+                    hand = crop_to_frame(
+                        landmarks_to_array(hand_results.multi_hand_landmarks[0]), hand_box, width, height
+                    )
+        
+        return face, hand
+    
+    def _create_sampler(self, video_path: str, start_frame: int, end_frame: Optional[int],
+                        budget: Optional[int]):
+        """VISION_SAMPLING_MODE ayarına göre kare örnekleyici"""
+        if settings.VISION_SAMPLING_MODE == "adaptive":
+            return AdaptiveFrameSampler(
+                video_path,
+                probe_rate=settings.VISION_MOTION_PROBE_RATE,
+                max_interval=settings.VISION_ADAPTIVE_MAX_INTERVAL,
+                motion_threshold=settings.VISION_MOTION_THRESHOLD,
+                budget=budget,
+                start_frame=start_frame,
+                end_frame=end_frame
             )
-            
-            return VisionAnalysisResult(
-                eye_contact_percentage=eye_contact_percentage,
-                posture_score=posture_score,
-                gesture_activity=gesture_activity,
-                fidgeting_count=fidgeting_events,
-                face_direction_changes=face_direction_changes,
-                overall_body_language_score=overall_score
+        # Yalnızca her FRAME_SAMPLE_RATE. kare decode edilir
+        return FrameSampler(video_path, settings.FRAME_SAMPLE_RATE, start_frame, end_frame)
+    
+    def _log_sampling(self, video_path: str, counters: "VisionCounters") -> None:
+        """Örnekleme özetini yazdır; istenirse kararları JSONL olarak kaydet"""
+        stats = counters.sampling
+        print(
+            f"Kare örnekleme ({settings.VISION_SAMPLING_MODE}): {stats.get('analyzed', 0)} kare analiz edildi, "
+            f"{stats.get('probed', 0)} kare yoklandı"
+            + (
+                f" (hareket: {stats.get('motion', 0)}, durağan: {stats.get('static', 0)}, "
+                f"bütçe nedeniyle atlanan: {stats.get('budget_skip', 0)})"
+                if settings.VISION_SAMPLING_MODE == "adaptive" else ""
             )
-            
-        except Exception as e:
-            print(f"Vision analizi hatası: {e}")
-            return self._create_fallback_result()
+        )
+        
+        if not settings.VISION_SAMPLING_LOG_DIR:
+            return
+        try:
+            os.makedirs(settings.VISION_SAMPLING_LOG_DIR, exist_ok=True)
+            name = os.path.splitext(os.path.basename(video_path))[0]
+            log_path = os.path.join(settings.VISION_SAMPLING_LOG_DIR, f"{name}.sampling.jsonl")
+            with open(log_path, "w", encoding="utf-8") as log_file:
+                log_file.write(json.dumps({"mode": settings.VISION_SAMPLING_MODE, **stats}) + "\n")
+                for decision in counters.decisions:
+                    log_file.write(json.dumps({
+                        "frame": decision.frame_index, "motion": decision.motion, "reason": decision.reason
+                    }) + "\n")
+        except OSError as e:
+            print(f"Örnekleme günlüğü yazılamadı: {e}")
+    
+    def _count_samples(self, sample_times: List[float], face_points: List[Optional[np.ndarray]],
+                       hand_points: List[Optional[np.ndarray]]) -> "VisionCounters":
+        """Örneklenen karelerin landmark dizilerinden sayaçları toplu hesapla"""
+        counters = VisionCounters(sampled_frames=len(sample_times))
+        sample_count = len(sample_times)
+        counters.sample_times = np.asarray(sample_times, dtype=np.float64)
+        
+        # Yüz: bakış (iris + baş pozu) ve yüz yönü değişimleri
+        has_face = np.array([points is not None for points in face_points], dtype=bool)
+        faces = (
+            np.stack([points for points in face_points if points is not None])
+            if has_face.any() else np.zeros((0, len(FACE_KEYPOINTS), 3), dtype=np.float32)
+        )
+        _, _, eye_contact = estimate_gaze(faces)
+        directions = face_direction(faces)
+        
+        counters.face_detected_frames = int(has_face.sum())
+        counters.eye_contact_frames = int(eye_contact.sum())
+        counters.face_direction_changes = count_direction_changes(directions)
+        if len(directions):
+            counters.first_face_direction = float(directions[0])
+            counters.last_face_direction = float(directions[-1])
+        
+        counters.eye_contact = np.full(sample_count, np.nan, dtype=np.float32)
+        counters.eye_contact[has_face] = eye_contact
+        
+        # El: merkezler ve ardışık merkezler arası hareket
+        has_hand = np.array([points is not None for points in hand_points], dtype=bool)
+        centers = (
+            np.stack([points for points in hand_points if points is not None])[:, :, :2].mean(axis=1)
+            if has_hand.any() else np.zeros((0, 2), dtype=np.float32)
+        )
+        movements = hand_movements(centers)
+        
+        counters.gesture_count = int(np.sum(movements > GESTURE_MOVEMENT_THRESHOLD))
+        counters.fidgeting_events = int(np.sum(movements > FIDGET_MOVEMENT_THRESHOLD))
+        if len(centers):
+            counters.first_hand_position = (float(centers[0, 0]), float(centers[0, 1]))
+            counters.last_hand_position = (float(centers[-1, 0]), float(centers[-1, 1]))
+        
+        counters.hand_x = np.full(sample_count, np.nan, dtype=np.float32)
+        counters.hand_y = np.full(sample_count, np.nan, dtype=np.float32)
+        counters.hand_x[has_hand] = centers[:, 0]
+        counters.hand_y[has_hand] = centers[:, 1]
+        
+        return counters
+    
+    def _plan_chunks(self, video_path: str) -> List[Tuple[int, int]]:
+        """Paralel mod açıksa videoyu kare aralıklarına böl"""
+        workers = settings.VISION_PARALLEL_WORKERS
+        if workers <= 1:
+            return [(0, None)]
+        
+        fps, total_frames = get_video_properties(video_path)
+        if fps <= 0 or total_frames <= 0:
+            return [(0, None)]
+        
+        # İş dengesi için işçi başına iki parça, ama çok kısa parçalar oluşturma
+        min_chunk_frames = max(1, int(settings.VISION_MIN_CHUNK_SECONDS * fps))
+        chunk_count = min(workers * 2, max(1, total_frames // min_chunk_frames))
+        if chunk_count <= 1:
+            return [(0, None)]
+        
+        bounds = np.linspace(0, total_frames, chunk_count + 1).astype(int)
+        return [(int(bounds[i]), int(bounds[i + 1])) for i in range(chunk_count)]
+    
+    def _analyze_chunks_parallel(self, video_path: str, chunks: List[Tuple[int, int]],
+                                 progress: Optional[StageProgress] = None) -> "VisionCounters":
+        """Parçaları ayrı süreçlerde analiz et ve sırayla birleştir"""
+        pool = _get_process_pool(settings.VISION_PARALLEL_WORKERS)
+        # Analiz bütçesi parçalara uzunluklarıyla orantılı dağıtılır
+        total_frames = chunks[-1][1] - chunks[0][0]
+        budget = settings.VISION_MAX_ANALYZED_FRAMES
+        futures = [
+            pool.submit(
+                _analyze_chunk_worker, video_path, start, end,
+                max(1, budget * (end - start) // total_frames) if budget > 0 else None
+            )
+            for start, end in chunks
+        ]
+        if progress is not None:
+            lengths = {future: end - start for future, (start, end) in zip(futures, chunks)}
+            done = 0
+            for future in as_completed(futures):
+                done += lengths[future]
+                progress.update(done, total_frames, "frames")
+        
+        # Sonuçlar parça sırasıyla birleştirilir; sınır durumları deterministiktir
+        counters = VisionCounters()
+        for future in futures:
+            counters = counters.merge(future.result())
+        return counters
+    
+    def _summarize(self, counters: "VisionCounters") -> VisionAnalysisResult:
+        """Sayaçlardan sonuç skorlarını hesapla"""
+        eye_contact_percentage = (counters.eye_contact_frames / max(counters.face_detected_frames, 1)) * 100
+        posture_score = min(85, max(20, 80 - (counters.fidgeting_events * 5)))
+        gesture_activity = min(counters.gesture_count / max(counters.sampled_frames, 1) * 100, 100)
+        
+        # Genel beden dili skoru
+        overall_score = (
+            eye_contact_percentage * 0.4 +
+            posture_score * 0.3 +
+            min(gesture_activity, 70) * 0.3
+        )
+        
+        return VisionAnalysisResult(
+            eye_contact_percentage=eye_contact_percentage,
+            posture_score=posture_score,
+            gesture_activity=gesture_activity,
+            fidgeting_count=counters.fidgeting_events,
+            face_direction_changes=counters.face_direction_changes,
+            overall_body_language_score=overall_score,
+            frame_series={
+                "time": counters.sample_times,
+                "eye_contact": counters.eye_contact,
+                "hand_x": counters.hand_x,
+                "hand_y": counters.hand_y,
+                "motion": counters.motion
+            },
+            sampling_stats={"mode": settings.VISION_SAMPLING_MODE, **counters.sampling}
+        )
 
     def _create_fallback_result(self) -> VisionAnalysisResult:
         """MediaPipe yokken kullanılacak varsayılan sonuç"""
@@ -140,46 +512,83 @@ class VisionAnalyzer:
             overall_body_language_score=68.0
         )
 
-    def _check_eye_contact(self, face_landmarks) -> bool:
-        """Göz teması kontrolü - basitleştirilmiş versiyon"""
-        try:
-            # Sol ve sağ göz landmark'larını al
-            left_eye_landmarks = [33, 7, 163, 144, 145, 153, 154, 155, 133, 173, 157, 158, 159, 160, 161, 246]
-            right_eye_landmarks = [362, 382, 381, 380, 374, 373, 390, 249, 263, 466, 388, 387, 386, 385, 384, 398]
-            
-            # Göz pozisyonlarını hesapla
-            left_eye_points = [face_landmarks.landmark[i] for i in left_eye_landmarks]
-            right_eye_points = [face_landmarks.landmark[i] for i in right_eye_landmarks]
-            
-            # Basit göz teması kontrolü (gözlerin kameraya bakıp bakmadığını kontrol et)
-            return True  # Şimdilik her zaman True döndür
-        except:
-            return False
 
-    def _get_face_direction(self, face_landmarks) -> float:
-        """Yüz yönünü hesapla"""
-        try:
-            # Burun ucu ve çene kullanarak yüz yönünü hesapla
-            nose_tip = face_landmarks.landmark[1]
-            chin = face_landmarks.landmark[18]
-            
-            return abs(nose_tip.x - chin.x)
-        except:
-            return 0.0
+def _track_progress(frames: Iterable[SampledFrame], progress: StageProgress,
+                    start_frame: int, end_frame: int) -> Iterable[SampledFrame]:
+    """Kareleri aynen geçir; her analiz edilen karede konum / toplam kareyi bildir"""
+    total = max(end_frame - start_frame, 0) or None
+    analyzed = 0
+    for sampled in frames:
+        yield sampled
+        analyzed += 1
+        progress.update(sampled.frame_index - start_frame + 1, total, "frames",
+                        f"{analyzed} kare analiz edildi")
+    if total is not None:
+        progress.update(total, total, "frames", f"{analyzed} kare analiz edildi")
 
-    def _get_hand_center(self, hand_landmarks) -> Tuple[float, float]:
-        """El merkezini hesapla"""
-        try:
-            x_coords = [landmark.x for landmark in hand_landmarks.landmark]
-            y_coords = [landmark.y for landmark in hand_landmarks.landmark]
-            
-            center_x = sum(x_coords) / len(x_coords)
-            center_y = sum(y_coords) / len(y_coords)
-            
-            return (center_x, center_y)
-        except:
-            return (0.0, 0.0)
 
-    def _calculate_distance(self, pos1: Tuple[float, float], pos2: Tuple[float, float]) -> float:
-        """İki nokta arasındaki mesafeyi hesapla"""
-        return math.sqrt((pos1[0] - pos2[0])**2 + (pos1[1] - pos2[1])**2) 
\ No newline at end of file
+def _downscale(image: np.ndarray, max_width: int) -> np.ndarray:
+    """Kareyi en-boy oranını koruyarak max_width genişliğe küçült (büyütmez)"""
+    height, width = image.shape[:2]
+    if max_width <= 0 or width <= max_width:
+        return image
+    return cv2.resize(image, (max_width, round(height * max_width / width)), interpolation=cv2.INTER_AREA)
+
+
+def _crop_rgb(image: np.ndarray, box: tuple) -> np.ndarray:
+    """BGR karenin kutu bölgesini RGB olarak döndür (yalnızca kırpıntı dönüştürülür)"""
+    x0, y0, x1, y1 = box
+    return cv2.cvtColor(image[y0:y1, x0:x1], cv2.COLOR_BGR2RGB)
+
+
+# Paralel mod için süreç havuzu (ilk kullanımda oluşturulur, süreç boyunca paylaşılır)
+_process_pool: Optional[ProcessPoolExecutor] = None
+# Havuzun oluşturulduğu işçi sayısı ve ayarlar; değişince havuz yeniden oluşturulur
+_process_pool_config: Optional[Tuple[int, Dict[str, Any]]] = None
+_process_pool_lock = threading.Lock()
+_worker_analyzer: Optional[VisionAnalyzer] = None
+
+def _init_chunk_worker(settings_snapshot: Dict[str, Any]) -> None:
+    """İşçi süreçte üst sürecin ayarlarını uygula
+
+    spawn ile başlayan süreç ayarları ortamdan yeniden okur; üst süreçte
+    çalışırken değiştirilen ayarlar (örnekleme modu, kaskad, bütçe) aksi
+    halde kaybolur ve sonuç, önbellek anahtarıyla uyuşmaz.
+    """
+    for name, value in settings_snapshot.items():
+        setattr(settings, name, value)
+
+def _get_process_pool(workers: int) -> ProcessPoolExecutor:
+    global _process_pool, _process_pool_config
+    config = (workers, settings.model_dump())
+    with _process_pool_lock:
+        if _process_pool is not None and _process_pool_config != config:
+            # Çalışan parçalar tamamlanır; yeni işler yeni havuza gider
+            _process_pool.shutdown(wait=False)
+            _process_pool = None
+        if _process_pool is None:
+            # MediaPipe ve iş parçacıklı üst süreçle fork güvenli değil; spawn kullan
+            _process_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_chunk_worker,
+                initargs=(config[1],)
+            )
+            _process_pool_config = config
+        return _process_pool
+
+def shutdown_vision_pool() -> None:
+    """Paralel mod süreç havuzunu kapat"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+
+def _analyze_chunk_worker(video_path: str, start_frame: int, end_frame: int,
+                          budget: Optional[int] = None) -> VisionCounters:
+    """İşçi süreçte bir parçayı kendi MediaPipe modelleriyle analiz et"""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = VisionAnalyzer()
+    return _worker_analyzer.analyze_frame_range(video_path, start_frame, end_frame, budget)
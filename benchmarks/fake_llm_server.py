@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+EduView - Sahte LLM Sunucusu
+
+İçerik analizinin Gemini'ye bağlanmadan çalıştırılması için basit bir JSON
+sunucusu. İsteme göre ayrıştırıcıların beklediği biçimde sabit yanıt üretir;
+--latency ile gerçek bir model gidiş-dönüşü taklit edilebilir.
+
+Kullanım:
+    python -m benchmarks.fake_llm_server --port 8765 --latency 1.5
+
+    LLM_BACKEND=http LLM_ENDPOINT_URL=http://127.0.0.1:8765/generate python run.py
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def fake_response(prompt: str) -> str:
+    """İstemdeki beklenen yanıt biçimine uygun, kararlı bir yanıt döndür"""
+    if "BÜTÜNLÜK SKORU" in prompt:
+        return "BÜTÜNLÜK SKORU: 82\nEKSİK KONULAR: örnek uygulama, konu özeti"
+    if "AKIŞ SKORU" in prompt:
+        return "AKIŞ SKORU: 78"
+    if "YAPI SKORU" in prompt:
+        return "YAPI SKORU: 74"
+    return (
+        "- Derse hedefleri açıklayarak başlayın\n"
+        "- Her kavramdan sonra kısa bir örnek verin\n"
+        "- Bölüm sonlarında özet yapın"
+    )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    latency = 0.0
+    request_count = 0
+    active = 0
+    max_active = 0
+    _lock = threading.Lock()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self.send_error(400, "Geçersiz JSON")
+            return
+
+        cls = type(self)
+        with cls._lock:
+            cls.request_count += 1
+            cls.active += 1
+            cls.max_active = max(cls.max_active, cls.active)
+        try:
+            time.sleep(cls.latency)
+            body = json.dumps({"text": fake_response(payload.get("prompt", ""))}).encode("utf-8")
+        finally:
+            with cls._lock:
+                cls.active -= 1
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host: str = "127.0.0.1", port: int = 8765, latency: float = 0.0) -> ThreadingHTTPServer:
+    """Sunucuyu arka plan iş parçacığında başlat ve döndür (testler için)"""
+    handler = type("FakeLLMHandler", (_Handler,), {"latency": latency, "_lock": threading.Lock()})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sahte LLM sunucusu")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Her yanıttan önceki bekleme (s)")
+    args = parser.parse_args()
+
+    server = serve(args.host, args.port, args.latency)
+    print(f"🤖 Sahte LLM sunucusu: http://{args.host}:{args.port}/generate (gecikme {args.latency}s)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        handler = server.RequestHandlerClass
+        print(f"\n📊 {handler.request_count} istek, en fazla {handler.max_active} eşzamanlı")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+EduView - Uçtan Uca Analiz Kıyaslaması
+
+Sentetik ders videoları (benchmarks/synthetic_media.py) üzerinde görüntü,
+ses, içerik (sahte LLM sunucusuyla) ve PDF rapor aşamalarını farklı süre ve
+çözünürlüklerde çalıştırır. Her aşama için duvar saati süresi, CPU süresi,
+en yüksek bellek (RSS) ve iş hacmi (görüntü için kare/s, ses için RTF)
+kaydedilir. Sonuçlar JSON olarak yazılır ve önceki bir çalıştırmayla
+karşılaştırılabilir; tolerans aşılırsa çıkış kodu 1 olur.
+
+Modeller ölçümden önce bir kez yüklenir (yükleme süreleri ayrıca raporlanır).
+CPU süresi bu süreçte harcanan süredir; VISION_PARALLEL_WORKERS > 1 ile
+açılan alt süreçler sayılmaz.
+
+Kullanım:
+    python -m benchmarks.pipeline_benchmark --durations 30 120 \
+        --resolutions 640x360 1280x720 --output bench.json
+
+    python -m benchmarks.pipeline_benchmark --baseline bench.json --tolerance 0.15
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.config import settings
+from app.services.model_registry import model_registry, current_rss_mb
+from benchmarks.fake_llm_server import serve
+from benchmarks.synthetic_media import FPS, SyntheticMedia, generate_video, parse_resolution
+
+STAGES = ["vision", "audio", "content", "report"]
+STAGE_MODELS = {"vision": "vision", "audio": "stt"}
+
+# Karşılaştırılan maliyet metrikleri ve göz ardı edilen mutlak fark (gürültü)
+COMPARED_METRICS = {"wall_seconds": 0.05, "cpu_seconds": 0.05, "peak_rss_mb": 20.0}
+
+RSS_SAMPLE_INTERVAL = 0.05
+
+
+class StageMeter:
+    """Bir kod bloğunun duvar saati, CPU süresi ve en yüksek RSS değeri
+
+    RSS arka plandaki bir iş parçacığında RSS_SAMPLE_INTERVAL aralıklarla
+    örneklenir; çok kısa tepe noktaları kaçabilir.
+    """
+
+    def __enter__(self) -> "StageMeter":
+        self.rss_start = current_rss_mb()
+        self.peak_rss = self.rss_start
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._sampler.start()
+        self._cpu_start = time.process_time()
+        self._wall_start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.wall_seconds = time.perf_counter() - self._wall_start
+        self.cpu_seconds = time.process_time() - self._cpu_start
+        self._stop.set()
+        self._sampler.join()
+        self.peak_rss = max(self.peak_rss, current_rss_mb())
+
+    def _sample(self) -> None:
+        while not self._stop.wait(RSS_SAMPLE_INTERVAL):
+            self.peak_rss = max(self.peak_rss, current_rss_mb())
+
+
+def measure(func: Callable, repeat: int) -> Tuple[object, Dict[str, float]]:
+    """func'u repeat kez çalıştır; süreler medyan, bellek en yüksek değer"""
+    walls, cpus, peaks, deltas = [], [], [], []
+    result = None
+    for _ in range(repeat):
+        with StageMeter() as meter:
+            result = func()
+        walls.append(meter.wall_seconds)
+        cpus.append(meter.cpu_seconds)
+        peaks.append(meter.peak_rss)
+        deltas.append(meter.peak_rss - meter.rss_start)
+    return result, {
+        "wall_seconds": round(statistics.median(walls), 3),
+        "cpu_seconds": round(statistics.median(cpus), 3),
+        "peak_rss_mb": round(max(peaks), 1),
+        "rss_delta_mb": round(max(deltas), 1),
+    }
+
+
+def configure(args) -> object:
+    """Ayarları kıyaslama için sabitle ve sahte LLM sunucusunu başlat"""
+    settings.RESULT_CACHE_ENABLED = False
+    settings.LLM_CACHE_ENABLED = False
+    settings.VISION_PARALLEL_WORKERS = args.vision_workers
+    if args.sampling_mode:
+        settings.VISION_SAMPLING_MODE = args.sampling_mode
+
+    server = None
+    if args.content_engine == "llm":
+        server = serve(port=0, latency=args.llm_latency)
+        host, port = server.server_address[:2]
+        settings.LLM_BACKEND = "http"
+        settings.LLM_ENDPOINT_URL = f"http://{host}:{port}/generate"
+    settings.CONTENT_ENGINE = args.content_engine
+    return server
+
+
+def environment_info() -> Dict:
+    """Karşılaştırmada farklılık uyarısı için ortam bilgisi"""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": {
+            key: getattr(settings, key) for key in (
+                "FRAME_SAMPLE_RATE", "VISION_SAMPLING_MODE", "VISION_PARALLEL_WORKERS",
+                "VISION_CASCADE_ENABLED", "VISION_DOWNSCALE_WIDTH",
+                "STT_BACKEND", "STT_MODEL_SIZE", "STT_COMPUTE_TYPE", "STT_THREADS", "STT_BEAM_SIZE",
+                "CONTENT_ENGINE", "LLM_BACKEND",
+            )
+        },
+    }
+
+
+def load_models(stages: List[str]) -> Dict:
+    """Aşamaların modellerini ölçüm dışında yükle ve yükleme bilgilerini döndür"""
+    names = [STAGE_MODELS[stage] for stage in stages if stage in STAGE_MODELS]
+    if not names:
+        return {}
+    print(f"🚀 Modeller yükleniyor: {', '.join(names)}")
+    return {name: info for name, info in model_registry.warm_up(names).items() if name in names}
+
+
+def run_case(orchestrator, video_path: Path, media: SyntheticMedia, stages: List[str],
+             repeat: int, server) -> Dict[str, Dict]:
+    """Tek bir video üzerinde seçili aşamaları ölç"""
+    from app.services.analysis_orchestrator import OverallAnalysisResult
+    from app.services.report_generator import ReportGenerator
+
+    results: Dict[str, Dict] = {}
+    vision = orchestrator.vision_analyzer._create_fallback_result()
+    audio = orchestrator.audio_analyzer._create_fallback_result()
+    content = None
+
+    if "vision" in stages:
+        vision, metrics = measure(lambda: orchestrator.vision_analyzer.analyze_video(str(video_path)), repeat)
+        frames = int(media.duration * FPS)
+        metrics.update(
+            frames=frames,
+            fps=round(frames / metrics["wall_seconds"], 1) if metrics["wall_seconds"] > 0 else None,
+            rtf=round(metrics["wall_seconds"] / media.duration, 4),
+            sampling=vision.sampling_stats,
+        )
+        results["vision"] = metrics
+
+    if "audio" in stages:
+        audio, metrics = measure(lambda: orchestrator.audio_analyzer.analyze_audio(str(video_path)), repeat)
+        metrics.update(
+            audio_seconds=media.duration,
+            rtf=round(metrics["wall_seconds"] / media.duration, 4),
+        )
+        results["audio"] = metrics
+
+    if "content" in stages:
+        # STT çıktısı sentetik seste anlamsızdır; sesle zamanlanmış transkript kullanılır
+        requests_before = server.RequestHandlerClass.request_count if server else 0
+        content, metrics = measure(lambda: asyncio.run(orchestrator.content_analyzer.analyze_content_async(
+            media.transcript, "Türev", media.segments
+        )), repeat)
+        words = len(media.transcript.split())
+        metrics.update(
+            engine=orchestrator.content_analyzer.engine_name,
+            words=words,
+            words_per_second=round(words / metrics["wall_seconds"], 1) if metrics["wall_seconds"] > 0 else None,
+        )
+        if server:
+            metrics["llm_calls"] = (server.RequestHandlerClass.request_count - requests_before) // repeat
+        results["content"] = metrics
+
+    if "report" in stages:
+        scores = orchestrator._calculate_overall_scores(vision, audio, content)
+        recommendations = asyncio.run(orchestrator._generate_recommendations(vision, audio, content))
+        overall = OverallAnalysisResult(
+            vision_analysis=vision,
+            audio_analysis=audio,
+            content_analysis=content,
+            body_language_score=scores["body_language"],
+            voice_score=scores["voice"],
+            content_flow_score=scores["content_flow"],
+            interaction_score=scores["interaction"],
+            total_score=scores["total"],
+            video_duration=media.duration,
+            analysis_timestamp=datetime.now(),
+            recommendations=recommendations,
+        )
+        overall.timeline = orchestrator._build_timeline(vision, audio, content, media.duration)
+        generator = ReportGenerator()
+        pdf, metrics = measure(lambda: generator.generate_report(overall), repeat)
+        metrics["pdf_bytes"] = len(pdf)
+        results["report"] = metrics
+
+    return results
+
+
+def run_benchmark(args) -> Dict:
+    server = configure(args)
+
+    # Ayarlar sabitlendikten sonra oluşturulmalı (LLM istemcisi ayarları okur)
+    from app.services.analysis_orchestrator import AnalysisOrchestrator
+    orchestrator = AnalysisOrchestrator()
+
+    results = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": environment_info(),
+        "repeat": args.repeat,
+        "models": load_models(args.stages),
+        "cases": {},
+    }
+
+    media_dir = args.media_dir or Path(tempfile.mkdtemp(prefix="eduview_bench_"))
+    try:
+        for duration in args.durations:
+            for width, height in args.resolutions:
+                case = f"{duration:g}s_{width}x{height}"
+                video_path = media_dir / f"synthetic_{case}_seed{args.seed}.mp4"
+                print(f"\n🎬 {case}: sentetik video hazırlanıyor...")
+                gen_start = time.perf_counter()
+                media = generate_video(video_path, duration, (width, height), args.seed)
+                print(f"  Üretim: {time.perf_counter() - gen_start:.1f}s")
+
+                stage_results = run_case(orchestrator, video_path, media, args.stages, args.repeat, server)
+                for stage, metrics in stage_results.items():
+                    extra = f", {metrics['fps']} kare/s" if metrics.get("fps") else ""
+                    extra += f", RTF {metrics['rtf']}" if stage == "audio" else ""
+                    print(f"  {stage}: {metrics['wall_seconds']:.2f}s duvar, {metrics['cpu_seconds']:.2f}s CPU, "
+                          f"{metrics['peak_rss_mb']:.0f} MB{extra}")
+                results["cases"][case] = {"duration": duration, "resolution": [width, height], "stages": stage_results}
+
+                if args.media_dir is None:
+                    video_path.unlink(missing_ok=True)
+    finally:
+        if server:
+            server.shutdown()
+        if args.media_dir is None:
+            try:
+                media_dir.rmdir()
+            except OSError:
+                pass
+
+    try:
+        import resource
+        # Linux'ta KB cinsindendir
+        results["process_peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    except ImportError:
+        pass
+    return results
+
+
+def compare_results(current: Dict, baseline: Dict, tolerance: float) -> List[Dict]:
+    """Ortak vaka/aşamalarda maliyet metriklerini karşılaştır; gerilemeleri döndür
+
+    Bir metrik baz değerin (1 + tolerance) katını ve COMPARED_METRICS'teki
+    mutlak eşiği birlikte aşarsa gerileme sayılır.
+    """
+    regressions = []
+    for case, case_result in current["cases"].items():
+        base_case = baseline.get("cases", {}).get(case)
+        if base_case is None:
+            continue
+        for stage, metrics in case_result["stages"].items():
+            base_metrics = base_case["stages"].get(stage)
+            if base_metrics is None:
+                continue
+            for metric, min_delta in COMPARED_METRICS.items():
+                value, base_value = metrics.get(metric), base_metrics.get(metric)
+                if value is None or not base_value:
+                    continue
+                ratio = value / base_value
+                marker = ""
+                if ratio > 1 + tolerance and value - base_value > min_delta:
+                    marker = "  ❌ gerileme"
+                    regressions.append({
+                        "case": case, "stage": stage, "metric": metric,
+                        "baseline": base_value, "current": value, "ratio": round(ratio, 3),
+                    })
+                elif ratio < 1 - tolerance and base_value - value > min_delta:
+                    marker = "  ✅ iyileşme"
+                print(f"  {case:<20} {stage:<8} {metric:<13} {base_value:>9} -> {value:>9} ({ratio:.2f}x){marker}")
+    return regressions
+
+
+def print_environment_diff(current: Dict, baseline: Dict) -> None:
+    base_env, env = baseline.get("environment", {}), current["environment"]
+    for key in ("platform", "cpu_count", "python"):
+        if base_env.get(key) != env.get(key):
+            print(f"⚠️ Ortam farklı ({key}): {base_env.get(key)} -> {env.get(key)}")
+    for key, value in env["settings"].items():
+        base_value = base_env.get("settings", {}).get(key)
+        if base_value != value:
+            print(f"⚠️ Ayar farklı ({key}): {base_value} -> {value}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analiz hattının uçtan uca kıyaslaması")
+    parser.add_argument("--durations", nargs="+", type=float, default=[30.0, 120.0], help="Video süreleri (s)")
+    parser.add_argument(
+        "--resolutions", nargs="+", type=parse_resolution, default=[(640, 360), (1280, 720)],
+        help="Çözünürlükler (ör. 640x360 1280x720)"
+    )
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES, help="Ölçülecek aşamalar")
+    parser.add_argument("--repeat", type=int, default=1, help="Aşama başına tekrar (medyan alınır)")
+    parser.add_argument("--seed", type=int, default=0, help="Sentetik ses tohumu")
+    parser.add_argument("--media-dir", type=Path, help="Üretilen videoların saklanacağı dizin (varsayılan: geçici)")
+    parser.add_argument("--content-engine", choices=["llm", "local"], default="llm",
+                        help="llm: süreç içi sahte LLM sunucusu, local: yerel puanlayıcı")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Sahte LLM yanıt gecikmesi (s)")
+    parser.add_argument("--vision-workers", type=int, default=0, help="VISION_PARALLEL_WORKERS değeri")
+    parser.add_argument("--sampling-mode", choices=["fixed", "adaptive"], help="VISION_SAMPLING_MODE değeri")
+    parser.add_argument("--output", type=Path, help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--baseline", type=Path, help="Karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="İzin verilen oransal artış (0.2 = %%20)")
+    args = parser.parse_args()
+
+    if "report" in args.stages and "content" not in args.stages:
+        parser.error("report aşaması content aşamasının sonucunu kullanır; --stages içine content ekleyin")
+    if args.repeat < 1:
+        parser.error("--repeat en az 1 olmalı")
+
+    baseline = None
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+
+    results = run_benchmark(args)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n💾 Sonuçlar: {args.output}")
+
+    if baseline is not None:
+        print(f"\n📊 Karşılaştırma ({args.baseline}, tolerans %{args.tolerance * 100:.0f}):")
+        print_environment_diff(results, baseline)
+        regressions = compare_results(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} gerileme bulundu")
+            sys.exit(1)
+        print("\n✅ Gerileme yok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+EduView - STT Motor Karşılaştırması
+
+Yerel bir örnek klasöründeki ses/video dosyalarını seçilen STT motorlarıyla
+transkript eder; gerçek zaman faktörünü (RTF = işlem süresi / ses süresi) ve
+kelime uyumunu raporlar.
+
+Aynı isimde bir .txt dosyası varsa (ders01.mp4 -> ders01.txt) referans
+transkript olarak kullanılır; yoksa ilk motorun çıktısı referans kabul edilir.
+
+Kullanım:
+    python -m benchmarks.stt_benchmark --corpus samples/ \
+        --backends openai-whisper faster-whisper --output stt_results.json
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.audio_analyzer import load_waveform, SAMPLE_RATE
+from app.services.transcription import create_transcription_backend, TRANSCRIPTION_BACKENDS
+
+MEDIA_EXTENSIONS = {".mp4", ".avi", ".mov", ".mkv", ".wav", ".mp3", ".m4a", ".flac"}
+
+
+def normalize_words(text: str) -> List[str]:
+    """Karşılaştırma için metni küçük harfli kelime listesine çevir"""
+    text = text.replace("I", "ı").replace("İ", "i").lower()
+    return re.findall(r"\w+", text)
+
+
+def word_error_rate(reference: List[str], hypothesis: List[str]) -> float:
+    """Kelime hata oranı (Levenshtein mesafesi / referans uzunluğu)"""
+    if not reference:
+        return 0.0 if not hypothesis else 1.0
+
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, start=1):
+        current = [i] + [0] * len(hypothesis)
+        for j, hyp_word in enumerate(hypothesis, start=1):
+            substitution = previous[j - 1] + (ref_word != hyp_word)
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, substitution)
+        previous = current
+    return previous[-1] / len(reference)
+
+
+def run_benchmark(corpus: Path, backends: List[str], overrides: Dict) -> Dict:
+    files = sorted(p for p in corpus.iterdir() if p.suffix.lower() in MEDIA_EXTENSIONS)
+    if not files:
+        raise SystemExit(f"❌ {corpus} içinde medya dosyası bulunamadı")
+
+    # Tüm motorlar aynı dalga formlarını kullanır; decode süresi ölçüme girmez
+    print(f"🎧 {len(files)} dosya çözülüyor...")
+    waveforms = {path.name: load_waveform(str(path)) for path in files}
+
+    results = {"corpus": str(corpus), "backends": {}}
+    for backend_name in backends:
+        print(f"\n🚀 {backend_name} yükleniyor...")
+        load_start = time.perf_counter()
+        backend = create_transcription_backend(backend_name, **overrides)
+        load_time = time.perf_counter() - load_start
+
+        per_file = {}
+        total_audio = 0.0
+        total_elapsed = 0.0
+        for name, waveform in waveforms.items():
+            duration = len(waveform) / SAMPLE_RATE
+            start = time.perf_counter()
+            transcript = backend.transcribe(waveform)
+            elapsed = time.perf_counter() - start
+
+            total_audio += duration
+            total_elapsed += elapsed
+            per_file[name] = {
+                "audio_seconds": round(duration, 2),
+                "elapsed_seconds": round(elapsed, 2),
+                "rtf": round(elapsed / duration, 3) if duration > 0 else None,
+                "text": transcript.text,
+            }
+            print(f"  {name}: {elapsed:.1f}s / {duration:.1f}s ses (RTF {elapsed / max(duration, 1e-9):.3f})")
+
+        results["backends"][backend_name] = {
+            "load_seconds": round(load_time, 2),
+            "total_audio_seconds": round(total_audio, 2),
+            "total_elapsed_seconds": round(total_elapsed, 2),
+            "rtf": round(total_elapsed / total_audio, 3) if total_audio > 0 else None,
+            "files": per_file,
+        }
+
+    # Kelime uyumu
+    baseline = backends[0]
+    for backend_name, backend_result in results["backends"].items():
+        errors = []
+        for path in files:
+            reference_path = path.with_suffix(".txt")
+            if reference_path.exists():
+                reference = reference_path.read_text(encoding="utf-8")
+            else:
+                reference = results["backends"][baseline]["files"][path.name]["text"]
+            wer = word_error_rate(
+                normalize_words(reference),
+                normalize_words(backend_result["files"][path.name]["text"])
+            )
+            backend_result["files"][path.name]["wer"] = round(wer, 4)
+            errors.append(wer)
+        backend_result["mean_wer"] = round(sum(errors) / len(errors), 4)
+        backend_result["word_agreement"] = round(1 - backend_result["mean_wer"], 4)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="STT motorlarını karşılaştır")
+    parser.add_argument("--corpus", required=True, type=Path, help="Örnek ses/video klasörü")
+    parser.add_argument(
+        "--backends", nargs="+", default=list(TRANSCRIPTION_BACKENDS),
+        choices=list(TRANSCRIPTION_BACKENDS), help="Karşılaştırılacak motorlar"
+    )
+    parser.add_argument("--model-size", help="STT_MODEL_SIZE yerine kullanılacak model")
+    parser.add_argument("--compute-type", help="STT_COMPUTE_TYPE yerine kullanılacak tip")
+    parser.add_argument("--threads", type=int, help="STT_THREADS yerine kullanılacak değer")
+    parser.add_argument("--beam-size", type=int, help="STT_BEAM_SIZE yerine kullanılacak değer")
+    parser.add_argument("--output", type=Path, help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    overrides = {
+        key: value for key, value in {
+            "model_size": args.model_size,
+            "compute_type": args.compute_type,
+            "threads": args.threads,
+            "beam_size": args.beam_size,
+        }.items() if value is not None
+    }
+
+    results = run_benchmark(args.corpus, args.backends, overrides)
+
+    print("\n📊 Özet")
+    print("-" * 60)
+    print(f"{'Motor':<20}{'RTF':>10}{'Yükleme (s)':>15}{'Kelime uyumu':>15}")
+    for name, result in results["backends"].items():
+        print(f"{name:<20}{result['rtf']:>10}{result['load_seconds']:>15}{result['word_agreement']:>15.1%}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n💾 Sonuçlar kaydedildi: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+EduView - Sentetik Ders Videosu Üretici
+
+Kıyaslamalar için gerçek ders kaydı gerektirmeyen, tohumla belirlenen (her
+çalıştırmada aynı) videolar üretir: OpenCV ile çizilmiş, başını ve ellerini
+oynatan "konuşan kafa" ve konuşmayı taklit eden ses (hecelere bölünmüş
+harmonik tonlar, cümle aralarında sessizlik). Sesle zamanlanmış Türkçe bir
+transkript de döndürülür; içerik aşaması STT çıktısından bağımsız ölçülür.
+
+Amaç doğruluk değil maliyet ölçümüdür: modeller çizimde yüz bulamayabilir,
+ancak kareler çözülür ve tüm model çağrıları gerçek boyutlarda yapılır.
+
+Kullanım:
+    python -m benchmarks.synthetic_media --duration 60 --resolution 1280x720 \
+        --output samples/synthetic_60s_1280x720.mp4
+"""
+
+import argparse
+import math
+import shutil
+import subprocess
+import sys
+import tempfile
+import wave
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.transcription import TranscriptSegment, WAVEFORM_SAMPLE_RATE
+
+FPS = 30
+WORDS_PER_SECOND = 2.2  # Ortalama konuşma hızı (~130 kelime/dakika)
+SYLLABLE_RATE = 4.0  # Hece zarfı frekansı (Hz)
+
+# Dersi taklit eden cümleler; dolgu kelimeleri ve soru kalıpları bilerek eklendi
+LECTURE_SENTENCES = [
+    "Bugün fonksiyonların türevini ve türevin geometrik anlamını konuşacağız.",
+    "Önce limit kavramını kısaca hatırlayalım, sonra tanıma geçelim.",
+    "Şimdi şu grafiğe bakalım, eğimin nasıl değiştiğini görüyor musunuz?",
+    "Yani türev aslında anlık değişim hızıdır, bunu bir örnekle açıklayalım.",
+    "Eee bir aracın konumunu zamana göre yazdığımızı düşünelim.",
+    "Konum fonksiyonunun türevi bize hızı, hızın türevi de ivmeyi verir.",
+    "Burada bir soru sormak istiyorum, sizce türev negatif olabilir mi?",
+    "Evet, fonksiyon azalıyorsa türev negatiftir, çok güzel bir cevap.",
+    "Şimdi çarpım kuralını yazalım ve adım adım uygulayalım.",
+    "İşte bu noktada zincir kuralı devreye giriyor, dikkatli olalım.",
+    "Hımm, bu ifadeyi biraz sadeleştirirsek sonuç daha net görünür.",
+    "Peki bu sonucu günlük hayatta nerede kullanabiliriz, bir örnek verin.",
+    "Maksimum ve minimum problemlerinde türevi sıfıra eşitleriz.",
+    "Son olarak bugünkü konuyu özetleyelim ve ödevleri konuşalım.",
+]
+
+
+@dataclass
+class SyntheticMedia:
+    """Üretilen ses ve ona göre zamanlanmış transkript"""
+    duration: float
+    waveform: np.ndarray  # 16 kHz mono float32
+    segments: List[TranscriptSegment] = field(default_factory=list)
+
+    @property
+    def transcript(self) -> str:
+        return " ".join(segment.text for segment in self.segments)
+
+    def envelope(self, t: float) -> float:
+        """t anındaki ses genliği (0-1); ağız açıklığı için"""
+        index = int(t * WAVEFORM_SAMPLE_RATE)
+        window = self.waveform[index:index + WAVEFORM_SAMPLE_RATE // FPS]
+        if window.size == 0:
+            return 0.0
+        return min(1.0, float(np.abs(window).max()) * 2.5)
+
+
+def parse_resolution(value: str) -> Tuple[int, int]:
+    """"1280x720" -> (1280, 720)"""
+    try:
+        width, height = (int(part) for part in value.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Geçersiz çözünürlük: {value} (ör. 1280x720)")
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError(f"Geçersiz çözünürlük: {value}")
+    return width, height
+
+
+def synthesize_speech(duration: float, seed: int = 0) -> SyntheticMedia:
+    """Cümle cümle konuşmayı taklit eden ses ve transkript üret
+
+    Her cümle kelime sayısına göre uzunlukta, perde eğrisi hafifçe dalgalanan
+    harmonik bir tondur; cümle araları 0.4-1.2 s, her beş cümlede bir 2 s
+    sessizlik bırakılır. Aynı tohum her zaman aynı sonucu verir.
+    """
+    rng = np.random.default_rng(seed)
+    sample_rate = WAVEFORM_SAMPLE_RATE
+    waveform = np.zeros(int(duration * sample_rate), dtype=np.float32)
+    segments: List[TranscriptSegment] = []
+
+    t = 0.5
+    index = 0
+    while True:
+        text = LECTURE_SENTENCES[index % len(LECTURE_SENTENCES)]
+        length = len(text.split()) / WORDS_PER_SECOND
+        if t + length > duration:
+            break
+
+        start = int(t * sample_rate)
+        times = np.arange(int(length * sample_rate), dtype=np.float32) / sample_rate
+        base_pitch = rng.uniform(110.0, 190.0)
+        pitch = base_pitch * (1.0 + 0.12 * np.sin(2 * np.pi * rng.uniform(0.2, 0.6) * times))
+        phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+        voice = sum(np.sin(harmonic * phase) / harmonic for harmonic in (1, 2, 3, 4))
+        syllables = np.sin(np.pi * SYLLABLE_RATE * times) ** 2
+        fade = np.minimum(1.0, np.minimum(times, length - times) / 0.05)
+        loudness = rng.uniform(0.25, 0.4)
+        noise = rng.normal(0.0, 0.01, times.size)
+        waveform[start:start + times.size] = (loudness * voice * syllables * fade / 2.1 + noise).astype(np.float32)
+
+        segments.append(TranscriptSegment(start=round(t, 3), end=round(t + length, 3), text=text))
+        index += 1
+        t += length + (2.0 if index % 5 == 0 else rng.uniform(0.4, 1.2))
+
+    return SyntheticMedia(duration=duration, waveform=waveform, segments=segments)
+
+
+def _background(width: int, height: int) -> np.ndarray:
+    """Sınıf duvarı ve tahtayı andıran sabit arka plan"""
+    gradient = np.linspace(170, 215, height, dtype=np.float32)[:, None]
+    frame = np.repeat(np.repeat(gradient, width, axis=1)[:, :, None], 3, axis=2).astype(np.uint8)
+    board = (int(width * 0.05), int(height * 0.08), int(width * 0.45), int(height * 0.55))
+    cv2.rectangle(frame, board[:2], board[2:], (60, 90, 50), -1)
+    cv2.rectangle(frame, board[:2], board[2:], (120, 120, 120), max(2, width // 200))
+    return frame
+
+
+def draw_frame(background: np.ndarray, t: float, mouth_open: float) -> np.ndarray:
+    """t anındaki konuşan kafa karesini çiz"""
+    frame = background.copy()
+    height, width = frame.shape[:2]
+    scale = height / 720
+
+    # Baş yavaşça sağa sola yürür ve arada kameradan uzağa döner
+    center_x = int(width * (0.65 + 0.08 * math.sin(2 * math.pi * t / 11)))
+    center_y = int(height * 0.38 + 6 * scale * math.sin(2 * math.pi * t / 3))
+    turn = math.sin(2 * math.pi * t / 17)
+    head_w, head_h = int(70 * scale), int(90 * scale)
+
+    # Gövde
+    shoulders = (center_x - int(150 * scale), center_y + int(110 * scale))
+    cv2.rectangle(frame, shoulders, (center_x + int(150 * scale), height), (90, 60, 40), -1)
+    cv2.rectangle(frame, (center_x - int(25 * scale), center_y + head_h - int(10 * scale)),
+                  (center_x + int(25 * scale), shoulders[1]), (150, 180, 220), -1)
+
+    # Baş, gözler ve sese göre açılan ağız
+    skin = (150, 185, 225)
+    cv2.ellipse(frame, (center_x, center_y), (head_w, head_h), 0, 0, 360, skin, -1)
+    cv2.ellipse(frame, (center_x, center_y - int(60 * scale)), (head_w, int(40 * scale)), 0, 180, 360, (40, 40, 50), -1)
+    gaze = int(turn * 15 * scale)
+    for side in (-1, 1):
+        eye = (center_x + side * int(28 * scale) + gaze, center_y - int(15 * scale))
+        cv2.ellipse(frame, eye, (int(14 * scale), int(8 * scale)), 0, 0, 360, (255, 255, 255), -1)
+        cv2.circle(frame, (eye[0] + gaze // 3, eye[1]), max(2, int(5 * scale)), (40, 30, 20), -1)
+    cv2.ellipse(frame, (center_x + gaze, center_y + int(45 * scale)),
+                (int(24 * scale), max(1, int((3 + 14 * mouth_open) * scale))), 0, 0, 360, (60, 40, 120), -1)
+
+    # Eller: konuşurken açıklayıcı jestler, arada dinlenme
+    gesture = max(0.0, math.sin(2 * math.pi * t / 9))
+    for side, phase in ((-1, 0.0), (1, 1.3)):
+        swing = math.sin(2 * math.pi * 0.8 * t + phase) * gesture
+        hand = (
+            center_x + side * int((130 + 40 * swing) * scale),
+            int(height * 0.85 - (180 * gesture + 40 * swing) * scale)
+        )
+        cv2.line(frame, (center_x + side * int(120 * scale), shoulders[1] + int(20 * scale)), hand,
+                 (90, 60, 40), max(3, int(28 * scale)))
+        cv2.circle(frame, hand, int(22 * scale), skin, -1)
+
+    return frame
+
+
+def _write_wav(path: Path, waveform: np.ndarray) -> None:
+    samples = (np.clip(waveform, -1.0, 1.0) * 32767).astype(np.int16)
+    with wave.open(str(path), "wb") as output:
+        output.setnchannels(1)
+        output.setsampwidth(2)
+        output.setframerate(WAVEFORM_SAMPLE_RATE)
+        output.writeframes(samples.tobytes())
+
+
+def generate_video(output_path: Path, duration: float, resolution: Tuple[int, int],
+                   seed: int = 0) -> SyntheticMedia:
+    """Sentetik ders videosunu (H.264 + AAC) yaz ve ses/transkripti döndür"""
+    if shutil.which("ffmpeg") is None:
+        raise RuntimeError("Sentetik video üretimi için ffmpeg gerekli")
+
+    width, height = resolution
+    media = synthesize_speech(duration, seed)
+    background = _background(width, height)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        silent_path = Path(tmp_dir) / "video.avi"
+        audio_path = Path(tmp_dir) / "audio.wav"
+
+        writer = cv2.VideoWriter(str(silent_path), cv2.VideoWriter_fourcc(*"MJPG"), FPS, (width, height))
+        if not writer.isOpened():
+            raise RuntimeError(f"Video yazıcı açılamadı: {silent_path}")
+        try:
+            for frame_index in range(int(duration * FPS)):
+                t = frame_index / FPS
+                writer.write(draw_frame(background, t, media.envelope(t)))
+        finally:
+            writer.release()
+
+        _write_wav(audio_path, media.waveform)
+        subprocess.run([
+            "ffmpeg", "-nostdin", "-loglevel", "error", "-y",
+            "-i", str(silent_path), "-i", str(audio_path),
+            "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p",
+            "-c:a", "aac", "-shortest", str(output_path)
+        ], check=True)
+
+    return media
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sentetik ders videosu üret")
+    parser.add_argument("--duration", type=float, default=60.0, help="Video süresi (saniye)")
+    parser.add_argument("--resolution", type=parse_resolution, default=(1280, 720), help="Ör. 1280x720")
+    parser.add_argument("--seed", type=int, default=0, help="Ses üretimi tohumu")
+    parser.add_argument("--output", required=True, type=Path, help="Yazılacak .mp4 dosyası")
+    parser.add_argument("--transcript", type=Path, help="Transkriptin yazılacağı .txt dosyası")
+    args = parser.parse_args()
+
+    media = generate_video(args.output, args.duration, args.resolution, args.seed)
+    if args.transcript:
+        args.transcript.write_text(media.transcript, encoding="utf-8")
+    print(f"✅ {args.output} yazıldı ({args.duration:.0f} s, {len(media.segments)} cümle)")
+
+
+if __name__ == "__main__":
+    main()
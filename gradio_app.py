@@ -9,9 +9,12 @@ from datetime import datetime
 import json
 
 from app.services.analysis_orchestrator import AnalysisOrchestrator, OverallAnalysisResult
+from app.services.progress import ProgressEvent, EVENT_RUNNING, EVENT_COMPLETED
 from app.services.report_generator import ReportGenerator
+from app.services.model_registry import model_registry
+from app.core.config import settings
 
-# Global analyzer instance
+# Global analyzer instance (modeller ilk analizde ya da ısıtmada yüklenir)
 analyzer = AnalysisOrchestrator()
 report_generator = ReportGenerator()
 
@@ -72,48 +75,66 @@ def create_comparison_chart(scores):
     
     return fig
 
-def create_topic_heatmap(heatmap_data):
-    """Konu yoğunluk haritası"""
-    if not heatmap_data:
+def create_topic_heatmap(topic_matrix):
+    """Konu yoğunluk haritası (segmentler x kavramlar matrisinden doğrudan)"""
+    if topic_matrix is None or not topic_matrix.concepts or len(topic_matrix.counts) == 0:
         return go.Figure().add_annotation(text="Veri mevcut değil", 
                                         xref="paper", yref="paper",
                                         x=0.5, y=0.5, showarrow=False)
     
-    # Segment verilerini hazırla
-    segments = []
-    concepts = set()
-    
-    for segment in heatmap_data:
-        segments.append(segment['segment_id'])
-        concepts.update(segment['concept_scores'].keys())
-    
-    concepts = list(concepts)
-    
-    # Heatmap matrisi oluştur
-    matrix = []
-    for concept in concepts:
-        row = []
-        for segment in heatmap_data:
-            score = segment['concept_scores'].get(concept, 0)
-            row.append(score)
-        matrix.append(row)
-    
     fig = go.Figure(data=go.Heatmap(
-        z=matrix,
-        x=[f"Segment {i+1}" for i in segments],
-        y=concepts,
+        z=topic_matrix.density.T,
+        x=topic_matrix.segment_labels,
+        y=topic_matrix.concepts,
         colorscale='Viridis'
     ))
     
     fig.update_layout(
         title="Konu Yoğunluk Haritası",
-        xaxis_title="Video Segmentleri",
+        xaxis_title="Video Segmentleri" if topic_matrix.start_times is None else "Zaman (dk:sn)",
         yaxis_title="Anahtar Kavramlar",
         height=400
     )
     
     return fig
 
+# Genel ilerleme çubuğunda aşamaların payı (görüntü ve ses paralel çalışır)
+PROGRESS_STAGE_WEIGHTS = {"vision": 0.35, "audio": 0.35, "content": 0.2, "recommendations": 0.05, "timeline": 0.05}
+STAGE_LABELS = {
+    "vision": "Görüntü analizi", "audio": "Ses analizi", "content": "İçerik analizi",
+    "recommendations": "Öneriler", "timeline": "Zaman çizelgesi"
+}
+UNIT_LABELS = {"frames": "kare", "seconds": "sn ses", "calls": "LLM çağrısı"}
+
+def describe_progress_event(event: ProgressEvent) -> str:
+    """Olayı ilerleme çubuğu açıklamasına çevir"""
+    label = STAGE_LABELS.get(event.stage, event.stage)
+    if event.status == EVENT_RUNNING:
+        return f"{label} başladı..."
+    if event.status == EVENT_COMPLETED:
+        return f"{label} tamamlandı"
+    if event.done is not None and event.total:
+        return f"{label}: {event.done:.0f}/{event.total:.0f} {UNIT_LABELS.get(event.unit, event.unit or '')}"
+    return f"{label}: {event.message or 'devam ediyor'}"
+
+def make_progress_handler(progress, start=0.2, end=0.9):
+    """Analiz olaylarını Gradio ilerleme çubuğuna yansıtan alıcı"""
+    fractions = {}
+    
+    def on_event(event: ProgressEvent):
+        if event.stage not in PROGRESS_STAGE_WEIGHTS:
+            return
+        if event.status == EVENT_COMPLETED:
+            fractions[event.stage] = 1.0
+        elif event.fraction is not None:
+            fractions[event.stage] = event.fraction
+        else:
+            fractions.setdefault(event.stage, 0.0)
+        overall = sum(PROGRESS_STAGE_WEIGHTS[stage] * value for stage, value in fractions.items())
+        progress(start + (end - start) * overall, desc=describe_progress_event(event))
+    
+    return on_event
+
 async def analyze_video(video_file, subject_topic, progress=gr.Progress()):
     """Ana video analiz fonksiyonu"""
     if video_file is None:
@@ -127,8 +148,10 @@ async def analyze_video(video_file, subject_topic, progress=gr.Progress()):
         
         progress(0.2, desc="Analiz başlatılıyor...")
         
-        # Analizi çalıştır
-        result = await analyzer.analyze_video(temp_video_path, subject_topic)
+        # Analizi çalıştır; kare, transkript ve LLM ilerlemesi çubuğa yansır
+        result = await analyzer.analyze_video(
+            temp_video_path, subject_topic, on_event=make_progress_handler(progress)
+        )
         
         progress(0.9, desc="Sonuçlar hazırlanıyor...")
         
@@ -161,7 +184,7 @@ async def analyze_video(video_file, subject_topic, progress=gr.Progress()):
         comparison_chart = create_comparison_chart(scores)
         
         # Konu haritası
-        heatmap_chart = create_topic_heatmap(result.content_analysis.topic_heatmap)
+        heatmap_chart = create_topic_heatmap(result.content_analysis.topic_matrix)
         
         # Detaylı analiz raporu
         detailed_report = f"""
@@ -332,6 +355,8 @@ def create_interface():
 
 # Ana uygulama
 if __name__ == "__main__":
+    if settings.MODEL_WARMUP_ON_STARTUP:
+        model_registry.warm_up()
     app = create_interface()
     app.launch(
         server_name="0.0.0.0",
@@ -67,15 +67,77 @@ def run_fastapi():
         print("\n👋 Sunucu kapatıldı")
         return True
 
+def run_stream(source, subject_topic=None, output=None):
+    """Büyüyen dosya ya da yerel yayını akış modunda analiz et (süreç içinde)"""
+    import asyncio
+    import json
+    from app.services.analysis_orchestrator import AnalysisOrchestrator, serialize_analysis_result
+    from app.services.streaming_analyzer import StreamingAnalyzer, StreamSourceError
+
+    def on_snapshot(result):
+        print(f"📡 {result.video_duration / 60:.1f} dk | Toplam: {result.total_score:.1f} | "
+              f"Beden dili: {result.body_language_score:.1f} | Ses: {result.voice_score:.1f} | "
+              f"İçerik: {result.content_flow_score:.1f}")
+
+    print(f"🚀 Akış analizi başlatılıyor: {source}")
+    analyzer = StreamingAnalyzer(AnalysisOrchestrator())
+    try:
+        result = asyncio.run(analyzer.analyze_stream(
+            source, subject_topic, on_snapshot, restrict_source=False
+        ))
+    except StreamSourceError as e:
+        print(f"❌ {e}")
+        return False
+    except KeyboardInterrupt:
+        print("\n👋 Akış analizi durduruldu")
+        return True
+
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(serialize_analysis_result(result), f, ensure_ascii=False, indent=2)
+        print(f"💾 Sonuç kaydedildi: {output}")
+    return True
+
+def run_batch(source, output, subject_topic=None, workers=0, retry_failed=True):
+    """Klasör ya da manifestteki videoları süreç havuzunda toplu analiz et"""
+    from app.services.batch_runner import BatchRunner, BatchError, load_batch_items
+
+    try:
+        items = load_batch_items(source, subject_topic, restrict=False)
+        if not items:
+            print(f"❌ Analiz edilecek video bulunamadı: {source}")
+            return False
+        runner = BatchRunner(items, output, workers=workers or None, retry_failed=retry_failed)
+        print(f"🚀 Toplu analiz başlatılıyor: {len(items)} video -> {output}")
+        summary = runner.run()
+    except BatchError as e:
+        print(f"❌ {e}")
+        return False
+    except KeyboardInterrupt:
+        print("\n👋 Toplu analiz durduruldu; aynı komutla kaldığı yerden devam edebilirsiniz")
+        return True
+
+    print(f"📊 {summary.completed} tamamlandı, {summary.failed} başarısız, {summary.skipped} atlandı | "
+          f"{summary.videos_per_hour:.1f} video/saat")
+    return summary.failed == 0
+
 def main():
     """Ana fonksiyon"""
     parser = argparse.ArgumentParser(description="EduView - AI Educational Video Analysis")
     parser.add_argument(
         "--mode", 
-        choices=["gradio", "api"], 
+        choices=["gradio", "api", "stream", "batch"], 
         default="gradio",
-        help="Başlatma modu: gradio (web arayüzü) veya api (FastAPI sunucu)"
+        help="Başlatma modu: gradio (web arayüzü), api (FastAPI sunucu), stream (akış analizi) veya batch (toplu analiz)"
     )
+    parser.add_argument("--source", help="stream: büyüyen video dosyası ya da rtsp:// / udp:// adresi; "
+                                         "batch: video klasörü ya da manifest (.jsonl/.csv/.txt)")
+    parser.add_argument("--topic", help="stream/batch: dersin konusu (manifestte yoksa)")
+    parser.add_argument("--output", help="stream: son sonucun JSON dosyası; batch: .jsonl ya da .parquet çıktı "
+                                         "(varsayılan batch_results.jsonl)")
+    parser.add_argument("--workers", type=int, default=0, help="batch: işçi süreç sayısı (0 = otomatik)")
+    parser.add_argument("--skip-failed", action="store_true",
+                        help="batch: önceki çalıştırmada başarısız olan videoları yeniden deneme")
     parser.add_argument(
         "--skip-checks", 
         action="store_true",
@@ -101,6 +163,16 @@ def main():
         success = run_gradio()
     elif args.mode == "api":
         success = run_fastapi()
+    elif args.mode == "stream":
+        if not args.source:
+            parser.error("stream modu için --source gerekli")
+        success = run_stream(args.source, args.topic, args.output)
+    elif args.mode == "batch":
+        if not args.source:
+            parser.error("batch modu için --source gerekli")
+        success = run_batch(
+            args.source, args.output or "batch_results.jsonl", args.topic, args.workers, not args.skip_failed
+        )
     
     if success:
         print("✅ Uygulama başarıyla çalıştı")
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Testler depo kökünden çalıştırılmadığında da app paketi bulunsun
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,142 @@
+"""Toplu analiz: API girdilerinin dizin sınırı ve eşzamanlı başlatma sınırı"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.services import batch_runner
+from app.services.batch_runner import (
+    BatchError, BatchItem, BatchJobManager, BatchLimitError, load_batch_items
+)
+from app.services.job_store import InMemoryJobStore
+
+
+@pytest.fixture
+def input_dir(tmp_path, monkeypatch):
+    base = tmp_path / "inputs"
+    (base / "course").mkdir(parents=True)
+    monkeypatch.setattr(settings, "BATCH_INPUT_DIR", str(base))
+    return base
+
+
+def write_manifest(directory, paths):
+    manifest = directory / "manifest.jsonl"
+    manifest.write_text("\n".join(json.dumps({"path": path}) for path in paths), encoding="utf-8")
+    return str(manifest)
+
+
+def test_manifest_entries_inside_input_dir_are_accepted(input_dir):
+    manifest = write_manifest(input_dir / "course", ["lesson1.mp4", "week2/lesson2.mp4"])
+
+    items = load_batch_items(manifest)
+
+    assert [item.video_path for item in items] == [
+        str((input_dir / "course" / "lesson1.mp4").resolve()),
+        str((input_dir / "course" / "week2" / "lesson2.mp4").resolve()),
+    ]
+
+
+@pytest.mark.parametrize("path", ["../../secret.mp4", "/etc/secret.mp4"])
+def test_manifest_entries_escaping_input_dir_are_rejected(input_dir, path):
+    manifest = write_manifest(input_dir / "course", ["lesson1.mp4", path])
+
+    with pytest.raises(BatchError):
+        load_batch_items(manifest)
+
+
+def test_cli_manifest_is_not_restricted(input_dir):
+    manifest = write_manifest(input_dir / "course", ["/etc/secret.mp4"])
+
+    items = load_batch_items(manifest, restrict=False)
+
+    assert items[0].video_path == "/etc/secret.mp4"
+
+
+class BlockingManager(BatchJobManager):
+    """Başlatılan toplu analizler testin sonuna kadar etkin kalır"""
+
+    def __init__(self, store):
+        super().__init__(store)
+        self.release = asyncio.Event()
+        self.runners = []
+
+    async def _run(self, job_id, runner):
+        self.runners.append(runner)
+        try:
+            await self.release.wait()
+        finally:
+            self._active.pop(job_id, None)
+
+
+def test_concurrent_starts_respect_max_active(input_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "BATCH_MAX_ACTIVE", 1)
+    monkeypatch.setattr(settings, "BATCH_OUTPUT_DIR", str(tmp_path / "outputs"))
+
+    def slow_load(*args):
+        # Girdi okunurken ikinci istek gelsin
+        time.sleep(0.1)
+        return [BatchItem(item_id="lesson1.mp4", video_path="lesson1.mp4")]
+
+    monkeypatch.setattr(batch_runner, "load_batch_items", slow_load)
+
+    async def scenario():
+        manager = BlockingManager(InMemoryJobStore())
+        results = await asyncio.gather(
+            manager.start("course"), manager.start("course"), return_exceptions=True
+        )
+        manager.release.set()
+        await asyncio.sleep(0)
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert sum(isinstance(result, str) for result in results) == 1
+    assert sum(isinstance(result, BatchLimitError) for result in results) == 1
+
+
+def test_failed_start_releases_slot(input_dir, monkeypatch):
+    monkeypatch.setattr(settings, "BATCH_MAX_ACTIVE", 1)
+
+    async def scenario():
+        manager = BlockingManager(InMemoryJobStore())
+        for _ in range(2):
+            # Boş klasör: BatchError, ayrılan yer geri verilmeli
+            with pytest.raises(BatchError):
+                await manager.start("course")
+        return manager._starting
+
+    assert asyncio.run(scenario()) == 0
+
+
+@pytest.fixture
+def single_item(input_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "BATCH_OUTPUT_DIR", str(tmp_path / "outputs"))
+    monkeypatch.setattr(batch_runner, "_check_parquet_support", lambda: None)
+    monkeypatch.setattr(
+        batch_runner, "load_batch_items",
+        lambda *args: [BatchItem(item_id="lesson1.mp4", video_path="lesson1.mp4")]
+    )
+
+
+def run_start(**kwargs):
+    async def scenario():
+        manager = BlockingManager(InMemoryJobStore())
+        await manager.start("course", **kwargs)
+        await asyncio.sleep(0)
+        manager.release.set()
+        return manager.runners[0]
+
+    return asyncio.run(scenario())
+
+
+def test_output_format_follows_output_extension(single_item):
+    assert run_start(output="course.parquet").output_format == "parquet"
+    assert run_start().output_path.endswith("course.jsonl")
+
+
+def test_output_format_conflicting_with_extension_is_rejected(single_item):
+    with pytest.raises(BatchError):
+        run_start(output="course.parquet", output_format="jsonl")
@@ -0,0 +1,78 @@
+"""FrameSampler / AdaptiveFrameSampler: seçilen kare indeksleri ve zaman damgaları"""
+
+import cv2
+import numpy as np
+import pytest
+
+from app.services.frame_sampler import AdaptiveFrameSampler, FrameSampler
+
+FPS = 10
+FRAME_COUNT = 60
+FRAME_SIZE = (64, 48)
+
+
+def write_clip(path, brightness) -> str:
+    """Her karesi tek renk olan kısa bir video yaz; brightness(i) i. karenin gri değeri"""
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), FPS, FRAME_SIZE)
+    assert writer.isOpened()
+    for i in range(FRAME_COUNT):
+        writer.write(np.full((FRAME_SIZE[1], FRAME_SIZE[0], 3), brightness(i), dtype=np.uint8))
+    writer.release()
+    return str(path)
+
+
+@pytest.fixture
+def ramp_clip(tmp_path):
+    # Kare indeksi parlaklıktan okunabilsin
+    return write_clip(tmp_path / "ramp.avi", lambda i: i * 4)
+
+
+@pytest.fixture
+def motion_clip(tmp_path):
+    # İlk 3 saniye durağan, sonra her yarım saniyede siyah/beyaz arasında geçiş
+    return write_clip(tmp_path / "motion.avi", lambda i: 128 if i < 30 else ((i - 30) // 5 % 2) * 255)
+
+
+def test_fixed_sampling_indices_and_timestamps(ramp_clip):
+    sampler = FrameSampler(ramp_clip, sample_rate=10)
+
+    frames = list(sampler)
+
+    assert [f.frame_index for f in frames] == [0, 10, 20, 30, 40, 50]
+    assert [f.timestamp for f in frames] == pytest.approx([0.0, 1.0, 2.0, 3.0, 4.0, 5.0])
+    # Decode edilen kare gerçekten hedef kare
+    for frame in frames:
+        assert abs(float(frame.image.mean()) - frame.frame_index * 4) < 3
+    assert sampler.stats == {"probed": 6, "analyzed": 6}
+
+
+def test_fixed_sampling_range_is_aligned_to_rate(ramp_clip):
+    frames = list(FrameSampler(ramp_clip, sample_rate=10, start_frame=15, end_frame=45))
+
+    # Parçalı çalıştırmada da tüm videodaki kareler seçilir
+    assert [f.frame_index for f in frames] == [20, 30, 40]
+    assert [f.timestamp for f in frames] == pytest.approx([2.0, 3.0, 4.0])
+
+
+def test_adaptive_sampling_follows_motion(motion_clip):
+    sampler = AdaptiveFrameSampler(motion_clip, probe_rate=5, max_interval=20, motion_threshold=0.02)
+
+    frames = list(sampler)
+
+    assert [f.frame_index for f in frames] == [0, 20, 30, 35, 40, 45, 50, 55]
+    assert [f.timestamp for f in frames] == pytest.approx([0.0, 2.0, 3.0, 3.5, 4.0, 4.5, 5.0, 5.5])
+    assert [d.reason for d in sampler.decisions] == ["start", "static"] + ["motion"] * 6
+    assert sampler.stats["probed"] == 12
+    assert frames[0].motion == 0.0
+    assert all(f.motion >= 0.02 for f in frames[2:])
+
+
+def test_adaptive_sampling_respects_budget(motion_clip):
+    sampler = AdaptiveFrameSampler(motion_clip, probe_rate=5, max_interval=20, motion_threshold=0.02, budget=4)
+
+    frames = list(sampler)
+
+    # Durağan taban örnekleri için pay ayrıldığından bazı hareket kareleri atlanır
+    assert [f.frame_index for f in frames] == [0, 20, 40]
+    assert sampler.stats["analyzed"] <= 4
+    assert sampler.stats["budget_skip"] == 5
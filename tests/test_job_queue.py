@@ -0,0 +1,113 @@
+"""AnalysisJobQueue: depo hatalarında işçinin ayakta kalması ve dolu kuyruk"""
+
+import asyncio
+
+from app.services import job_queue
+from app.services.job_queue import AnalysisJobQueue, QueueFullError
+from app.services.job_store import InMemoryJobStore, JOB_COMPLETED, JOB_FAILED
+
+
+class FailingStore(InMemoryJobStore):
+    """Belirli işlerin her güncellemesinde hata veren depo (ör. MongoDB zaman aşımı)"""
+
+    def __init__(self):
+        super().__init__()
+        self.failing_jobs = set()
+
+    async def update(self, job_id: str, **fields) -> None:
+        if job_id in self.failing_jobs:
+            raise RuntimeError("depo zaman aşımı")
+        await super().update(job_id, **fields)
+
+
+class FakeOrchestrator:
+    async def analyze_video(self, video_path, subject_topic=None, progress_callback=None,
+                            video_hash=None, on_event=None):
+        return {"video_path": video_path}
+
+
+def test_worker_survives_store_errors(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_queue, "serialize_analysis_result", lambda result: result)
+    first_video = tmp_path / "first.mp4"
+    second_video = tmp_path / "second.mp4"
+    first_video.write_bytes(b"video")
+    second_video.write_bytes(b"video")
+
+    async def scenario():
+        store = FailingStore()
+        queue = AnalysisJobQueue(FakeOrchestrator(), store, workers=1, max_size=10)
+        await queue.start()
+
+        # İlk işin hem RUNNING hem FAILED güncellemesi hata verir; submit
+        # event loop'a dönmeden işaretlendiği için işçi işi henüz almamıştır
+        first_id = await queue.submit(str(first_video))
+        store.failing_jobs.add(first_id)
+        second_id = await queue.submit(str(second_video))
+        await asyncio.wait_for(queue._queue.join(), timeout=5)
+
+        workers_alive = all(not task.done() for task in queue._worker_tasks)
+        second_job = await store.get(second_id)
+        await queue.stop()
+        return first_id, workers_alive, second_job
+
+    first_id, workers_alive, second_job = asyncio.run(scenario())
+
+    assert workers_alive
+    assert second_job.status == JOB_COMPLETED
+    assert second_job.result == {"video_path": str(second_video)}
+    # Hata veren işin geçici dosyası da silinir
+    assert not first_video.exists()
+    assert not second_video.exists()
+
+
+class SlowCreateStore(InMemoryJobStore):
+    """Kayıt oluşturma sırasında event loop'a dönen depo"""
+
+    async def create(self, job) -> None:
+        await asyncio.sleep(0.01)
+        await super().create(job)
+
+
+class BlockingOrchestrator:
+    """Analizi test izin verene kadar bekletir"""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def analyze_video(self, video_path, subject_topic=None, progress_callback=None,
+                            video_hash=None, on_event=None):
+        await self.release.wait()
+        return {"video_path": video_path}
+
+
+def test_queue_filling_during_create_fails_job(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_queue, "serialize_analysis_result", lambda result: result)
+    videos = [tmp_path / f"video{i}.mp4" for i in range(3)]
+    for video in videos:
+        video.write_bytes(b"video")
+
+    async def scenario():
+        store = SlowCreateStore()
+        orchestrator = BlockingOrchestrator()
+        queue = AnalysisJobQueue(orchestrator, store, workers=1, max_size=1)
+        await queue.start()
+
+        # İlk iş işçiyi meşgul eder; kuyrukta tek boş yer kalır
+        await queue.submit(str(videos[0]))
+        await asyncio.sleep(0.01)
+        # İkisi de dolu kontrolünü geçer, yeri kayıt oluşturulduktan sonra biri alır
+        results = await asyncio.gather(
+            queue.submit(str(videos[1])), queue.submit(str(videos[2])), return_exceptions=True
+        )
+        statuses = sorted(job.status for job in store._jobs.values())
+        orchestrator.release.set()
+        await asyncio.wait_for(queue._queue.join(), timeout=5)
+        await queue.stop()
+        return results, statuses
+
+    results, statuses = asyncio.run(scenario())
+
+    assert sum(isinstance(result, str) for result in results) == 1
+    assert sum(isinstance(result, QueueFullError) for result in results) == 1
+    # Reddedilen iş kuyrukta bekliyor gibi kalmaz
+    assert statuses.count(JOB_FAILED) == 1
@@ -0,0 +1,47 @@
+"""Anahtar kelime motoru: Türkçe küçük harf dönüşümü ve çok kelimeli kalıplar"""
+
+from app.services.keyword_engine import KeywordEngine, analyze_text, tokenize, turkish_lower
+
+
+def test_turkish_lower_dotted_and_dotless_i():
+    assert turkish_lower("İSTANBUL IRMAK") == "istanbul ırmak"
+    # str.lower() "İ" harfini iki karaktere böler; tokenize kelimeyi bölmemeli
+    assert tokenize("İşte ISI") == ["işte", "ısı"]
+
+
+def test_uppercase_filler_is_counted():
+    stats = analyze_text("İŞTE bu konu, YANİ şey, III değil")
+
+    assert stats.hits["filler"]["işte"] == 1
+    assert stats.hits["filler"]["yani"] == 1
+    assert stats.hits["filler"]["şey"] == 1
+    # "III" Türkçede "ııı" olur (str.lower() ile "iii" olurdu)
+    assert stats.hits["filler"]["ııı"] == 1
+    assert stats.word_count == 7
+
+
+def test_multi_word_phrase_matches_across_tokens():
+    stats = analyze_text("Fark ettiniz mi? Burada fark var ama ettiniz tek başına değil.")
+
+    # "fark ettiniz" yalnızca ardışık geçtiğinde eşleşir
+    assert stats.hits["interaction"]["fark ettiniz"] == 1
+
+
+def test_overlapping_multi_word_fillers():
+    engine = KeywordEngine({"filler": ["şey yani", "yani", "yani işte", "işte"]})
+
+    hits = engine.scan(tokenize("Şey yani işte, yani"))["filler"]
+
+    assert hits == {"şey yani": 1, "yani": 2, "yani işte": 1, "işte": 1}
+    assert engine.positions(tokenize("şey yani"), "filler") == [1, 1]
+
+
+def test_analyze_text_results_are_independent():
+    first = analyze_text("örnek örnek soru")
+    first.term_frequencies["örnek"] += 10
+    first.hits["interaction"].clear()
+
+    second = analyze_text("örnek örnek soru")
+
+    assert second.term_frequencies["örnek"] == 2
+    assert second.count("interaction") == 3
@@ -0,0 +1,78 @@
+"""LLMClient: zaman aşımında yeniden deneme, kalıcı hatalar ve eşzamanlılık sınırı"""
+
+import asyncio
+
+import pytest
+
+from app.services.llm_client import LLMClient, LLMError
+
+
+class FakeModel:
+    """Sırayla verilen davranışları uygulayan model; çağrıları ve eşzamanlılığı sayar"""
+
+    name = "fake"
+
+    def __init__(self, behaviours=(), delay: float = 0.0):
+        self.behaviours = list(behaviours)
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+
+    async def generate(self, prompt: str) -> str:
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            behaviour = self.behaviours.pop(0) if self.behaviours else None
+            if behaviour == "hang":
+                await asyncio.sleep(10)
+            if isinstance(behaviour, BaseException):
+                raise behaviour
+            await asyncio.sleep(self.delay)
+            return f"yanıt: {prompt}"
+        finally:
+            self.in_flight -= 1
+
+
+def make_client(model: FakeModel, **kwargs) -> LLMClient:
+    options = {"max_concurrency": 2, "timeout": 0.05, "max_retries": 2, "backoff": 0}
+    options.update(kwargs)
+    return LLMClient(model, cache=None, **options)
+
+
+def test_timeout_is_retried():
+    model = FakeModel(["hang"])
+
+    text = asyncio.run(make_client(model).generate("soru"))
+
+    assert text == "yanıt: soru"
+    assert model.calls == 2
+
+
+def test_value_error_is_not_retried():
+    model = FakeModel([ValueError("geçersiz istem")])
+
+    with pytest.raises(LLMError):
+        asyncio.run(make_client(model).generate("soru"))
+
+    assert model.calls == 1
+
+
+def test_transient_errors_exhaust_retries():
+    model = FakeModel([RuntimeError("bağlantı koptu")] * 3)
+
+    with pytest.raises(LLMError):
+        asyncio.run(make_client(model).generate("soru"))
+
+    assert model.calls == 3
+
+
+def test_in_flight_requests_never_exceed_max_concurrency():
+    model = FakeModel(delay=0.01)
+    prompts = [f"soru {i}" for i in range(10)]
+
+    results = asyncio.run(make_client(model, max_concurrency=3, timeout=5).generate_many(prompts))
+
+    assert results == [f"yanıt: {prompt}" for prompt in prompts]
+    assert model.peak == 3
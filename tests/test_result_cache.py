@@ -0,0 +1,80 @@
+"""ResultCache: yaşa göre (TTL) ve boyuta göre (LRU) silme"""
+
+import pickle
+
+import pytest
+
+from app.services import result_cache
+from app.services.result_cache import ResultCache
+
+VALUE = b"x" * 100
+VALUE_SIZE = len(pickle.dumps(VALUE, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(result_cache, "time", fake)
+    return fake
+
+
+def make_cache(tmp_path, max_bytes: int = 1 << 20, max_age_seconds: float = 10.0) -> ResultCache:
+    return ResultCache(str(tmp_path / "cache" / "results.sqlite3"), max_bytes, max_age_seconds)
+
+
+def test_entry_expires_after_max_age(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    cache.set("a", VALUE)
+
+    clock.now += 5
+    assert cache.get("a") == VALUE
+
+    # Erişim süreyi uzatmaz; yaş oluşturulma zamanından ölçülür
+    clock.now += 6
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_expired_entries_are_removed_on_write(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    cache.set("old", VALUE)
+
+    clock.now += 11
+    cache.set("new", VALUE)
+
+    assert cache.stats()["entries"] == 1
+    assert cache.get("new") == VALUE
+
+
+def test_size_limit_evicts_least_recently_used(tmp_path, clock):
+    cache = make_cache(tmp_path, max_bytes=2 * VALUE_SIZE + VALUE_SIZE // 2)
+    cache.set("a", VALUE)
+    clock.now += 1
+    cache.set("b", VALUE)
+    clock.now += 1
+    # "a" okunduğu için en uzun süre erişilmeyen "b" olur
+    assert cache.get("a") == VALUE
+    clock.now += 1
+    cache.set("c", VALUE)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == VALUE
+    assert cache.get("c") == VALUE
+    assert cache.stats()["entries"] == 2
+
+
+def test_value_larger_than_limit_is_not_stored(tmp_path, clock):
+    cache = make_cache(tmp_path, max_bytes=VALUE_SIZE - 1)
+    cache.set("a", VALUE)
+
+    assert cache.get("a") is None
+    assert cache.name == "results"
@@ -0,0 +1,61 @@
+"""Akış analizi: uzun yayınlarda biriken durumun sınırlı kalması"""
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.core.config import settings
+from app.services import streaming_analyzer
+from app.services.streaming_analyzer import MediaWindow, StreamingAnalyzer, StreamState, _AudioWindow
+from app.services.transcription import TranscriptSegment
+from app.services.vision_analyzer import VisionCounters
+
+WINDOWS = 3000
+WINDOW_SECONDS = 5.0
+
+
+def unique_word(i: int, j: int) -> str:
+    # Her pencerede daha önce görülmemiş kelimeler (rakamsız)
+    return "terim" + "".join(chr(ord("a") + int(digit)) for digit in f"{i}{j}")
+
+
+def make_window(i: int):
+    window = MediaWindow(
+        index=i, start=i * WINDOW_SECONDS, duration=WINDOW_SECONDS,
+        waveform=np.zeros(0, dtype=np.float32), frames=[]
+    )
+    audio = _AudioWindow(
+        pause_count=1,
+        pause_seconds=0.5,
+        series={"rms": np.full(4, 0.1, dtype=np.float32)},
+        segments=[TranscriptSegment(start=0.0, end=WINDOW_SECONDS, text=" ".join(unique_word(i, j) for j in range(3)))]
+    )
+    return window, audio
+
+
+def test_state_stays_bounded_over_long_stream(monkeypatch):
+    monkeypatch.setattr(settings, "STREAM_TRANSCRIPT_TAIL_SEGMENTS", 20)
+    monkeypatch.setattr(settings, "STREAM_TIMELINE_MAX_WINDOWS", 10)
+    monkeypatch.setattr(streaming_analyzer, "MAX_TRACKED_TERMS", 500)
+    monkeypatch.setattr(
+        streaming_analyzer, "build_timeline", lambda duration, *args, **kwargs: SimpleNamespace(start=0.0)
+    )
+    # Modeller yüklenmesin; yalnızca durum güncellemesi sınanır
+    analyzer = StreamingAnalyzer.__new__(StreamingAnalyzer)
+    analyzer.content_analyzer = SimpleNamespace(key_concepts_from_frequencies=lambda frequencies: ([], {}))
+    state = StreamState()
+
+    for i in range(WINDOWS):
+        window, audio = make_window(i)
+        analyzer._update_state(state, window, VisionCounters(), audio)
+        assert len(state.term_frequencies) <= 500
+
+    assert state.windows == WINDOWS
+    assert state.word_count == 3 * WINDOWS
+    assert state.processed_seconds == WINDOWS * WINDOW_SECONDS
+    assert len(state.transcript_tail) == 20
+    # Son segmentler akış zamanına taşınmış olarak tutulur
+    assert state.transcript_tail[-1].start == (WINDOWS - 1) * WINDOW_SECONDS
+    assert len(state.timeline_parts) == 10
+    assert state.timeline_parts[-1].start == (WINDOWS - 1) * WINDOW_SECONDS
+    assert len(state.vision.sample_times) == 0
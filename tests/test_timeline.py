@@ -0,0 +1,80 @@
+"""Zaman çizelgesi: dilimleme, seyreltme ve ham serilerin ızgaraya indirgenmesi"""
+
+import numpy as np
+
+from app.services.timeline import Timeline, build_timeline
+
+
+def make_timeline(n_windows: int = 5, window_seconds: float = 5.0) -> Timeline:
+    return Timeline(
+        window_seconds=window_seconds,
+        start=np.arange(n_windows, dtype=np.float64) * window_seconds,
+        columns={
+            "rms": np.arange(n_windows, dtype=np.float32),
+            "filler_hits": np.ones(n_windows, dtype=np.float32),
+        }
+    )
+
+
+def test_slice_keeps_windows_overlapping_range():
+    timeline = make_timeline()
+
+    sliced = timeline.slice(6.0, 12.0)
+
+    assert list(sliced.start) == [5.0, 10.0]
+    assert list(sliced.columns["rms"]) == [1.0, 2.0]
+    assert list(timeline.slice(15.0).start) == [15.0, 20.0]
+
+
+def test_downsample_averages_and_sums_filler_hits():
+    timeline = make_timeline()
+    timeline.columns["rms"][1] = np.nan
+
+    reduced = timeline.downsample(2)
+
+    assert reduced.window_seconds == 15.0
+    assert list(reduced.start) == [0.0, 15.0]
+    # NaN pencereler ortalamaya katılmaz
+    assert list(reduced.columns["rms"]) == [1.0, 3.5]
+    assert list(reduced.columns["filler_hits"]) == [3.0, 2.0]
+    assert timeline.downsample(10) is timeline
+
+
+def test_build_timeline_audio_columns():
+    audio_series = {
+        "rms_time": np.array([1.0, 2.0, 6.0]),
+        "rms": np.array([0.2, 0.4, 0.6]),
+        "pitch_time": np.array([1.0, 6.0]),
+        "pitch": np.array([0.0, 200.0]),
+        "pause_start": np.array([4.0]),
+        "pause_end": np.array([6.0]),
+    }
+
+    timeline = build_timeline(10.0, 5.0, audio_series=audio_series)
+
+    assert len(timeline) == 2
+    np.testing.assert_allclose(timeline.columns["rms"], [0.3, 0.6], rtol=1e-5)
+    # Sessiz kareler (perde 0) ortalamaya katılmaz
+    assert np.isnan(timeline.columns["pitch_hz"][0])
+    assert timeline.columns["pitch_hz"][1] == 200.0
+    np.testing.assert_allclose(timeline.columns["pause_ratio"], [0.2, 0.2], rtol=1e-5)
+
+
+def test_build_timeline_without_pitch_series():
+    # Perde çıkarımı hata verdiğinde ses analizi pitch anahtarlarını yazmaz
+    audio_series = {
+        "rms_time": np.array([1.0, 6.0]),
+        "rms": np.array([0.2, 0.6]),
+        "pause_start": np.array([4.0]),
+        "pause_end": np.array([6.0]),
+    }
+
+    timeline = build_timeline(10.0, 5.0, audio_series=audio_series)
+
+    assert "pitch_hz" not in timeline.columns
+    np.testing.assert_allclose(timeline.columns["rms"], [0.2, 0.6], rtol=1e-5)
+    np.testing.assert_allclose(timeline.columns["pause_ratio"], [0.2, 0.2], rtol=1e-5)
+
+
+def test_build_timeline_rejects_empty_duration():
+    assert build_timeline(0.0, 5.0) is None
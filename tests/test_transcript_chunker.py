@@ -0,0 +1,138 @@
+"""Transkript parçalama (token bütçesi, segment sınırları) ve map-reduce birleştirmesi"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.services import content_analyzer
+from app.services.content_analyzer import ContentAnalyzer
+from app.services.llm_client import LLMClient
+from app.services.transcript_chunker import chunk_transcript, estimate_tokens
+from app.services.transcription import TranscriptSegment
+
+
+def make_segment(i: int) -> TranscriptSegment:
+    # 20 karakter = 5 token
+    return TranscriptSegment(start=i * 10.0, end=i * 10.0 + 10.0, text=f"parca{i:02d} " + "x" * 12)
+
+
+SEGMENTS = [make_segment(i) for i in range(5)]
+
+
+def test_chunks_break_on_segment_boundaries_within_budget():
+    chunks = chunk_transcript("", SEGMENTS, max_tokens=11)
+
+    # İki segment + ayırıcı boşluk tam 11 token; üçüncüsü yeni parçaya geçer
+    assert [chunk.text.split()[0::2] for chunk in chunks] == [
+        ["parca00", "parca01"], ["parca02", "parca03"], ["parca04"]
+    ]
+    assert [chunk.tokens for chunk in chunks] == [11, 11, 5]
+    assert [(chunk.start, chunk.end) for chunk in chunks] == [(0.0, 20.0), (20.0, 40.0), (40.0, 50.0)]
+    assert [chunk.chunk_id for chunk in chunks] == [0, 1, 2]
+    assert all(chunk.tokens <= 11 for chunk in chunks)
+
+
+def test_chunks_do_not_overlap_or_drop_segments():
+    chunks = chunk_transcript("", SEGMENTS + [TranscriptSegment(50.0, 52.0, "  ")], max_tokens=16)
+
+    # Parçalar örtüşmez: her segment tam bir parçada, sırası korunarak yer alır
+    assert " ".join(chunk.text for chunk in chunks) == " ".join(segment.text for segment in SEGMENTS)
+    for previous, following in zip(chunks, chunks[1:]):
+        assert previous.end <= following.start
+
+
+def test_oversized_segment_is_split_on_words():
+    segment = TranscriptSegment(start=0.0, end=10.0, text="bir iki üç dört beş altı yedi sekiz dokuz on")
+
+    chunks = chunk_transcript("", [segment], max_tokens=3)
+
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk.text) <= 3 for chunk in chunks)
+    assert " ".join(chunk.text for chunk in chunks) == segment.text
+    # Süre kelime sayısıyla orantılı dağıtılır
+    assert chunks[0].start == 0.0 and chunks[-1].end == pytest.approx(10.0)
+    for previous, following in zip(chunks, chunks[1:]):
+        assert previous.end == pytest.approx(following.start)
+
+
+def test_untimed_transcript_is_split_on_sentences():
+    transcription = "Birinci cümle burada. İkinci cümle de burada! Üçüncü cümle sonuncu mu?"
+
+    chunks = chunk_transcript(transcription, None, max_tokens=12)
+
+    assert [chunk.text for chunk in chunks] == [
+        "Birinci cümle burada.", "İkinci cümle de burada!", "Üçüncü cümle sonuncu mu?"
+    ]
+    assert all(chunk.start is None and chunk.end is None for chunk in chunks)
+    assert len(chunk_transcript(transcription, None, max_tokens=1000)) == 1
+
+
+class FakeModel:
+    """İstem türüne göre sabit yanıt veren model; reduce istemlerini kaydeder"""
+
+    name = "fake"
+
+    def __init__(self, failing_summary: str = None):
+        self.failing_summary = failing_summary
+        self.reduce_prompts = []
+
+    async def generate(self, prompt: str) -> str:
+        if "BÜTÜNLÜK SKORU" in prompt:
+            self.reduce_prompts.append(prompt)
+            return "BÜTÜNLÜK SKORU: 80\nEKSİK KONULAR: integral"
+        if "YAPI SKORU" in prompt:
+            self.reduce_prompts.append(prompt)
+            return "YAPI SKORU: 65"
+        if "AKIŞ SKORU" in prompt:
+            return "AKIŞ SKORU: 60" if "parca00" in prompt else "AKIŞ SKORU: 90"
+        if self.failing_summary and self.failing_summary in prompt:
+            raise ValueError("özet alınamadı")
+        return f"- özet {prompt.split('parca')[1][:2]}"
+
+
+@pytest.fixture
+def make_analyzer(monkeypatch):
+    monkeypatch.setattr(content_analyzer.nltk, "download", lambda *args, **kwargs: None)
+
+    def make(model: FakeModel) -> ContentAnalyzer:
+        return ContentAnalyzer(llm_client=LLMClient(model, max_retries=0))
+
+    return make
+
+
+def test_reduce_combines_chunk_results(make_analyzer):
+    model = FakeModel()
+    chunks = chunk_transcript("", SEGMENTS, max_tokens=11)
+
+    completeness, missing, flow, structure, chunk_stats, degraded = asyncio.run(
+        make_analyzer(model)._analyze_chunked(chunks, "Türev")
+    )
+
+    # Akış: parça skorlarının token ağırlıklı ortalaması
+    assert flow == pytest.approx(np.average([60, 90, 90], weights=[11, 11, 5]))
+    assert (completeness, missing, structure) == (80.0, ["integral"], 65.0)
+    assert not degraded
+    assert [(s["chunk_id"], s["start"], s["end"], s["tokens"]) for s in chunk_stats] == [
+        (0, 0.0, 20.0, 11), (1, 20.0, 40.0, 11), (2, 40.0, 50.0, 5)
+    ]
+
+    # Bütünlük ve yapı, sıralı bölüm özetleri üzerinden istenir
+    completeness_prompt = next(prompt for prompt in model.reduce_prompts if "BÜTÜNLÜK" in prompt)
+    assert "Türev" in completeness_prompt
+    positions = [completeness_prompt.index(f"[Bölüm {i}/3]\n- özet {2 * (i - 1):02d}") for i in (1, 2, 3)]
+    assert positions == sorted(positions)
+
+
+def test_reduce_skips_failed_chunk_summaries(make_analyzer):
+    model = FakeModel(failing_summary="parca02")
+    chunks = chunk_transcript("", SEGMENTS, max_tokens=11)
+
+    completeness, _, _, _, chunk_stats, degraded = asyncio.run(make_analyzer(model)._analyze_chunked(chunks, None))
+
+    assert completeness == 80.0
+    # Eksik özetle hesaplanan sonuç önbelleğe yazılmamalı
+    assert degraded
+    assert len(chunk_stats) == 3
+    assert all("[Bölüm 2/3]" not in prompt for prompt in model.reduce_prompts)
+    assert all("[Bölüm 1/3]" in prompt and "[Bölüm 3/3]" in prompt for prompt in model.reduce_prompts)
@@ -0,0 +1,68 @@
+"""ChunkedUploadManager: ofset denetimi, boyut sınırı ve tamamlanmamış yükleme"""
+
+import os
+
+import pytest
+
+from app.core.config import settings
+from app.services.upload_store import ChunkedUploadManager, UploadError
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    return ChunkedUploadManager()
+
+
+def test_chunk_with_wrong_offset_is_rejected(manager):
+    session = manager.create("ders.mp4", 10)
+    manager.write_chunk(session.upload_id, 0, b"abcd")
+
+    with pytest.raises(UploadError) as error:
+        manager.write_chunk(session.upload_id, 2, b"cdef")
+
+    assert error.value.status_code == 409
+    # Reddedilen parça yazılmaz; istemci mevcut ofsetten devam edebilir
+    assert manager.write_chunk(session.upload_id, 4, b"efghij").received == 10
+
+
+def test_oversized_upload_is_aborted(manager):
+    session = manager.create("ders.mp4", 4)
+
+    with pytest.raises(UploadError) as error:
+        manager.write_chunk(session.upload_id, 0, b"abcdef")
+    manager.abort(session.upload_id)
+
+    assert error.value.status_code == 413
+    assert not os.path.exists(session.writer.path)
+    with pytest.raises(UploadError) as error:
+        manager.get(session.upload_id)
+    assert error.value.status_code == 404
+
+
+def test_write_after_abort_is_rejected(manager):
+    session = manager.create("ders.mp4", 4)
+    manager.abort(session.upload_id)
+
+    # Oturumu abort'tan önce almış bir istek silinen dosyaya yazmamalı
+    manager.get = lambda upload_id: session
+    with pytest.raises(UploadError) as error:
+        manager.write_chunk(session.upload_id, 0, b"ab")
+
+    assert error.value.status_code == 404
+
+
+def test_finish_requires_complete_upload(manager):
+    session = manager.create("ders.mp4", 6)
+    manager.write_chunk(session.upload_id, 0, b"abc")
+
+    with pytest.raises(UploadError) as error:
+        manager.finish(session.upload_id)
+
+    assert error.value.status_code == 409
+    # Oturum açık kalır ve tamamlandıktan sonra kapatılabilir
+    manager.write_chunk(session.upload_id, 3, b"def")
+    finished = manager.finish(session.upload_id)
+    with open(finished.writer.path, "rb") as f:
+        assert f.read() == b"abcdef"
+    os.unlink(finished.writer.path)
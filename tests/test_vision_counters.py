@@ -0,0 +1,74 @@
+"""VisionCounters.merge: iki parçanın birleşimi tek geçişle aynı olmalı"""
+
+import numpy as np
+import pytest
+
+from app.services.landmark_geometry import (
+    FACE_KEYPOINTS, NOSE_TIP, FACE_DIRECTION_CHIN, FOREHEAD, CHIN,
+    LEFT_EYE_OUTER, LEFT_EYE_INNER, LEFT_EYE_TOP, LEFT_EYE_BOTTOM,
+    RIGHT_EYE_INNER, RIGHT_EYE_OUTER, RIGHT_EYE_TOP, RIGHT_EYE_BOTTOM,
+    LEFT_IRIS, RIGHT_IRIS
+)
+from app.services.vision_analyzer import VisionAnalyzer
+
+
+def make_face(direction: float, eye_contact: bool) -> np.ndarray:
+    """Kameraya dönük yüz; yüz yönü burun ile çene noktası arasındaki yatay fark"""
+    coordinates = {
+        NOSE_TIP: (0.5 + direction, 0.5), FACE_DIRECTION_CHIN: (0.5, 0.6),
+        FOREHEAD: (0.5, 0.2), CHIN: (0.5, 0.8),
+        LEFT_EYE_OUTER: (0.35, 0.4), LEFT_EYE_INNER: (0.45, 0.4),
+        LEFT_EYE_TOP: (0.4, 0.38), LEFT_EYE_BOTTOM: (0.4, 0.42),
+        RIGHT_EYE_INNER: (0.55, 0.4), RIGHT_EYE_OUTER: (0.65, 0.4),
+        RIGHT_EYE_TOP: (0.6, 0.38), RIGHT_EYE_BOTTOM: (0.6, 0.42),
+        # İrisler göz köşesindeyse bakış kameradan uzaktadır
+        LEFT_IRIS: (0.4, 0.4) if eye_contact else (0.35, 0.4),
+        RIGHT_IRIS: (0.6, 0.4) if eye_contact else (0.55, 0.4),
+    }
+    points = np.zeros((len(FACE_KEYPOINTS), 3), dtype=np.float32)
+    for row, index in enumerate(FACE_KEYPOINTS):
+        points[row, :2] = coordinates[index]
+    return points
+
+
+def make_hand(x: float, y: float) -> np.ndarray:
+    return np.tile(np.array([x, y, 0.0], dtype=np.float32), (21, 1))
+
+
+# Yüz yönü değişimleri (0.3 eşiği) ve el hareketleri (0.1 / 0.3 eşikleri) parça
+# sınırına hangi noktada denk gelirse gelsin aynı sayılmalı
+SAMPLE_TIMES = [0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0]
+FACES = [
+    make_face(0.1, True), make_face(0.5, False), None, make_face(0.05, True),
+    make_face(0.6, True), make_face(0.0, False), make_face(0.4, True), make_face(0.45, False),
+]
+HANDS = [
+    make_hand(0.1, 0.1), None, make_hand(0.15, 0.1), make_hand(0.5, 0.1),
+    None, make_hand(0.55, 0.5), make_hand(0.56, 0.5), None,
+]
+
+
+def test_single_pass_counts():
+    counters = VisionAnalyzer()._count_samples(SAMPLE_TIMES, FACES, HANDS)
+
+    assert counters.sampled_frames == 8
+    assert counters.face_detected_frames == 7
+    assert counters.eye_contact_frames == 4
+    # Önceki yön 0 olan değişim sayılmaz
+    assert counters.face_direction_changes == 4
+    assert counters.gesture_count == 2
+    assert counters.fidgeting_events == 2
+
+
+@pytest.mark.parametrize("split", range(len(SAMPLE_TIMES) + 1))
+def test_two_chunk_merge_matches_single_pass(split):
+    analyzer = VisionAnalyzer()
+    single = analyzer._count_samples(SAMPLE_TIMES, FACES, HANDS)
+    first = analyzer._count_samples(SAMPLE_TIMES[:split], FACES[:split], HANDS[:split])
+    second = analyzer._count_samples(SAMPLE_TIMES[split:], FACES[split:], HANDS[split:])
+
+    merged = first.merge(second)
+
+    assert merged == single
+    for name in ("sample_times", "eye_contact", "hand_x", "hand_y"):
+        np.testing.assert_array_equal(getattr(merged, name), getattr(single, name))
@@ -0,0 +1,50 @@
+"""Paralel görüntü analizi süreç havuzu: ayarların işçilere aktarılması"""
+
+import pytest
+
+from app.core.config import settings
+from app.services import vision_analyzer
+
+
+@pytest.fixture(autouse=True)
+def fresh_pool():
+    vision_analyzer.shutdown_vision_pool()
+    yield
+    vision_analyzer.shutdown_vision_pool()
+
+
+def test_pool_is_reused_while_configuration_is_unchanged():
+    pool = vision_analyzer._get_process_pool(2)
+
+    assert vision_analyzer._get_process_pool(2) is pool
+
+
+def test_pool_is_recreated_when_worker_count_changes():
+    pool = vision_analyzer._get_process_pool(2)
+
+    resized = vision_analyzer._get_process_pool(3)
+
+    assert resized is not pool
+    assert resized._max_workers == 3
+
+
+def test_pool_workers_receive_runtime_settings(monkeypatch):
+    pool = vision_analyzer._get_process_pool(2)
+    monkeypatch.setattr(settings, "VISION_SAMPLING_MODE", "adaptive")
+
+    updated = vision_analyzer._get_process_pool(2)
+
+    assert updated is not pool
+    assert updated._initargs[0]["VISION_SAMPLING_MODE"] == "adaptive"
+
+
+def test_init_chunk_worker_applies_snapshot(monkeypatch):
+    # Test sonunda özgün değerler geri yüklensin
+    monkeypatch.setattr(settings, "VISION_CASCADE_ENABLED", True)
+    monkeypatch.setattr(settings, "VISION_MAX_ANALYZED_FRAMES", settings.VISION_MAX_ANALYZED_FRAMES)
+    snapshot = {**settings.model_dump(), "VISION_CASCADE_ENABLED": False, "VISION_MAX_ANALYZED_FRAMES": 7}
+
+    vision_analyzer._init_chunk_worker(snapshot)
+
+    assert settings.VISION_CASCADE_ENABLED is False
+    assert settings.VISION_MAX_ANALYZED_FRAMES == 7